@@ -0,0 +1,45 @@
+import hashlib
+
+from fastapi import Request, Response, status
+
+ETAG_HEADER = "ETag"
+
+
+def compute_etag(versions: dict[str, int], *parts: str) -> str:
+    """Strong ETag for a representation built from `versions` of its scopes.
+
+    `parts` distinguishes representations of the same data, e.g. the request path and
+    query string (filters, page size and cursor all change the body).
+    """
+
+    digest = hashlib.sha1()
+    for part in parts:
+        digest.update(part.encode())
+        digest.update(b"\0")
+    for scope, version in sorted(versions.items()):
+        digest.update(f"{scope}={version}\0".encode())
+    return f'"{digest.hexdigest()[:32]}"'
+
+
+def request_etag_parts(request: Request) -> tuple[str, str]:
+    return request.url.path, request.url.query
+
+
+def etag_matches(request: Request, etag: str) -> bool:
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    candidates = {candidate.strip().removeprefix("W/") for candidate in header.split(",")}
+    return "*" in candidates or etag in candidates
+
+
+def set_etag(response: Response, etag: str) -> None:
+    response.headers[ETAG_HEADER] = etag
+    # Allow caching, but make clients revalidate with If-None-Match every time
+    response.headers["Cache-Control"] = "no-cache"
+
+
+def not_modified(etag: str) -> Response:
+    response = Response(status_code=status.HTTP_304_NOT_MODIFIED)
+    set_etag(response, etag)
+    return response
@@ -1,14 +1,142 @@
 from fastapi import Depends, HTTPException, status
+from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from ..database import get_db
+from .. import crud, lookups
+from ..config import get_settings
+from ..database import (
+    AsyncDBSession,
+    DBSession,
+    SyncDBSession,
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+)
+from ..pagination import (
+    InvalidCursor,
+    decode_column_cursor,
+    decode_cursor,
+    decode_offset_cursor,
+    decode_sequence_cursor,
+)
 
 
-def get_db_dep(db: Session = Depends(get_db)) -> Session:
-    return db
+def _get_sync_db_dep(db: Session = Depends(get_db)) -> DBSession:
+    return SyncDBSession(db)
+
+
+async def _get_async_db_dep(db: AsyncSession = Depends(get_async_db)) -> DBSession:
+    return AsyncDBSession(db)
+
+
+def _get_sync_read_db_dep(db: Session = Depends(get_read_db)) -> DBSession:
+    return SyncDBSession(db)
+
+
+async def _get_async_read_db_dep(db: AsyncSession = Depends(get_async_read_db)) -> DBSession:
+    return AsyncDBSession(db)
+
+
+_async_mode = get_settings().db_mode == "async"
+
+get_db_dep = _get_async_db_dep if _async_mode else _get_sync_db_dep
+# For GET routes: served from the read-only pool when one is configured
+get_read_db_dep = _get_async_read_db_dep if _async_mode else _get_sync_read_db_dep
 
 
 def get_object_or_404(obj, *, detail: str = "Object not found"):
     if obj is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=detail)
     return obj
+
+
+def ensure_project_or_404(session: Session, project_id: int) -> None:
+    """404 unless the project exists.
+
+    List routes call it only when they read no rows, since rows already prove it.
+    """
+
+    get_object_or_404(
+        lookups.project_workspace_id(session, project_id), detail="Project not found"
+    )
+
+
+def ensure_task_or_404(session: Session, task_id: int) -> None:
+    get_object_or_404(crud.read_task(session, task_id, ("id",)), detail="Task not found")
+
+
+def ensure_section_in_project_or_400(
+    session: Session, section_id: int | None, project_id: int
+) -> None:
+    """400 unless the section belongs to the project; no section is always valid.
+
+    The same check the batch writes (and so `WRITE_COALESCING`) apply per item.
+    """
+
+    if section_id is not None and lookups.section_project_id(session, section_id) != project_id:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid section_id")
+
+
+def decode_cursor_or_400(cursor: str | None):
+    if cursor is None:
+        return None
+    try:
+        return decode_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def decode_offset_cursor_or_400(cursor: str | None) -> int:
+    if cursor is None:
+        return 0
+    try:
+        return decode_offset_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def decode_sequence_cursor_or_400(cursor: str | None) -> int | None:
+    if cursor is None:
+        return None
+    try:
+        return decode_sequence_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+def decode_column_cursor_or_400(cursor: str | None):
+    if cursor is None:
+        return None
+    try:
+        return decode_column_cursor(cursor)
+    except InvalidCursor:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid cursor")
+
+
+PROJECT_FIELDS_DESCRIPTION = "Comma-separated ProjectRead fields to return (id is always included)"
+TASK_FIELDS_DESCRIPTION = "Comma-separated TaskRead fields to return (id is always included)"
+INCLUDE_ARCHIVED_DESCRIPTION = "Also list archived rows, merged in from the archive"
+
+
+def parse_fields_or_400(fields: str | None, schema: type[BaseModel]) -> tuple[str, ...] | None:
+    """The `?fields=` sparse fieldset as `schema` field names, in schema order.
+
+    `id` is always included. Unknown names are rejected with the allowed ones listed.
+    """
+
+    if fields is None:
+        return None
+    requested = {name.strip() for name in fields.split(",")} - {""}
+    unknown = requested - schema.model_fields.keys()
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=(
+                f"Unknown fields: {', '.join(sorted(unknown))};"
+                f" allowed: {', '.join(schema.model_fields)}"
+            ),
+        )
+    requested.add("id")
+    return tuple(name for name in schema.model_fields if name in requested)
@@ -0,0 +1,77 @@
+"""Per-request instrumentation: latency and SQL metrics, `Server-Timing` and
+`X-Query-Count` headers (see `app.metrics`).
+
+Headers are written when the response starts, so they cover the work done until
+then; statements run while a response streams (the NDJSON/CSV export) only show up
+in the metrics.
+"""
+
+import time
+
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from ..metrics import request_metrics, track_queries
+
+QUERY_COUNT_HEADER = "X-Query-Count"
+SERVER_TIMING_HEADER = "Server-Timing"
+
+# Requests that matched no route share one label, so probes for random paths
+# cannot blow up the number of series
+UNMATCHED_ROUTE = "unmatched"
+
+
+class InstrumentationMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        *,
+        record_metrics: bool = True,
+        server_timing: bool = True,
+        query_count: bool = False,
+    ):
+        self.app = app
+        self.record_metrics = record_metrics
+        self.server_timing = server_timing
+        self.query_count = query_count
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+        with track_queries() as queries:
+
+            async def _send(message: Message) -> None:
+                nonlocal status
+                if message["type"] == "http.response.start":
+                    status = message["status"]
+                    headers = list(message.get("headers", []))
+                    if self.server_timing:
+                        elapsed = (time.perf_counter() - start) * 1000
+                        value = (
+                            f'db;dur={queries.seconds * 1000:.2f};desc="{queries.statements}'
+                            f' queries", app;dur={elapsed:.2f}'
+                        )
+                        headers.append((SERVER_TIMING_HEADER.lower().encode(), value.encode()))
+                    if self.query_count:
+                        headers.append(
+                            (QUERY_COUNT_HEADER.lower().encode(), str(queries.statements).encode())
+                        )
+                    message = {**message, "headers": headers}
+                await send(message)
+
+            try:
+                await self.app(scope, receive, _send)
+            finally:
+                if self.record_metrics:
+                    # FastAPI records the matched route in the scope
+                    route = scope.get("route")
+                    request_metrics.observe(
+                        scope["method"],
+                        getattr(route, "path", UNMATCHED_ROUTE),
+                        status,
+                        time.perf_counter() - start,
+                        queries,
+                    )
@@ -0,0 +1,80 @@
+"""Transports for the live change feed (`app.events`): Server-Sent Events and WebSockets.
+
+Both send the event's JSON message as is: `{"type": "task.updated", "data": {...}}`.
+An `overflow` event means the client fell behind and missed events; the stream ends
+after it, and the client should refetch what it shows before reconnecting.
+"""
+
+import asyncio
+from collections.abc import AsyncIterator, Awaitable, Callable
+
+from fastapi import Request, WebSocket, status
+from fastapi.responses import StreamingResponse
+
+from ..config import get_settings
+from ..events import OVERFLOW, hub
+
+SSE_MEDIA_TYPE = "text/event-stream"
+
+
+async def sse_events(
+    channels: list[str],
+    is_disconnected: Callable[[], Awaitable[bool]],
+    heartbeat_seconds: float,
+) -> AsyncIterator[str]:
+    # Subscribed once the body is being sent, so an unsent response cannot leak it
+    subscription = hub.subscribe(*channels)
+    try:
+        # Tells EventSource how long to wait before reconnecting
+        yield "retry: 3000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(subscription.get(), heartbeat_seconds)
+            except asyncio.TimeoutError:
+                if await is_disconnected():
+                    return
+                # Comment line: keeps proxies from timing the stream out
+                yield ": ping\n\n"
+                continue
+            yield f"event: {event.type}\ndata: {event.message}\n\n"
+            if event is OVERFLOW:
+                return
+    finally:
+        hub.unsubscribe(subscription)
+
+
+def sse_response(request: Request, channels: list[str]) -> StreamingResponse:
+    return StreamingResponse(
+        sse_events(channels, request.is_disconnected, get_settings().events_heartbeat_seconds),
+        media_type=SSE_MEDIA_TYPE,
+        # Proxies must not buffer the stream
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def websocket_feed(websocket: WebSocket, channels: list[str]) -> None:
+    """Forward events to an accepted WebSocket until either side goes away."""
+
+    subscription = hub.subscribe(*channels)
+
+    async def _until_disconnect() -> None:
+        # The feed is one-way; anything the client sends is ignored
+        while (await websocket.receive())["type"] != "websocket.disconnect":
+            pass
+
+    disconnected = asyncio.create_task(_until_disconnect())
+    try:
+        while True:
+            next_event = asyncio.create_task(subscription.get())
+            await asyncio.wait({next_event, disconnected}, return_when=asyncio.FIRST_COMPLETED)
+            if disconnected.done():
+                next_event.cancel()
+                return
+            event = next_event.result()
+            await websocket.send_text(event.message)
+            if event is OVERFLOW:
+                await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER)
+                return
+    finally:
+        disconnected.cancel()
+        hub.unsubscribe(subscription)
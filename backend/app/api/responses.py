@@ -0,0 +1,60 @@
+"""Single-pass JSON responses for read endpoints.
+
+Returning models from a route makes FastAPI validate them again against
+`response_model` and convert them to plain Python before `json.dumps` runs. For large
+lists that dominates the request. Instead, `crud` selects exactly a schema's columns
+as Core rows, already converted to Python types by SQLAlchemy, and `dump_rows` lets
+pydantic-core write them as JSON bytes without validating at all; routes return the
+resulting `Response` and FastAPI passes it through untouched.
+
+Routes keep their `response_model` for the OpenAPI schema.
+"""
+
+from collections.abc import Iterable, Sequence
+from typing import Any
+
+from fastapi import Response
+from pydantic import BaseModel
+from pydantic_core import to_json
+from sqlalchemy.engine import Row
+
+from ..pagination import NEXT_CURSOR_HEADER
+from .conditional import set_etag
+
+
+def row_dicts(
+    rows: Iterable[Row], schema: type[BaseModel], fields: Sequence[str] | None = None
+) -> list[dict[str, Any]]:
+    """Rows whose leading columns are `schema`'s fields, in field order, as dicts.
+
+    With `fields` (a sparse fieldset), the leading columns are those fields instead.
+    Trailing columns (e.g. a sort key used for the cursor) are left out.
+    """
+
+    names = tuple(schema.model_fields) if fields is None else tuple(fields)
+    return [dict(zip(names, row)) for row in rows]
+
+
+def dump_rows(
+    rows: Iterable[Row], schema: type[BaseModel], fields: Sequence[str] | None = None
+) -> bytes:
+    """Encode rows as described in `row_dicts`."""
+
+    return to_json(row_dicts(rows, schema, fields))
+
+
+def dump_row(row: Row, schema: type[BaseModel], fields: Sequence[str] | None = None) -> bytes:
+    """`dump_rows` for a single object."""
+
+    return to_json(row_dicts([row], schema, fields)[0])
+
+
+def json_response(
+    body: bytes, *, etag: str | None = None, next_cursor: str | None = None
+) -> Response:
+    response = Response(content=body, media_type="application/json")
+    if etag is not None:
+        set_etag(response, etag)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return response
@@ -1,19 +1,59 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Query, Request, Response
 from sqlalchemy.orm import Session
 
-from .. import crud, schemas
-from .deps import get_db_dep
+from .. import crud, schemas, watermarks
+from ..cache import query_cache
+from ..database import DBSession
+from ..watermarks import assignee_scope, workspace_scope
+from .conditional import compute_etag, etag_matches, not_modified, request_etag_parts, set_etag
+from .deps import get_read_db_dep
+from .live import sse_response
 
 router = APIRouter(prefix="/home", tags=["home"])
 
 
 @router.get("", response_model=schemas.HomeResponse)
-def get_home(db: Session = Depends(get_db_dep)):
+async def get_home(
+    request: Request,
+    response: Response,
+    assignee: str = Query(default="me", description="Whose tasks to show under my_tasks"),
+    db: DBSession = Depends(get_read_db_dep),
+):
     """Approximate Asana Home page summary.
 
     Returns:
     - recent_projects: last updated projects
-    - my_tasks: tasks assigned to the synthetic user "me"
+    - my_tasks: most recent tasks assigned to `assignee` (the synthetic user "me" by default)
+
+    Served from the in-process query cache until a project is created or one of
+    `assignee`'s tasks changes. Supports If-None-Match revalidation.
     """
 
-    return crud.get_home_summary(db)
+    scopes = [workspace_scope(None), assignee_scope(assignee)]
+
+    def _load(session: Session):
+        etag = compute_etag(watermarks.read(session, scopes), *request_etag_parts(request))
+        if etag_matches(request, etag):
+            return etag, None
+        return etag, crud.get_home_summary(session, me_assignee=assignee)
+
+    etag, summary = await query_cache.get_or_load(
+        ("home", assignee),
+        scopes,
+        lambda: db.run(_load),
+        store=lambda loaded: loaded[1] is not None,
+    )
+    if summary is None or etag_matches(request, etag):
+        return not_modified(etag)
+    set_etag(response, etag)
+    return summary
+
+
+@router.get("/events")
+async def home_events(
+    request: Request,
+    assignee: str = Query(default="me", description="Whose task changes to stream"),
+):
+    """Server-Sent Events stream of changes to `assignee`'s tasks."""
+
+    return sse_response(request, [assignee_scope(assignee)])
@@ -1,60 +1,190 @@
-from collections.abc import Sequence
+from datetime import date
 
-from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi import (
+    APIRouter,
+    BackgroundTasks,
+    Depends,
+    HTTPException,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketException,
+    status,
+)
+from pydantic_core import to_json
 from sqlalchemy.orm import Session
 
-from .. import crud, models, schemas
-from .deps import get_db_dep, get_object_or_404
+from .. import crud, lookups, models, schemas, watermarks
+from ..cache import query_cache
+from ..config import get_settings
+from ..database import DBSession, SessionLocal
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from ..watermarks import project_sections_scope, project_tasks_scope, workspace_scope
+from .conditional import compute_etag, etag_matches, not_modified, request_etag_parts
+from .deps import (
+    INCLUDE_ARCHIVED_DESCRIPTION,
+    PROJECT_FIELDS_DESCRIPTION,
+    TASK_FIELDS_DESCRIPTION,
+    decode_column_cursor_or_400,
+    decode_cursor_or_400,
+    ensure_project_or_404,
+    get_db_dep,
+    get_object_or_404,
+    get_read_db_dep,
+    parse_fields_or_400,
+)
+from .live import sse_response, websocket_feed
+from .responses import dump_row, dump_rows, json_response, row_dicts
 
 router = APIRouter(prefix="/projects", tags=["projects"])
 
 
 @router.get("", response_model=list[schemas.ProjectRead])
-def list_projects(
+async def list_projects(
+    request: Request,
     workspace_id: int | None = Query(default=None, description="Filter by workspace id"),
-    db: Session = Depends(get_db_dep),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    fields: str | None = Query(default=None, description=PROJECT_FIELDS_DESCRIPTION),
+    include_archived: bool = Query(default=False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+    db: DBSession = Depends(get_read_db_dep),
 ):
-    return [schemas.ProjectRead.model_validate(p) for p in crud.list_projects(db, workspace_id)]
+    after = decode_cursor_or_400(cursor)
+    selected = parse_fields_or_400(fields, schemas.ProjectRead)
+    scopes = [workspace_scope(workspace_id)]
+
+    def _load(session: Session):
+        etag = compute_etag(watermarks.read(session, scopes), *request_etag_parts(request))
+        if etag_matches(request, etag):
+            return etag, None, None
+        projects = crud.list_projects(
+            session,
+            workspace_id,
+            limit=limit + 1,
+            after=after,
+            fields=selected,
+            include_archived=include_archived,
+        )
+        page, next_cursor = paginate(projects, limit, key=lambda p: (p.updated_at, p.id))
+        # The encoded body is what gets cached, so hits skip serialization too
+        return etag, dump_rows(page, schemas.ProjectRead, selected), next_cursor
+
+    etag, body, next_cursor = await query_cache.get_or_load(
+        ("projects", workspace_id, limit, cursor, selected, include_archived),
+        scopes,
+        lambda: db.run(_load),
+        store=lambda loaded: loaded[1] is not None,
+    )
+    if body is None or etag_matches(request, etag):
+        return not_modified(etag)
+    return json_response(body, etag=etag, next_cursor=next_cursor)
 
 
 @router.post("", response_model=schemas.ProjectRead, status_code=status.HTTP_201_CREATED)
-def create_project(project_in: schemas.ProjectCreate, db: Session = Depends(get_db_dep)):
-    workspace = crud.list_workspaces(db)
-    if not any(w.id == project_in.workspace_id for w in workspace):
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid workspace_id")
-    project = crud.create_project(db, project_in)
+async def create_project(project_in: schemas.ProjectCreate, db: DBSession = Depends(get_db_dep)):
+    def _create(session: Session) -> models.Project:
+        if not lookups.workspace_exists(session, project_in.workspace_id):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid workspace_id"
+            )
+        return crud.create_project(session, project_in)
+
+    project = await db.run(_create)
     return schemas.ProjectRead.model_validate(project)
 
 
 @router.get("/{project_id}", response_model=schemas.ProjectRead)
-def get_project(project_id: int, db: Session = Depends(get_db_dep)):
-    project = crud.get_project(db, project_id)
+async def get_project(
+    project_id: int,
+    fields: str | None = Query(default=None, description=PROJECT_FIELDS_DESCRIPTION),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    selected = parse_fields_or_400(fields, schemas.ProjectRead)
+    project = await db.run(crud.read_project, project_id, selected)
     get_object_or_404(project, detail="Project not found")
-    return schemas.ProjectRead.model_validate(project)
+    return json_response(dump_row(project, schemas.ProjectRead, selected))
 
 
 @router.get("/{project_id}/sections", response_model=list[schemas.SectionRead])
-def get_project_sections(project_id: int, db: Session = Depends(get_db_dep)):
-    project = crud.get_project(db, project_id)
-    get_object_or_404(project, detail="Project not found")
-    sections: Sequence[models.Section] = crud.list_sections(db, project_id)
-    return [schemas.SectionRead.model_validate(s) for s in sections]
+async def get_project_sections(
+    project_id: int,
+    request: Request,
+    db: DBSession = Depends(get_read_db_dep),
+):
+    def _load(session: Session):
+        versions = watermarks.read(session, [project_sections_scope(project_id)])
+        etag = compute_etag(versions, *request_etag_parts(request))
+        if etag_matches(request, etag):
+            # Scopes of missing projects have versions too: never answer 304 for those
+            ensure_project_or_404(session, project_id)
+            return etag, None
+        sections = crud.list_sections(session, project_id)
+        if not sections:
+            ensure_project_or_404(session, project_id)
+        return etag, dump_rows(sections, schemas.SectionRead)
+
+    etag, body = await db.run(_load)
+    if body is None:
+        return not_modified(etag)
+    return json_response(body, etag=etag)
+
+
+def _rebalance_sections(project_id: int) -> None:
+    with SessionLocal() as session:
+        crud.rebalance_sections(session, project_id)
+
+
+@router.post("/{project_id}/sections/{section_id}/move", response_model=schemas.SectionRead)
+async def move_section(
+    project_id: int,
+    section_id: int,
+    move: schemas.SectionMove,
+    background_tasks: BackgroundTasks,
+    db: DBSession = Depends(get_db_dep),
+):
+    """Reorder a section: right after `after_id`, right before `before_id`, or last.
+
+    Only the section's row is rewritten; see `POST /tasks/{task_id}/move`.
+    """
+
+    def _move(session: Session) -> models.Section:
+        section = crud.get_section(session, section_id)
+        if section is not None and section.project_id != project_id:
+            section = None
+        get_object_or_404(section, detail="Section not found")
+        anchor_id = move.after_id if move.after_id is not None else move.before_id
+        if anchor_id is not None and (
+            anchor_id == section_id or lookups.section_project_id(session, anchor_id) != project_id
+        ):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid anchor section"
+            )
+        return crud.move_section(session, section, after_id=move.after_id, before_id=move.before_id)
+
+    moved = await db.run(_move)
+    if len(moved.rank) > get_settings().rank_rebalance_length:
+        background_tasks.add_task(_rebalance_sections, project_id)
+    return schemas.SectionRead.model_validate(moved)
 
 
 @router.get("/{project_id}/tasks", response_model=list[schemas.TaskRead])
-def get_project_tasks(
+async def get_project_tasks(
     project_id: int,
+    request: Request,
     status_filter: str | None = Query(
         default=None,
         alias="status",
         description="Optional status filter (e.g. inbox, today, completed)",
     ),
     assignee: str | None = Query(default=None, description="Assignee identifier"),
-    db: Session = Depends(get_db_dep),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    fields: str | None = Query(default=None, description=TASK_FIELDS_DESCRIPTION),
+    include_archived: bool = Query(default=False, description=INCLUDE_ARCHIVED_DESCRIPTION),
+    db: DBSession = Depends(get_read_db_dep),
 ):
-    project = crud.get_project(db, project_id)
-    get_object_or_404(project, detail="Project not found")
-
+    selected = parse_fields_or_400(fields, schemas.TaskRead)
+    after = decode_cursor_or_400(cursor)
     # Basic validation inspired by Asana semantics
     if status_filter is not None and len(status_filter) > 64:
         raise HTTPException(
@@ -62,5 +192,139 @@ def get_project_tasks(
             detail="status too long",
         )
 
-    tasks = crud.list_tasks(db, project_id=project_id, assignee=assignee, status=status_filter)
-    return [schemas.TaskRead.model_validate(t) for t in tasks]
+    def _load(session: Session):
+        # The watermark is read first, so a concurrent write can only make the ETag
+        # older than the body, never newer: clients then refetch instead of missing it.
+        versions = watermarks.read(session, [project_tasks_scope(project_id)])
+        etag = compute_etag(versions, *request_etag_parts(request))
+        if etag_matches(request, etag):
+            ensure_project_or_404(session, project_id)
+            return etag, None, None
+
+        tasks = crud.list_tasks(
+            session,
+            project_id=project_id,
+            assignee=assignee,
+            status=status_filter,
+            limit=limit + 1,
+            after=after,
+            fields=selected,
+            include_archived=include_archived,
+        )
+        if not tasks:
+            ensure_project_or_404(session, project_id)
+        page, next_cursor = paginate(tasks, limit, key=lambda t: (t.created_at, t.id))
+        return etag, dump_rows(page, schemas.TaskRead, selected), next_cursor
+
+    etag, body, next_cursor = await db.run(_load)
+    if body is None:
+        return not_modified(etag)
+    return json_response(body, etag=etag, next_cursor=next_cursor)
+
+
+@router.get("/{project_id}/board", response_model=schemas.BoardResponse)
+async def get_project_board(
+    project_id: int,
+    request: Request,
+    limit: int = Query(
+        default=crud.BOARD_COLUMN_SIZE, ge=1, le=MAX_PAGE_SIZE, description="Tasks per column"
+    ),
+    cursor: str | None = Query(
+        default=None, description="A column's next_cursor; returns more of that column only"
+    ),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    """Sections in order, each with its tasks in order, for rendering a board.
+
+    Tasks without a section come first, in a column whose `section` is null. Columns
+    hold at most `limit` tasks; a column with more has a `next_cursor`. Supports
+    If-None-Match revalidation.
+    """
+
+    after = decode_column_cursor_or_400(cursor)
+    scopes = [project_sections_scope(project_id), project_tasks_scope(project_id)]
+
+    def _load(session: Session):
+        etag = compute_etag(watermarks.read(session, scopes), *request_etag_parts(request))
+        if etag_matches(request, etag):
+            ensure_project_or_404(session, project_id)
+            return etag, None
+        columns = crud.get_board(session, project_id, limit=limit, after=after)
+        # Sections prove the project exists; a continuation may not have any
+        if not columns or after is not None:
+            ensure_project_or_404(session, project_id)
+        board = {
+            "project_id": project_id,
+            "columns": [
+                {
+                    "section": (
+                        None
+                        if column.section is None
+                        else row_dicts([column.section], schemas.SectionRead)[0]
+                    ),
+                    "tasks": row_dicts(column.tasks, schemas.TaskRead),
+                    "next_cursor": column.next_cursor,
+                }
+                for column in columns
+            ],
+        }
+        return etag, to_json(board)
+
+    etag, body = await db.run(_load)
+    if body is None:
+        return not_modified(etag)
+    return json_response(body, etag=etag)
+
+
+@router.get("/{project_id}/stats", response_model=schemas.ProjectStats)
+async def get_project_stats(
+    project_id: int, request: Request, db: DBSession = Depends(get_read_db_dep)
+):
+    """Task counts by status and section, plus overdue tasks.
+
+    Read from counters maintained by the task write paths, so the cost does not grow
+    with the number of tasks. Supports If-None-Match revalidation.
+    """
+
+    today = date.today()
+
+    def _load(session: Session):
+        versions = watermarks.read(session, [project_tasks_scope(project_id)])
+        # Overdue counts change at midnight without any write
+        etag = compute_etag(versions, *request_etag_parts(request), today.isoformat())
+        if etag_matches(request, etag):
+            ensure_project_or_404(session, project_id)
+            return etag, None
+        stats = crud.get_project_stats(session, project_id, today)
+        if not stats.total:
+            ensure_project_or_404(session, project_id)
+        return etag, stats
+
+    etag, stats = await db.run(_load)
+    if stats is None:
+        return not_modified(etag)
+    return json_response(stats.model_dump_json().encode(), etag=etag)
+
+
+@router.get("/{project_id}/events")
+async def project_events(
+    project_id: int, request: Request, db: DBSession = Depends(get_read_db_dep)
+):
+    """Server-Sent Events stream of the project's task changes (see app/api/live.py)."""
+
+    await db.run(ensure_project_or_404, project_id)
+    return sse_response(request, [project_tasks_scope(project_id)])
+
+
+@router.websocket("/{project_id}/events/ws")
+async def project_events_ws(
+    websocket: WebSocket, project_id: int, db: DBSession = Depends(get_read_db_dep)
+):
+    """The same feed as `/events`, over a WebSocket."""
+
+    if await db.run(lookups.project_workspace_id, project_id) is None:
+        raise WebSocketException(
+            code=status.WS_1008_POLICY_VIOLATION, reason="Project not found"
+        )
+    await websocket.accept()
+    await websocket_feed(websocket, [project_tasks_scope(project_id)])
@@ -0,0 +1,55 @@
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.orm import Session
+
+from .. import schemas, search
+from ..database import DBSession
+from ..pagination import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    encode_offset_cursor,
+)
+from .deps import decode_offset_cursor_or_400, get_read_db_dep
+from .responses import dump_rows, json_response
+
+router = APIRouter(prefix="/search", tags=["search"])
+
+
+@router.get("/tasks", response_model=list[schemas.TaskRead])
+async def search_tasks(
+    q: str = Query(
+        min_length=1, max_length=256, description="Words to find; each matches as a prefix"
+    ),
+    project_id: int | None = Query(default=None, description="Only tasks of this project"),
+    assignee: str | None = Query(default=None, description="Assignee identifier"),
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    """Full-text search over task names and descriptions, best match first.
+
+    Every word of `q` must match the start of a word in the name or description;
+    name matches rank higher.
+    """
+
+    offset = decode_offset_cursor_or_400(cursor)
+
+    def _load(session: Session):
+        try:
+            tasks = search.search_tasks(
+                session,
+                q,
+                project_id=project_id,
+                assignee=assignee,
+                limit=limit + 1,
+                offset=offset,
+            )
+        except search.SearchUnavailable:
+            raise HTTPException(
+                status_code=status.HTTP_501_NOT_IMPLEMENTED,
+                detail="Full-text search requires SQLite FTS5",
+            )
+        next_cursor = encode_offset_cursor(offset + limit) if len(tasks) > limit else None
+        return dump_rows(tasks[:limit], schemas.TaskRead), next_cursor
+
+    body, next_cursor = await db.run(_load)
+    return json_response(body, next_cursor=next_cursor)
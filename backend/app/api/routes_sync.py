@@ -0,0 +1,27 @@
+from fastapi import APIRouter, Depends, Query
+
+from .. import crud, schemas
+from ..database import DBSession
+from .deps import decode_sequence_cursor_or_400, get_read_db_dep
+from .responses import json_response
+
+router = APIRouter(prefix="/sync", tags=["sync"])
+
+
+@router.get("", response_model=schemas.SyncResponse)
+async def sync(
+    since: str | None = Query(
+        default=None, description="`cursor` from the previous sync; omit on the first call"
+    ),
+    workspace_id: int | None = Query(default=None, description="Only this workspace's changes"),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    """Projects and tasks created, updated or deleted since the `since` cursor.
+
+    Changed rows are returned whole. With `reset: true` nothing else is returned:
+    reload through the list endpoints, then sync from the returned `cursor`.
+    """
+
+    after = decode_sequence_cursor_or_400(since)
+    changes = await db.run(crud.get_changes, after, workspace_id=workspace_id)
+    return json_response(changes.model_dump_json().encode())
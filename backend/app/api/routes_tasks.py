@@ -1,37 +1,219 @@
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from sqlalchemy.orm import Session
 
 from .. import crud, models, schemas
-from .deps import get_db_dep, get_object_or_404
+from ..config import get_settings
+from ..database import DBSession, SessionLocal
+from ..pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, paginate
+from ..writer import task_writer
+from .deps import (
+    TASK_FIELDS_DESCRIPTION,
+    decode_cursor_or_400,
+    ensure_project_or_404,
+    ensure_section_in_project_or_400,
+    ensure_task_or_404,
+    get_db_dep,
+    get_object_or_404,
+    get_read_db_dep,
+    parse_fields_or_400,
+)
+from .responses import dump_row, dump_rows, json_response
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 
 
+def _coalesced_task(result: schemas.TaskBatchItemResult) -> schemas.TaskRead:
+    if result.task is None:
+        raise HTTPException(status_code=result.status, detail=result.error)
+    return result.task
+
+
 @router.post("", response_model=schemas.TaskRead, status_code=status.HTTP_201_CREATED)
-def create_task(task_in: schemas.TaskCreate, db: Session = Depends(get_db_dep)):
-    # Validate that project exists (and section if provided)
-    project = crud.get_project(db, task_in.project_id)
-    get_object_or_404(project, detail="Project not found")
+async def create_task(task_in: schemas.TaskCreate, db: DBSession = Depends(get_db_dep)):
+    if task_writer.enabled:
+        # Committed with the other creates of the same few milliseconds (app/writer.py)
+        return _coalesced_task(await task_writer.create_task(db, task_in))
 
-    if task_in.section_id is not None:
-        section = db.get(models.Section, task_in.section_id)
-        if section is None or section.project_id != task_in.project_id:
-            raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid section_id")
+    def _create(session: Session) -> models.Task:
+        # Validate that project exists (and section if provided)
+        ensure_project_or_404(session, task_in.project_id)
+        ensure_section_in_project_or_400(session, task_in.section_id, task_in.project_id)
+        return crud.create_task(session, task_in)
 
-    task = crud.create_task(db, task_in)
+    task = await db.run(_create)
     return schemas.TaskRead.model_validate(task)
 
 
+@router.post("/batch", response_model=schemas.TaskBatchResponse)
+async def create_tasks_batch(batch: schemas.TaskBatchCreate, db: DBSession = Depends(get_db_dep)):
+    """Create up to 1000 tasks in one transaction.
+
+    Returns one result per item, in request order. Items that reference a missing
+    project (404) or a section of another project (400) are skipped and reported,
+    and the rest are still created. The valid items are inserted together: if that
+    write fails, the request fails and none of them are stored.
+    """
+
+    results = await db.run(crud.create_tasks, batch.items)
+    return schemas.TaskBatchResponse(results=results)
+
+
+@router.patch("/batch", response_model=schemas.TaskBatchResponse)
+async def update_tasks_batch(batch: schemas.TaskBatchUpdate, db: DBSession = Depends(get_db_dep)):
+    """Apply up to 1000 partial task updates in one transaction.
+
+    Same semantics as `POST /tasks/batch`: unknown task ids (404), sections from
+    another project and repeated task ids (400) are reported per item without
+    blocking the rest, and the remaining updates commit or fail together.
+    """
+
+    results = await db.run(crud.update_tasks, batch.items)
+    return schemas.TaskBatchResponse(results=results)
+
+
 @router.get("/{task_id}", response_model=schemas.TaskRead)
-def get_task(task_id: int, db: Session = Depends(get_db_dep)):
-    task = crud.get_task(db, task_id)
+async def get_task(
+    task_id: int,
+    fields: str | None = Query(default=None, description=TASK_FIELDS_DESCRIPTION),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    selected = parse_fields_or_400(fields, schemas.TaskRead)
+    task = await db.run(crud.read_task, task_id, selected)
     get_object_or_404(task, detail="Task not found")
-    return schemas.TaskRead.model_validate(task)
+    return json_response(dump_row(task, schemas.TaskRead, selected))
 
 
 @router.patch("/{task_id}", response_model=schemas.TaskRead, status_code=status.HTTP_200_OK)
-def update_task(task_id: int, task_in: schemas.TaskUpdate, db: Session = Depends(get_db_dep)):
-    task = crud.get_task(db, task_id)
-    get_object_or_404(task, detail="Task not found")
-    updated = crud.update_task(db, task, task_in)
+async def update_task(
+    task_id: int, task_in: schemas.TaskUpdate, db: DBSession = Depends(get_db_dep)
+):
+    if task_writer.enabled:
+        return _coalesced_task(await task_writer.update_task(db, task_id, task_in))
+
+    def _update(session: Session) -> models.Task:
+        task = crud.get_task(session, task_id)
+        get_object_or_404(task, detail="Task not found")
+        if "section_id" in task_in.model_fields_set:
+            ensure_section_in_project_or_400(session, task_in.section_id, task.project_id)
+        return crud.update_task(session, task, task_in)
+
+    updated = await db.run(_update)
     return schemas.TaskRead.model_validate(updated)
+
+
+def _rebalance_tasks(project_id: int, section_id: int | None) -> None:
+    with SessionLocal() as session:
+        crud.rebalance_tasks(session, project_id, section_id)
+
+
+@router.post("/{task_id}/move", response_model=schemas.TaskRead)
+async def move_task(
+    task_id: int,
+    move: schemas.TaskMove,
+    background_tasks: BackgroundTasks,
+    db: DBSession = Depends(get_db_dep),
+):
+    """Reorder a task: right after `after_id`, right before `before_id`, or last.
+
+    An anchor task also decides the section; without one, `section_id` does (if given).
+    Only the task's row is rewritten. When its new order key gets too long, the
+    section's keys are respaced after the response is sent.
+    """
+
+    def _move(session: Session) -> models.Task:
+        task = crud.get_task(session, task_id)
+        get_object_or_404(task, detail="Task not found")
+        section_id = task.section_id
+        if "section_id" in move.model_fields_set:
+            section_id = move.section_id
+            ensure_section_in_project_or_400(session, section_id, task.project_id)
+        anchor_id = move.after_id if move.after_id is not None else move.before_id
+        if anchor_id is not None:
+            anchor = crud.read_task(session, anchor_id, ("id", "project_id", "section_id"))
+            if anchor is None or anchor.project_id != task.project_id or anchor_id == task_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST, detail="Invalid anchor task"
+                )
+            if "section_id" in move.model_fields_set and anchor.section_id != section_id:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="Anchor task is in another section",
+                )
+            section_id = anchor.section_id
+        return crud.move_task(
+            session, task, section_id, after_id=move.after_id, before_id=move.before_id
+        )
+
+    moved = await db.run(_move)
+    if len(moved.rank) > get_settings().rank_rebalance_length:
+        background_tasks.add_task(_rebalance_tasks, moved.project_id, moved.section_id)
+    return schemas.TaskRead.model_validate(moved)
+
+
+@router.get("/{task_id}/comments", response_model=list[schemas.CommentRead])
+async def list_task_comments(
+    task_id: int,
+    limit: int = Query(default=DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(default=None, description="Opaque cursor from X-Next-Cursor"),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    """A task's comments, oldest first, `limit` at a time."""
+
+    def _load(session: Session):
+        comments = crud.list_comments(
+            session, task_id, limit=limit + 1, after=decode_cursor_or_400(cursor)
+        )
+        if not comments:
+            ensure_task_or_404(session, task_id)
+        page, next_cursor = paginate(comments, limit, key=lambda c: (c.created_at, c.id))
+        return dump_rows(page, schemas.CommentRead), next_cursor
+
+    body, next_cursor = await db.run(_load)
+    return json_response(body, next_cursor=next_cursor)
+
+
+def _add_comments(
+    session: Session, task_id: int, comments_in: list[schemas.CommentCreate]
+) -> list[schemas.CommentRead]:
+    task = crud.get_task(session, task_id)
+    get_object_or_404(task, detail="Task not found")
+    return crud.add_comments(session, task, comments_in)
+
+
+@router.post(
+    "/{task_id}/comments",
+    response_model=schemas.CommentRead,
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_task_comment(
+    task_id: int, comment_in: schemas.CommentCreate, db: DBSession = Depends(get_db_dep)
+):
+    """Append a comment; the task's `comment_count` and last-comment preview follow."""
+
+    (comment,) = await db.run(_add_comments, task_id, [comment_in])
+    return comment
+
+
+@router.post(
+    "/{task_id}/comments/batch",
+    response_model=list[schemas.CommentRead],
+    status_code=status.HTTP_201_CREATED,
+)
+async def create_task_comments_batch(
+    task_id: int, batch: schemas.CommentBatchCreate, db: DBSession = Depends(get_db_dep)
+):
+    """Append up to 1000 comments, in request order, in one transaction."""
+
+    return await db.run(_add_comments, task_id, batch.items)
+
+
+@router.delete("/{task_id}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_task(task_id: int, db: DBSession = Depends(get_db_dep)):
+    """Delete a task and its comments; syncing clients see it in `deleted_tasks`."""
+
+    def _delete(session: Session) -> None:
+        task = crud.get_task(session, task_id)
+        get_object_or_404(task, detail="Task not found")
+        crud.delete_task(session, task)
+
+    await db.run(_delete)
@@ -0,0 +1,107 @@
+import csv
+import io
+import json
+from collections.abc import Iterator
+from datetime import date, datetime
+from typing import Literal
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from .. import crud, lookups
+from ..database import DBSession, ReadSessionLocal
+from .deps import get_read_db_dep
+
+router = APIRouter(prefix="/workspaces", tags=["workspaces"])
+
+EXPORT_CHUNK_SIZE = 1000
+
+_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+
+def _json_default(value):
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Cannot serialize {type(value).__name__}")
+
+
+def _ndjson_lines(chunks) -> Iterator[str]:
+    for rows in chunks:
+        yield "".join(
+            json.dumps(row._asdict(), default=_json_default, separators=(",", ":")) + "\n"
+            for row in rows
+        )
+
+
+def _csv_value(value):
+    # csv would write str(datetime), with a space; match the NDJSON export's ISO 8601
+    return value.isoformat() if isinstance(value, (datetime, date)) else value
+
+
+def _csv_lines(chunks) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(crud.TASK_EXPORT_COLUMNS)
+    for rows in chunks:
+        writer.writerows([_csv_value(value) for value in row] for row in rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+
+@router.get("/{workspace_id}/tasks/export")
+async def export_workspace_tasks(
+    workspace_id: int,
+    format: Literal["ndjson", "csv"] = Query(default="ndjson"),
+    project_id: int | None = Query(default=None, description="Only tasks of this project"),
+    assignee: str | None = Query(default=None, description="Assignee identifier"),
+    status_filter: str | None = Query(
+        default=None,
+        alias="status",
+        description="Optional status filter (e.g. inbox, today, completed)",
+    ),
+    db: DBSession = Depends(get_read_db_dep),
+):
+    """Stream every task of a workspace as NDJSON (one object per line) or CSV.
+
+    Takes the same filters as the project task listing. Rows are read in keyset
+    chunks as the response is written, so memory use does not depend on the size of
+    the workspace.
+    """
+
+    def _check(session: Session) -> None:
+        if not lookups.workspace_exists(session, workspace_id):
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND, detail="Workspace not found"
+            )
+        if project_id is not None:
+            if lookups.project_workspace_id(session, project_id) != workspace_id:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND, detail="Project not found"
+                )
+
+    await db.run(_check)
+
+    # The body outlives the request's session, so chunks are read through their own
+    # short-lived sessions. Starlette iterates the generator in the threadpool.
+    chunks = crud.iter_workspace_task_chunks(
+        ReadSessionLocal,
+        workspace_id,
+        project_id=project_id,
+        assignee=assignee,
+        status=status_filter,
+        chunk_size=EXPORT_CHUNK_SIZE,
+    )
+    body = _csv_lines(chunks) if format == "csv" else _ndjson_lines(chunks)
+    return StreamingResponse(
+        body,
+        media_type=_MEDIA_TYPES[format],
+        headers={
+            "Content-Disposition": (
+                f'attachment; filename="workspace-{workspace_id}-tasks.{format}"'
+            )
+        },
+    )
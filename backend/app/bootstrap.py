@@ -0,0 +1,90 @@
+"""Schema setup and seed data.
+
+Run once per deployment with `python -m app.cli init-db`, which brings the schema to
+the latest Alembic revision (`migrations/`) and seeds it. Workers only check the
+revision at startup (see `check_schema`) unless `INIT_DB_ON_STARTUP` is on. Importing
+the app never touches the database.
+"""
+
+from pathlib import Path
+
+from alembic import command
+from alembic.config import Config
+from alembic.runtime.migration import MigrationContext
+from alembic.script import ScriptDirectory
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+from . import crud, schemas
+from .config import Settings, get_settings
+from .database import engine
+
+MIGRATIONS_DIR = Path(__file__).resolve().parent.parent / "migrations"
+
+# The schema that databases created by `create_all` before migrations existed have
+BASELINE_REVISION = "0001"
+
+
+class SchemaOutOfDate(RuntimeError):
+    pass
+
+
+def alembic_config(connection: Connection | None = None) -> Config:
+    """Alembic settings for migrating over `connection` (or `DATABASE_URL` without one)."""
+
+    config = Config()
+    config.set_main_option("script_location", str(MIGRATIONS_DIR))
+    config.attributes["connection"] = connection
+    return config
+
+
+def _revisions(conn: Connection) -> tuple[set[str], set[str]]:
+    current = set(MigrationContext.configure(conn).get_current_heads())
+    heads = set(ScriptDirectory.from_config(alembic_config()).get_heads())
+    return current, heads
+
+
+def check_schema(bind: Engine = engine) -> None:
+    """Raise `SchemaOutOfDate` unless the database is at the latest migration."""
+
+    with bind.connect() as conn:
+        current, heads = _revisions(conn)
+    if current != heads:
+        found = ", ".join(sorted(current)) or "none"
+        raise SchemaOutOfDate(
+            f"Database schema revision is {found}, expected {', '.join(sorted(heads))}:"
+            " run `python -m app.cli init-db`"
+        )
+
+
+def init_db(bind: Engine = engine, config: Settings | None = None) -> None:
+    """Migrate the schema to the latest revision and seed a default workspace and project.
+
+    Idempotent: an up-to-date schema and existing rows are left alone. A database with
+    tables but no revision was bootstrapped before migrations existed, and is upgraded
+    from the baseline.
+    """
+
+    config = config or get_settings()
+    with bind.begin() as conn:
+        current, heads = _revisions(conn)
+        if current != heads:
+            migrations = alembic_config(conn)
+            if not current and inspect(conn).get_table_names():
+                command.stamp(migrations, BASELINE_REVISION)
+            command.upgrade(migrations, "head")
+
+    # Seed a default workspace and project so the UI has something to work with
+    with Session(bind) as db:
+        default_ws = crud.get_or_create_default_workspace(db, config.asana_seed_workspace_name)
+        if not crud.list_projects(db, workspace_id=default_ws.id, limit=1):
+            crud.create_project(
+                db,
+                schemas.ProjectCreate(
+                    name="My First Project",
+                    workspace_id=default_ws.id,
+                    color="#3a258e",
+                    icon="list",
+                ),
+            )
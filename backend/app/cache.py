@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable
+from typing import Any, TypeVar
+
+from .config import get_settings
+
+T = TypeVar("T")
+
+_MISSING = object()
+
+
+class VersionedCache:
+    """Bounded in-process cache with LRU and TTL eviction.
+
+    Every lookup names the version scopes its value depends on (a workspace, an
+    assignee, ...; `app.watermarks` defines the scope names). The current counter of
+    each scope is folded into the key, so a write only has to bump the scopes it
+    touched: stale entries become unreachable and age out through LRU/TTL eviction
+    instead of being hunted down.
+
+    The cache is per process. With several workers, a write only invalidates the
+    worker that handled it; the TTL bounds how stale the others can be.
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def bump(self, *scopes: str) -> None:
+        with self._lock:
+            for scope in scopes:
+                self._versions[scope] = self._versions.get(scope, 0) + 1
+
+    def versioned_key(self, key: Hashable, scopes: Iterable[str]) -> Hashable:
+        with self._lock:
+            return key, tuple((scope, self._versions.get(scope, 0)) for scope in scopes)
+
+    def get(self, versioned_key: Hashable) -> Any:
+        with self._lock:
+            entry = self._entries.get(versioned_key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[versioned_key]
+                    self.evictions += 1
+                self.misses += 1
+                return _MISSING
+            self._entries.move_to_end(versioned_key)
+            self.hits += 1
+            return entry[1]
+
+    def set(self, versioned_key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._entries[versioned_key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(versioned_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        scopes: Iterable[str],
+        load: Callable[[], Awaitable[T]],
+        *,
+        store: Callable[[T], bool] | None = None,
+    ) -> T:
+        """Return the cached value for `key`, or `load()` it and cache it.
+
+        `store` can veto caching a loaded value, e.g. a "not modified" marker.
+        """
+
+        if not self.enabled:
+            return await load()
+        # Versions are read before loading: if a write lands while we load, the value
+        # is stored under the old versions and is never served.
+        versioned_key = self.versioned_key(key, scopes)
+        value = self.get(versioned_key)
+        if value is _MISSING:
+            value = await load()
+            if store is None or store(value):
+                self.set(versioned_key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._versions.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else None,
+            }
+
+
+_settings = get_settings()
+
+query_cache = VersionedCache(
+    max_entries=_settings.cache_max_entries,
+    ttl_seconds=_settings.cache_ttl_seconds,
+    enabled=_settings.cache_enabled,
+)
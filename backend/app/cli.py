@@ -0,0 +1,163 @@
+"""Maintenance commands: `python -m app.cli <command>` (run from `backend/`)."""
+
+import argparse
+import sys
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from . import crud, models, search, task_counts
+from .bootstrap import init_db
+from .config import get_settings
+from .database import SessionLocal, engine
+
+
+def init_database(args: argparse.Namespace) -> int:
+    """Migrate the schema to the latest revision and seed defaults; safe to re-run."""
+
+    init_db()
+    print("Database initialized")
+    return 0
+
+
+def rebuild_search_index(args: argparse.Namespace) -> int:
+    """Create the task search index if missing and re-index every task.
+
+    Needed for databases created before the index existed without running the
+    migrations, or after rows were written with the triggers missing.
+    """
+
+    try:
+        with engine.begin() as conn:
+            search.rebuild_index(conn)
+            indexed = conn.scalar(select(func.count()).select_from(models.Task))
+    except search.SearchUnavailable as exc:
+        print(f"Full-text search is not supported on {exc}", file=sys.stderr)
+        return 1
+    print(f"Indexed {indexed} tasks")
+    return 0
+
+
+def archive_tasks(args: argparse.Namespace) -> int:
+    """Move tasks completed more than `--days` ago, and those of archived projects.
+
+    They go to the archive tables with their comments, `--chunk-size` per transaction,
+    and stay listed with `include_archived=true`.
+    """
+
+    with SessionLocal() as db:
+        moved = crud.archive_tasks(
+            db, datetime.utcnow() - timedelta(days=args.days), chunk_size=args.chunk_size
+        )
+    print(f"Archived {moved} tasks")
+    return 0
+
+
+def prune_tombstones(args: argparse.Namespace) -> int:
+    """Forget deletions older than `--days`; sync cursors from before then get a reset."""
+
+    with SessionLocal() as db:
+        pruned = crud.prune_tombstones(db, datetime.utcnow() - timedelta(days=args.days))
+    print(f"Pruned {pruned} tombstones")
+    return 0
+
+
+def reconcile_task_counts(args: argparse.Namespace) -> int:
+    """Recount tasks per project, section and status, and repair the stored counters.
+
+    Prints every counter that had drifted. With `--check`, nothing is written and
+    the exit status is 1 if any had.
+    """
+
+    with SessionLocal() as db:
+        drift = task_counts.reconcile(db, fix=not args.check)
+        db.commit()
+    for d in drift:
+        print(
+            f"project {d.project_id} section {d.section_id} status {d.status!r}:"
+            f" stored {d.stored}, actual {d.actual}"
+        )
+    print(f"{len(drift)} counters drifted" + ("" if args.check or not drift else ", repaired"))
+    return 1 if args.check and drift else 0
+
+
+def refresh_comment_summaries(args: argparse.Namespace) -> int:
+    """Recompute each task's comment count and last-comment preview from its comments.
+
+    Needed after comments were inserted around the API, e.g. by imports.
+    """
+
+    with SessionLocal() as db:
+        refreshed = crud.refresh_comment_summaries(db)
+        db.commit()
+    print(f"Refreshed the comment summaries of {refreshed} tasks")
+    return 0
+
+
+def rebalance_ranks(args: argparse.Namespace) -> int:
+    """Respace the order keys of every section list and task column that needs it.
+
+    That is, those with a key longer than `RANK_REBALANCE_LENGTH`, or with rows never
+    ranked (inserted around the API, e.g. by imports). Orders are kept.
+    """
+
+    with SessionLocal() as db:
+        projects, sections = crud.unbalanced_rank_groups(db, get_settings().rank_rebalance_length)
+        respaced = sum(crud.rebalance_sections(db, project_id) for project_id in projects)
+        for project_id, section_id in sections:
+            respaced += crud.rebalance_tasks(db, project_id, section_id)
+    print(
+        f"Respaced {len(projects)} section lists and {len(sections)} task columns"
+        f" ({respaced} rows)"
+    )
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m app.cli")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    init = commands.add_parser("init-db", help="Migrate the schema and seed default data")
+    init.set_defaults(handler=init_database)
+
+    rebuild = commands.add_parser(
+        "rebuild-search-index", help="(Re)build the full-text task search index"
+    )
+    rebuild.set_defaults(handler=rebuild_search_index)
+
+    settings = get_settings()
+    archive = commands.add_parser(
+        "archive-tasks", help="Move old completed tasks and archived projects' tasks out"
+    )
+    archive.add_argument("--days", type=int, default=settings.archive_completed_after_days)
+    archive.add_argument("--chunk-size", type=int, default=settings.archive_chunk_size)
+    archive.set_defaults(handler=archive_tasks)
+
+    prune = commands.add_parser(
+        "prune-tombstones", help="Delete sync tombstones older than --days"
+    )
+    prune.add_argument("--days", type=int, default=30)
+    prune.set_defaults(handler=prune_tombstones)
+
+    reconcile = commands.add_parser(
+        "reconcile-task-counts", help="Rebuild the task counters and report drift"
+    )
+    reconcile.add_argument("--check", action="store_true", help="Report only; do not repair")
+    reconcile.set_defaults(handler=reconcile_task_counts)
+
+    comments = commands.add_parser(
+        "refresh-comment-summaries", help="Recompute task comment counts and previews"
+    )
+    comments.set_defaults(handler=refresh_comment_summaries)
+
+    rebalance = commands.add_parser(
+        "rebalance-ranks", help="Respace long or missing section and task order keys"
+    )
+    rebalance.set_defaults(handler=rebalance_ranks)
+
+    args = parser.parse_args(argv)
+    return args.handler(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,5 +1,6 @@
 import os
 from functools import lru_cache
+from typing import Literal
 
 from pydantic import BaseModel
 
@@ -8,6 +9,70 @@ class Settings(BaseModel):
     api_prefix: str = "/api"
     database_url: str = os.getenv("DATABASE_URL", "sqlite:///./asana_clone.db")
     asana_seed_workspace_name: str = os.getenv("ASANA_SEED_WORKSPACE_NAME", "Demo Workspace")
+    # Migrate and seed in the app's lifespan instead of only checking the schema
+    # revision (see app/bootstrap.py); meant for single-process local runs
+    init_db_on_startup: bool = (
+        os.getenv("INIT_DB_ON_STARTUP", "false").lower() in ("1", "true", "yes")
+    )
+    # "sync" runs crud on Starlette's thread pool; "async" runs it on an AsyncSession
+    db_mode: Literal["sync", "async"] = os.getenv("DB_MODE", "sync")
+
+    # Connection pools (the read pool is only separate under the production SQLite profile)
+    db_pool_size: int = int(os.getenv("DB_POOL_SIZE", "5"))
+    db_max_overflow: int = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+    db_pool_timeout: float = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+    db_read_pool_size: int = int(os.getenv("DB_READ_POOL_SIZE", "10"))
+    db_read_max_overflow: int = int(os.getenv("DB_READ_MAX_OVERFLOW", "20"))
+
+    # "production" turns on WAL and the pragmas below for SQLite URLs
+    sqlite_profile: Literal["default", "production"] = os.getenv("SQLITE_PROFILE", "default")
+    sqlite_busy_timeout_ms: int = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "5000"))
+    sqlite_mmap_size: int = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+    # Negative values are KiB, as in PRAGMA cache_size
+    sqlite_cache_size: int = int(os.getenv("SQLITE_CACHE_SIZE", "-65536"))
+
+    # In-process cache for /api/home and /api/projects (see app/cache.py)
+    cache_enabled: bool = os.getenv("CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    cache_max_entries: int = int(os.getenv("CACHE_MAX_ENTRIES", "1024"))
+    cache_ttl_seconds: float = float(os.getenv("CACHE_TTL_SECONDS", "30"))
+    # Process-wide cache of existing workspace/project/section ids (see app/lookups.py)
+    lookup_cache_enabled: bool = (
+        os.getenv("LOOKUP_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+    )
+    lookup_cache_max_entries: int = int(os.getenv("LOOKUP_CACHE_MAX_ENTRIES", "10000"))
+
+    # Live change feed (see app/events.py): "memory" or "package.module:factory"
+    events_backend: str = os.getenv("EVENTS_BACKEND", "memory")
+    events_queue_size: int = int(os.getenv("EVENTS_QUEUE_SIZE", "256"))
+    events_heartbeat_seconds: float = float(os.getenv("EVENTS_HEARTBEAT_SECONDS", "15"))
+
+    # Request/SQL instrumentation (see app/metrics.py): /metrics, Server-Timing
+    metrics_enabled: bool = os.getenv("METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+    server_timing_header: bool = (
+        os.getenv("SERVER_TIMING_HEADER", "true").lower() in ("1", "true", "yes")
+    )
+    # Report each request's SQL statement count in X-Query-Count (benchmarks, profiling)
+    query_count_header: bool = (
+        os.getenv("QUERY_COUNT_HEADER", "false").lower() in ("1", "true", "yes")
+    )
+    # Log statements slower than this, with their query plan; 0 turns the log off
+    slow_query_ms: float = float(os.getenv("SLOW_QUERY_MS", "0"))
+
+    # Order keys longer than this get their siblings respaced (app/ranking.py)
+    rank_rebalance_length: int = int(os.getenv("RANK_REBALANCE_LENGTH", "32"))
+
+    # `python -m app.cli archive-tasks`: completed tasks older than this many days move
+    # to the archive tables, this many per transaction
+    archive_completed_after_days: int = int(os.getenv("ARCHIVE_COMPLETED_AFTER_DAYS", "90"))
+    archive_chunk_size: int = int(os.getenv("ARCHIVE_CHUNK_SIZE", "1000"))
+
+    # Group commit for POST /tasks and PATCH /tasks/{id} (see app/writer.py): writes
+    # arriving within the window are applied in one transaction, up to max_batch
+    write_coalescing: bool = (
+        os.getenv("WRITE_COALESCING", "false").lower() in ("1", "true", "yes")
+    )
+    write_coalescing_window_ms: float = float(os.getenv("WRITE_COALESCING_WINDOW_MS", "2"))
+    write_coalescing_max_batch: int = int(os.getenv("WRITE_COALESCING_MAX_BATCH", "100"))
 
 
 @lru_cache(maxsize=1)
@@ -1,9 +1,73 @@
-from collections.abc import Sequence
+import itertools
+from collections.abc import Callable, Iterable, Iterator, Sequence
+from datetime import date, datetime
+from typing import NamedTuple
 
-from sqlalchemy import select
+from sqlalchemy import (
+    and_,
+    delete,
+    false,
+    func,
+    insert,
+    literal,
+    null,
+    or_,
+    select,
+    true,
+    union_all,
+    update,
+)
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
 
-from . import models, schemas
+from . import lookups, models, ranking, schemas, task_counts, watermarks
+from .cache import query_cache
+from .events import hub
+from .pagination import encode_column_cursor, encode_sequence_cursor
+from .watermarks import (
+    assignee_scope,
+    project_sections_scope,
+    project_tasks_scope,
+    workspace_scope,
+)
+
+
+def _keyset_before(sort_col, id_col, after: tuple[datetime, int]):
+    # Rows strictly after the cursor in `(sort_col DESC, id DESC)` order. Ids break
+    # timestamp ties, so pages never overlap or skip rows when new ones are inserted.
+    # The redundant `sort_col <= value` bound lets SQLite seek the index range.
+    sort_value, row_id = after
+    return and_(sort_col <= sort_value, or_(sort_col < sort_value, id_col < row_id))
+
+
+def _read_columns(model, schema, *extra):
+    # The columns a response schema needs, selected as Core rows by the list queries.
+    # Rows skip ORM hydration and the identity map; writes keep using ORM entities.
+    return (*(model.__table__.c[name] for name in schema.model_fields), *extra)
+
+
+def _keyset_after(sort_col, id_col, after: tuple):
+    # Rows strictly after the cursor in `(sort_col, id)` order; see `_keyset_before`
+    sort_value, row_id = after
+    return and_(sort_col >= sort_value, or_(sort_col > sort_value, id_col > row_id))
+
+
+def _field_columns(model, fields: Sequence[str], *sort_keys):
+    # A sparse fieldset's columns, followed by the sort keys the cursor needs that it
+    # left out; `dump_rows` only encodes the leading ones.
+    return (
+        *(model.__table__.c[name] for name in fields),
+        *(column for column in sort_keys if column.name not in fields),
+    )
+
+
+def _commit_changes(db: Session, scopes: Iterable[str]) -> None:
+    # Watermarks are bumped in the write's own transaction; the in-process cache
+    # only once the commit has succeeded.
+    scopes = set(scopes)
+    watermarks.bump(db, scopes)
+    db.commit()
+    query_cache.bump(*scopes)
 
 
 # Workspaces
@@ -20,6 +84,10 @@ def get_or_create_default_workspace(db: Session, name: str) -> models.Workspace:
     return workspace
 
 
+def get_workspace(db: Session, workspace_id: int) -> models.Workspace | None:
+    return db.get(models.Workspace, workspace_id)
+
+
 def list_workspaces(db: Session) -> Sequence[models.Workspace]:
     stmt = select(models.Workspace).order_by(models.Workspace.id)
     return list(db.scalars(stmt))
@@ -28,63 +96,367 @@ def list_workspaces(db: Session) -> Sequence[models.Workspace]:
 # Projects
 
 def create_project(db: Session, project_in: schemas.ProjectCreate) -> models.Project:
-    project = models.Project(**project_in.model_dump())
+    project = models.Project(**project_in.model_dump(), change_seq=watermarks.next_sequence(db))
     db.add(project)
-    db.commit()
+    _commit_changes(db, [workspace_scope(project.workspace_id), workspace_scope(None)])
     db.refresh(project)
+    lookups.remember(db, "project", project.id, project.workspace_id)
     return project
 
 
-def list_projects(db: Session, workspace_id: int | None = None) -> Sequence[models.Project]:
-    stmt = select(models.Project)
-    if workspace_id is not None:
-        stmt = stmt.where(models.Project.workspace_id == workspace_id)
-    stmt = stmt.order_by(models.Project.updated_at.desc())
-    return list(db.scalars(stmt))
+PROJECT_READ_COLUMNS = _read_columns(
+    models.Project, schemas.ProjectRead, models.Project.updated_at
+)
 
 
-def get_project(db: Session, project_id: int) -> models.Project | None:
-    stmt = select(models.Project).where(models.Project.id == project_id)
-    return db.scalar(stmt)
+def _newest_first(arms, sort_key: str, after: tuple[datetime, int] | None, limit: int | None):
+    # A `(sort_key DESC, id DESC)` keyset page of one `(select, model)` arm, or of
+    # several merged with UNION ALL: e.g. live rows and archived ones. Each arm keeps
+    # to its own index order, so SQLite merges them without sorting.
+    if after is not None:
+        arms = [
+            (stmt.where(_keyset_before(model.__table__.c[sort_key], model.id, after)), model)
+            for stmt, model in arms
+        ]
+    stmts = [stmt for stmt, _ in arms]
+    merged = stmts[0] if len(stmts) == 1 else union_all(*stmts)
+    columns = merged.selected_columns
+    merged = merged.order_by(columns[sort_key].desc(), columns.id.desc())
+    return merged if limit is None else merged.limit(limit)
+
+
+def list_projects(
+    db: Session,
+    workspace_id: int | None = None,
+    *,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+    fields: Sequence[str] | None = None,
+    include_archived: bool = False,
+) -> Sequence[Row]:
+    """Read-only rows with the `ProjectRead` columns plus `updated_at` (the sort key).
+
+    `fields` narrows the `ProjectRead` columns to those names, in that order.
+    Archived projects are left out unless `include_archived`.
+    """
+
+    columns = (
+        PROJECT_READ_COLUMNS
+        if fields is None
+        else _field_columns(models.Project, fields, models.Project.updated_at, models.Project.id)
+    )
+
+    def _select(archived: bool):
+        # A constant rather than a parameter, so SQLite matches the partial indexes
+        stmt = select(*columns).where(
+            models.Project.is_archived == (true() if archived else false())
+        )
+        if workspace_id is not None:
+            stmt = stmt.where(models.Project.workspace_id == workspace_id)
+        return stmt, models.Project
+
+    arms = [_select(False), _select(True)] if include_archived else [_select(False)]
+    return db.execute(_newest_first(arms, "updated_at", after, limit)).all()
+
+
+def read_project(db: Session, project_id: int, fields: Sequence[str] | None = None) -> Row | None:
+    """A read-only row with the `ProjectRead` columns, or only `fields` of them."""
+
+    columns = PROJECT_READ_COLUMNS if fields is None else _field_columns(models.Project, fields)
+    return db.execute(select(*columns).where(models.Project.id == project_id)).first()
 
 
 # Sections
 
-def list_sections(db: Session, project_id: int) -> Sequence[models.Section]:
+SECTION_READ_COLUMNS = _read_columns(models.Section, schemas.SectionRead)
+
+
+def list_sections(db: Session, project_id: int) -> Sequence[Row]:
     stmt = (
-        select(models.Section)
+        select(*SECTION_READ_COLUMNS)
         .where(models.Section.project_id == project_id)
-        .order_by(models.Section.order_index)
+        .order_by(models.Section.rank, models.Section.id)
     )
-    return list(db.scalars(stmt))
+    return db.execute(stmt).all()
+
+
+def get_section(db: Session, section_id: int) -> models.Section | None:
+    return db.get(models.Section, section_id)
+
+
+# Ordering
+#
+# Sections within a project and tasks within a section are ordered by `(rank, id)`
+# (see app/ranking.py). A move computes one new rank between its new neighbours and
+# writes only the moved row. Rows inserted around crud have no rank yet (""); they
+# sort first, and the first move next to one respaces its siblings.
+
+
+def _section_siblings(project_id: int):
+    return (models.Section.project_id == project_id,)
+
+
+def _task_siblings(project_id: int, section_id: int | None):
+    return (models.Task.project_id == project_id, models.Task.section_id == section_id)
+
+
+def _last_rank(db: Session, model, siblings, exclude_id: int | None = None) -> str | None:
+    stmt = select(model.rank).where(*siblings)
+    if exclude_id is not None:
+        stmt = stmt.where(model.id != exclude_id)
+    return db.scalar(stmt.order_by(model.rank.desc(), model.id.desc()).limit(1)) or None
+
+
+def _rank_for_move(
+    db: Session, model, siblings, row_id: int, after_id: int | None, before_id: int | None
+) -> str | None:
+    """A rank placing `row_id` as asked, or None if the neighbours leave no room."""
+
+    if after_id is None and before_id is None:
+        low, high = _last_rank(db, model, siblings, exclude_id=row_id), None
+    else:
+        anchor_id = after_id if after_id is not None else before_id
+        anchor = db.execute(select(model.rank, model.id).where(model.id == anchor_id)).one()
+        stmt = select(model.rank).where(*siblings, model.id != row_id)
+        if after_id is not None:
+            stmt = stmt.where(_keyset_after(model.rank, model.id, anchor)).order_by(
+                model.rank, model.id
+            )
+            low, high = anchor.rank, db.scalar(stmt.limit(1))
+        else:
+            stmt = stmt.where(_keyset_before(model.rank, model.id, anchor)).order_by(
+                model.rank.desc(), model.id.desc()
+            )
+            low, high = db.scalar(stmt.limit(1)), anchor.rank
+    if any(rank is not None and not ranking.is_valid(rank) for rank in (low, high)):
+        return None
+    if low is not None and high is not None and low >= high:
+        return None
+    return ranking.key_between(low, high)
+
+
+def _respace(db: Session, model, siblings) -> int:
+    # Evenly spaced, short ranks for all siblings, in their current order
+    rows = db.execute(
+        select(model.id, model.rank).where(*siblings).order_by(model.rank, model.id)
+    ).all()
+    changes = [
+        {"id": row.id, "rank": rank}
+        for row, rank in zip(rows, ranking.spread(len(rows)))
+        if row.rank != rank
+    ]
+    if changes:
+        if model is models.Task:
+            change_seq = watermarks.next_sequence(db)
+            changes = [{**change, "change_seq": change_seq} for change in changes]
+        db.execute(update(model), changes)
+    return len(changes)
+
+
+def move_section(
+    db: Session,
+    section: models.Section,
+    *,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> models.Section:
+    """Place `section` right after or before a sibling, or last in its project."""
+
+    siblings = _section_siblings(section.project_id)
+    rank = _rank_for_move(db, models.Section, siblings, section.id, after_id, before_id)
+    if rank is None:
+        _respace(db, models.Section, siblings)
+        rank = _rank_for_move(db, models.Section, siblings, section.id, after_id, before_id)
+    section.rank = rank
+    db.add(section)
+    _commit_changes(db, [project_sections_scope(section.project_id)])
+    db.refresh(section)
+    return section
+
+
+def move_task(
+    db: Session,
+    task: models.Task,
+    section_id: int | None,
+    *,
+    after_id: int | None = None,
+    before_id: int | None = None,
+) -> models.Task:
+    """Move `task` to `section_id`, right after or before a task there, or last.
+
+    Writes only the task's row, unless its new neighbours leave no room between their
+    ranks; then the section's tasks are respaced first.
+    """
+
+    siblings = _task_siblings(task.project_id, section_id)
+    rank = _rank_for_move(db, models.Task, siblings, task.id, after_id, before_id)
+    if rank is None:
+        _respace(db, models.Task, siblings)
+        rank = _rank_for_move(db, models.Task, siblings, task.id, after_id, before_id)
+    return _apply_task_changes(db, task, {"section_id": section_id, "rank": rank})
+
+
+def rebalance_sections(db: Session, project_id: int) -> int:
+    """Respace a project's section ranks, keeping their order; returns rows rewritten."""
+
+    respaced = _respace(db, models.Section, _section_siblings(project_id))
+    _commit_changes(db, [project_sections_scope(project_id)])
+    return respaced
+
+
+def rebalance_tasks(db: Session, project_id: int, section_id: int | None) -> int:
+    """Respace a section's task ranks, keeping their order; returns rows rewritten."""
+
+    respaced = _respace(db, models.Task, _task_siblings(project_id, section_id))
+    _commit_changes(db, [project_tasks_scope(project_id)])
+    return respaced
+
+
+def unbalanced_rank_groups(
+    db: Session, max_length: int
+) -> tuple[list[int], list[tuple[int, int | None]]]:
+    """Projects whose sections, and (project, section) pairs whose tasks, need respacing.
+
+    That is, groups with a rank longer than `max_length` or a row never ranked.
+    """
+
+    def _groups(model, *keys):
+        stmt = (
+            select(*keys)
+            .group_by(*keys)
+            .having(or_(func.max(func.length(model.rank)) > max_length, func.min(model.rank) == ""))
+        )
+        return db.execute(stmt).all()
+
+    sections = _groups(models.Section, models.Section.project_id)
+    tasks = _groups(models.Task, models.Task.project_id, models.Task.section_id)
+    return [project_id for project_id, in sections], [tuple(row) for row in tasks]
 
 
 # Tasks
 
+def _completion(data: dict, previous_status: str | None) -> dict:
+    # `completed_at` follows `status` into and out of "completed"; archival goes by it
+    if "status" not in data:
+        return {}
+    completed = data["status"] == task_counts.COMPLETED
+    if completed == (previous_status == task_counts.COMPLETED):
+        return {}
+    return {"completed_at": datetime.utcnow() if completed else None}
+
+
+def _publish_task(
+    event_type: str, task: schemas.TaskRead, previous_assignee: str | None
+) -> None:
+    # Sent to the same scopes the write bumped, once it is committed
+    scopes = [project_tasks_scope(task.project_id), assignee_scope(task.assignee)]
+    if previous_assignee != task.assignee:
+        scopes.append(assignee_scope(previous_assignee))
+    hub.publish(scopes, event_type, task)
+
+
 def create_task(db: Session, task_in: schemas.TaskCreate) -> models.Task:
-    task = models.Task(**task_in.model_dump())
+    # New tasks go last in their section
+    last = _last_rank(db, models.Task, _task_siblings(task_in.project_id, task_in.section_id))
+    data = task_in.model_dump()
+    task = models.Task(
+        **data,
+        **_completion(data, None),
+        rank=ranking.key_between(last, None),
+        change_seq=watermarks.next_sequence(db),
+    )
     db.add(task)
-    db.commit()
+    task_counts.adjust(db, task_counts.count_changes(added=[task_counts.key_of(task)]))
+    _commit_changes(db, [assignee_scope(task.assignee), project_tasks_scope(task.project_id)])
     db.refresh(task)
+    _publish_task("task.created", schemas.TaskRead.model_validate(task), task.assignee)
     return task
 
 
+TASK_READ_COLUMNS = _read_columns(models.Task, schemas.TaskRead)
+
+
 def list_tasks(
     db: Session,
     *,
     project_id: int | None = None,
     assignee: str | None = None,
     status: str | None = None,
-) -> Sequence[models.Task]:
-    stmt = select(models.Task)
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+    fields: Sequence[str] | None = None,
+    include_archived: bool = False,
+) -> Sequence[Row]:
+    """Read-only rows with the `TaskRead` columns, newest first.
+
+    `fields` narrows them to those names, in that order; `created_at` and `id` are
+    then still selected after them for the cursor. With `include_archived`, tasks
+    moved to `archived_tasks` are merged in.
+    """
+
+    def _select(model):
+        columns = (
+            _read_columns(model, schemas.TaskRead)
+            if fields is None
+            else _field_columns(model, fields, model.created_at, model.id)
+        )
+        stmt = select(*columns)
+        if project_id is not None:
+            stmt = stmt.where(model.project_id == project_id)
+        if assignee is not None:
+            stmt = stmt.where(model.assignee == assignee)
+        if status is not None:
+            stmt = stmt.where(model.status == status)
+        return stmt, model
+
+    arms = [_select(models.Task)]
+    if include_archived:
+        arms.append(_select(models.ArchivedTask))
+    return db.execute(_newest_first(arms, "created_at", after, limit)).all()
+
+
+TASK_EXPORT_COLUMNS = tuple(column.name for column in TASK_READ_COLUMNS)
+
+
+def iter_workspace_task_chunks(
+    session_factory: Callable[[], Session],
+    workspace_id: int,
+    *,
+    project_id: int | None = None,
+    assignee: str | None = None,
+    status: str | None = None,
+    chunk_size: int = 1000,
+) -> Iterator[Sequence[Row]]:
+    """Yield a workspace's tasks in id order, `chunk_size` Core rows at a time.
+
+    Takes the same filters as `list_tasks`. Each chunk is a keyset select on the
+    primary key run in its own short-lived session, so no connection or read
+    transaction is held while the caller streams a chunk to a slow client, and at
+    most one chunk is in memory at a time.
+    """
+
+    workspace_projects = select(models.Project.id).where(
+        models.Project.workspace_id == workspace_id
+    )
+    stmt = select(*TASK_READ_COLUMNS).where(models.Task.project_id.in_(workspace_projects))
     if project_id is not None:
         stmt = stmt.where(models.Task.project_id == project_id)
     if assignee is not None:
         stmt = stmt.where(models.Task.assignee == assignee)
     if status is not None:
         stmt = stmt.where(models.Task.status == status)
-    stmt = stmt.order_by(models.Task.created_at.desc())
-    return list(db.scalars(stmt))
+    stmt = stmt.order_by(models.Task.id).limit(chunk_size)
+
+    last_id = 0
+    while True:
+        with session_factory() as db:
+            rows = db.execute(stmt.where(models.Task.id > last_id)).all()
+        if not rows:
+            return
+        yield rows
+        if len(rows) < chunk_size:
+            return
+        last_id = rows[-1].id
 
 
 def get_task(db: Session, task_id: int) -> models.Task | None:
@@ -92,45 +464,751 @@ def get_task(db: Session, task_id: int) -> models.Task | None:
     return db.scalar(stmt)
 
 
+def read_task(db: Session, task_id: int, fields: Sequence[str] | None = None) -> Row | None:
+    """A read-only row with the `TaskRead` columns, or only `fields` of them."""
+
+    columns = TASK_READ_COLUMNS if fields is None else _field_columns(models.Task, fields)
+    return db.execute(select(*columns).where(models.Task.id == task_id)).first()
+
+
 def update_task(db: Session, task: models.Task, task_in: schemas.TaskUpdate) -> models.Task:
-    data = task_in.model_dump(exclude_unset=True)
-    for field, value in data.items():
+    # A task moved to another section keeps its rank: it lands wherever that falls
+    # there. `move_task` places it.
+    return _apply_task_changes(db, task, task_in.model_dump(exclude_unset=True))
+
+
+def _apply_task_changes(db: Session, task: models.Task, data: dict) -> models.Task:
+    # Reassignment moves the task between two users' Home pages
+    previous_assignee = task.assignee
+    previous_key = task_counts.key_of(task)
+    scopes = [assignee_scope(previous_assignee), project_tasks_scope(task.project_id)]
+    for field, value in {**data, **_completion(data, task.status)}.items():
         setattr(task, field, value)
+    task.change_seq = watermarks.next_sequence(db)
     db.add(task)
-    db.commit()
+    task_counts.adjust(
+        db, task_counts.count_changes(removed=[previous_key], added=[task_counts.key_of(task)])
+    )
+    _commit_changes(db, [*scopes, assignee_scope(task.assignee)])
     db.refresh(task)
+    _publish_task("task.updated", schemas.TaskRead.model_validate(task), previous_assignee)
     return task
 
 
+def delete_task(db: Session, task: models.Task) -> None:
+    deleted = schemas.TaskRead.model_validate(task)
+    workspace_id = lookups.project_workspace_id(db, task.project_id)
+    # The tombstone tells syncing clients the task is gone
+    db.add(
+        models.Tombstone(
+            entity="task",
+            entity_id=task.id,
+            workspace_id=workspace_id,
+            change_seq=watermarks.next_sequence(db),
+        )
+    )
+    db.execute(delete(models.TaskComment).where(models.TaskComment.task_id == task.id))
+    db.delete(task)
+    task_counts.adjust(db, task_counts.count_changes(removed=[task_counts.key_of(task)]))
+    _commit_changes(db, [assignee_scope(task.assignee), project_tasks_scope(task.project_id)])
+    _publish_task("task.deleted", deleted, deleted.assignee)
+
+
+BOARD_COLUMN_SIZE = 50
+
+
+class BoardColumnRows(NamedTuple):
+    # None for the tasks outside any section
+    section: Row | None
+    tasks: list[Row]
+    next_cursor: str | None
+
+
+def _board_column(section: Row | None, section_id: int | None, rows, limit: int):
+    tasks = list(itertools.islice(rows, limit + 1))
+    next_cursor = None
+    if len(tasks) > limit:
+        last = tasks[limit - 1]
+        next_cursor = encode_column_cursor(section_id, last.rank, last.id)
+    return BoardColumnRows(section, tasks[:limit], next_cursor)
+
+
+def get_board(
+    db: Session,
+    project_id: int,
+    *,
+    limit: int = BOARD_COLUMN_SIZE,
+    after: tuple[int | None, tuple[str, int]] | None = None,
+) -> list[BoardColumnRows]:
+    """The project's sections in order, each with its first `limit` tasks.
+
+    Tasks outside any section come first, in a column without a section, if there are
+    any. One query numbers every section's tasks with a window over
+    `ix_tasks_project_section_rank` and returns the first `limit + 1` of each, ordered
+    like the sections, so the columns are grouped as the rows stream in. Tasks whose
+    section is not one of the project's are left out.
+
+    `after` (a decoded column cursor) loads the next tasks of that one column instead.
+    """
+
+    task = models.Task
+    if after is not None:
+        section_id, position = after
+        section = None
+        if section_id is not None:
+            section = db.execute(
+                select(*SECTION_READ_COLUMNS).where(
+                    models.Section.id == section_id, models.Section.project_id == project_id
+                )
+            ).first()
+            if section is None:
+                return []
+        stmt = (
+            select(*TASK_READ_COLUMNS)
+            .where(
+                task.project_id == project_id,
+                task.section_id == section_id,
+                _keyset_after(task.rank, task.id, position),
+            )
+            .order_by(task.rank, task.id)
+            .limit(limit + 1)
+        )
+        return [_board_column(section, section_id, iter(db.execute(stmt)), limit)]
+
+    sections = list_sections(db, project_id)
+    ranked = (
+        select(
+            task.id.label("task_id"),
+            func.row_number()
+            .over(partition_by=task.section_id, order_by=(task.rank, task.id))
+            .label("position"),
+        )
+        .where(task.project_id == project_id)
+        .subquery()
+    )
+    stmt = (
+        select(*TASK_READ_COLUMNS)
+        .join(ranked, ranked.c.task_id == task.id)
+        .outerjoin(models.Section, models.Section.id == task.section_id)
+        .where(ranked.c.position <= limit + 1)
+        # The same order as `sections`, with the unsectioned tasks first
+        .order_by(
+            models.Section.rank.nulls_first(),
+            task.section_id.nulls_first(),
+            ranked.c.position,
+        )
+    )
+    # Tasks pointing at a section outside the project have no column to go in
+    section_ids = {section.id for section in sections}
+    groups = (
+        (group_id, rows)
+        for group_id, rows in itertools.groupby(db.execute(stmt), key=lambda row: row.section_id)
+        if group_id is None or group_id in section_ids
+    )
+    group_id, rows = next(groups, (None, iter(())))
+
+    columns = []
+    if group_id is None:
+        column = _board_column(None, None, rows, limit)
+        if column.tasks:
+            columns.append(column)
+        group_id, rows = next(groups, (None, iter(())))
+    for section in sections:
+        if group_id == section.id:
+            columns.append(_board_column(section, section.id, rows, limit))
+            group_id, rows = next(groups, (None, iter(())))
+        else:
+            columns.append(BoardColumnRows(section, [], None))
+    return columns
+
+
+def get_project_stats(db: Session, project_id: int, today: date) -> schemas.ProjectStats:
+    """Task counts of the project by status and section, from the maintained counters."""
+
+    by_section: dict[int | None, dict[str, int]] = {}
+    for section_id, status, count in task_counts.project_counts(db, project_id):
+        section_key = None if section_id == task_counts.NO_SECTION else section_id
+        by_section.setdefault(section_key, {})[status] = count
+
+    by_status: dict[str, int] = {}
+    for counts in by_section.values():
+        for status, count in counts.items():
+            by_status[status] = by_status.get(status, 0) + count
+    sections = [
+        schemas.SectionStats(section_id=section_id, total=sum(counts.values()), by_status=counts)
+        for section_id, counts in sorted(by_section.items(), key=lambda item: item[0] or 0)
+    ]
+    return schemas.ProjectStats(
+        project_id=project_id,
+        total=sum(by_status.values()),
+        overdue=task_counts.overdue_count(db, project_id, today) if by_status else 0,
+        by_status=by_status,
+        sections=sections,
+    )
+
+
+# Task batches
+#
+# Every item is validated up front against one lookup query; items that fail
+# validation get an error result and do not block the others. All valid items are
+# then written in a single transaction, so the write itself is all-or-nothing: if it
+# fails, the request fails and nothing from the batch is stored.
+
+class _Ref(NamedTuple):
+    # The workspace of a project; the project of a section or task
+    parent_id: int | None
+    assignee: str | None = None
+    section_id: int | None = None
+    status: str | None = None
+
+
+def _batch_references(
+    db: Session,
+    *,
+    project_ids: Iterable[int] = (),
+    section_ids: Iterable[int] = (),
+    task_ids: Iterable[int] = (),
+) -> dict[str, dict[int, _Ref]]:
+    """Look up every referenced project, section and task in one round trip.
+
+    Returns `{kind: {id: ref}}` for the rows that exist. Projects and sections already
+    in the lookup cache are not queried; when that covers all of them and there are
+    no tasks, no query runs at all.
+    """
+
+    project_ids, section_ids, task_ids = set(project_ids), set(section_ids), set(task_ids)
+    found: dict[str, dict[int, _Ref]] = {
+        kind: {row_id: _Ref(parent_id) for row_id, parent_id in cached.items()}
+        for kind, cached in (
+            ("project", lookups.cached_parents("project", project_ids)),
+            ("section", lookups.cached_parents("section", section_ids)),
+        )
+    }
+    found["task"] = {}
+    project_ids -= found["project"].keys()
+    section_ids -= found["section"].keys()
+    if not (project_ids or section_ids or task_ids):
+        return found
+
+    def _select(kind: str, model, ids, parent_col, *task_cols):
+        task_cols = task_cols or (null(), null(), null())
+        return select(
+            literal(kind).label("kind"),
+            model.id.label("id"),
+            parent_col.label("parent_id"),
+            *(col.label(name) for col, name in zip(task_cols, _Ref._fields[1:])),
+        ).where(model.id.in_(ids))
+
+    stmt = union_all(
+        _select("project", models.Project, project_ids, models.Project.workspace_id),
+        _select("section", models.Section, section_ids, models.Section.project_id),
+        _select(
+            "task",
+            models.Task,
+            task_ids,
+            models.Task.project_id,
+            models.Task.assignee,
+            models.Task.section_id,
+            models.Task.status,
+        ),
+    )
+    for row in db.execute(stmt):
+        found[row.kind][row.id] = _Ref(row.parent_id, row.assignee, row.section_id, row.status)
+        if row.kind != "task":
+            lookups.remember(db, row.kind, row.id, row.parent_id)
+    return found
+
+
+# SQLite's limit on the SELECTs in one UNION
+_MAX_COMPOUND_SELECT = 500
+
+
+def _last_task_ranks(
+    db: Session, sections: Sequence[tuple[int, int | None]]
+) -> dict[tuple[int, int | None], str | None]:
+    """The last task rank of each `(project_id, section_id)`, in one round trip."""
+
+    last: dict[tuple[int, int | None], str | None] = dict.fromkeys(sections)
+    for start in range(0, len(sections), _MAX_COMPOUND_SELECT):
+        chunk = sections[start : start + _MAX_COMPOUND_SELECT]
+        # Each arm is an index seek; SQLite only takes a LIMIT in a compound's subqueries
+        arms = []
+        for index, (project_id, section_id) in enumerate(chunk, start):
+            arm = (
+                select(literal(index).label("section"), models.Task.rank)
+                .where(*_task_siblings(project_id, section_id))
+                .order_by(models.Task.rank.desc(), models.Task.id.desc())
+                .limit(1)
+                .subquery()
+            )
+            arms.append(select(arm.c.section, arm.c.rank))
+        for index, rank in db.execute(union_all(*arms)):
+            last[sections[index]] = rank or None
+    return last
+
+
+def _batch_error(index: int, status: int, error: str) -> schemas.TaskBatchItemResult:
+    return schemas.TaskBatchItemResult(index=index, status=status, error=error)
+
+
+def create_tasks(
+    db: Session, items: Sequence[schemas.TaskCreate]
+) -> list[schemas.TaskBatchItemResult]:
+    refs = _batch_references(
+        db,
+        project_ids=(item.project_id for item in items),
+        section_ids=(item.section_id for item in items if item.section_id is not None),
+    )
+
+    results: list[schemas.TaskBatchItemResult | None] = [None] * len(items)
+    valid: list[tuple[int, schemas.TaskCreate]] = []
+    for index, item in enumerate(items):
+        if item.project_id not in refs["project"]:
+            results[index] = _batch_error(index, 404, "Project not found")
+        elif item.section_id is not None and (
+            refs["section"].get(item.section_id, _Ref(None)).parent_id != item.project_id
+        ):
+            results[index] = _batch_error(index, 400, "Invalid section_id")
+        else:
+            valid.append((index, item))
+
+    if valid:
+        # New tasks go last in their section, in request order
+        by_section: dict[tuple[int, int | None], list[int]] = {}
+        for position, (_, item) in enumerate(valid):
+            by_section.setdefault((item.project_id, item.section_id), []).append(position)
+        ranks: list[str] = [""] * len(valid)
+        last_ranks = _last_task_ranks(db, list(by_section))
+        for section, positions in by_section.items():
+            new_ranks = ranking.keys_between(last_ranks[section], None, len(positions))
+            for position, rank in zip(positions, new_ranks):
+                ranks[position] = rank
+
+        # One multi-row INSERT ... RETURNING for the whole batch
+        change_seq = watermarks.next_sequence(db)
+        stmt = insert(models.Task).returning(models.Task, sort_by_parameter_order=True)
+        tasks = db.scalars(
+            stmt,
+            [
+                {
+                    **item.model_dump(),
+                    **_completion(item.model_dump(), None),
+                    "rank": rank,
+                    "change_seq": change_seq,
+                }
+                for (_, item), rank in zip(valid, ranks)
+            ],
+        ).all()
+        for (index, _), task in zip(valid, tasks):
+            results[index] = schemas.TaskBatchItemResult(
+                index=index, status=201, task=schemas.TaskRead.model_validate(task)
+            )
+        task_counts.adjust(
+            db, task_counts.count_changes(added=[task_counts.key_of(task) for task in tasks])
+        )
+        scopes = set()
+        for _, item in valid:
+            scopes.update([assignee_scope(item.assignee), project_tasks_scope(item.project_id)])
+        _commit_changes(db, scopes)
+        for index, item in valid:
+            _publish_task("task.created", results[index].task, item.assignee)
+    return results
+
+
+def update_tasks(
+    db: Session, items: Sequence[schemas.TaskBatchUpdateItem]
+) -> list[schemas.TaskBatchItemResult]:
+    refs = _batch_references(
+        db,
+        task_ids=(item.id for item in items),
+        section_ids=(
+            item.section_id
+            for item in items
+            if "section_id" in item.model_fields_set and item.section_id is not None
+        ),
+    )
+
+    results: list[schemas.TaskBatchItemResult | None] = [None] * len(items)
+    rows: list[dict] = []
+    valid: list[tuple[int, int]] = []
+    scopes: set[str] = set()
+    seen: set[int] = set()
+    for index, item in enumerate(items):
+        data = item.model_dump(exclude_unset=True, exclude={"id"})
+        current = refs["task"].get(item.id)
+        if current is None:
+            results[index] = _batch_error(index, 404, "Task not found")
+        elif item.id in seen:
+            results[index] = _batch_error(index, 400, "Duplicate task id in batch")
+        elif data.get("section_id") is not None and (
+            refs["section"].get(data["section_id"], _Ref(None)).parent_id != current.parent_id
+        ):
+            results[index] = _batch_error(index, 400, "Invalid section_id")
+        else:
+            seen.add(item.id)
+            valid.append((index, item.id))
+            rows.append({"id": item.id, **data, **_completion(data, current.status)})
+            scopes.update(
+                [project_tasks_scope(current.parent_id), assignee_scope(current.assignee)]
+            )
+            if "assignee" in data:
+                scopes.add(assignee_scope(data["assignee"]))
+
+    if valid:
+        # ORM bulk UPDATE by primary key: one executemany per distinct set of fields
+        changed = [row for row in rows if len(row) > 1]
+        if changed:
+            change_seq = watermarks.next_sequence(db)
+            db.execute(
+                update(models.Task), [{**row, "change_seq": change_seq} for row in changed]
+            )
+        stmt = (
+            select(models.Task)
+            .where(models.Task.id.in_([task_id for _, task_id in valid]))
+            .execution_options(populate_existing=True)
+        )
+        tasks = {task.id: task for task in db.scalars(stmt)}
+        for index, task_id in valid:
+            results[index] = schemas.TaskBatchItemResult(
+                index=index, status=200, task=schemas.TaskRead.model_validate(tasks[task_id])
+            )
+        previous = refs["task"]
+        task_counts.adjust(
+            db,
+            task_counts.count_changes(
+                removed=[
+                    (previous[i].parent_id, previous[i].section_id, previous[i].status)
+                    for _, i in valid
+                ],
+                added=[task_counts.key_of(tasks[i]) for _, i in valid],
+            ),
+        )
+        _commit_changes(db, scopes)
+        for index, task_id in valid:
+            _publish_task("task.updated", results[index].task, refs["task"][task_id].assignee)
+    return results
+
+
+# Comments
+#
+# A thread is read oldest first, by keyset on the `(task_id, created_at, id)` index, so
+# a deep page costs what the first one does. Comments are only ever appended; every
+# append also updates the comment count and last-comment preview on the task row in
+# the same transaction, and task lists read those instead of joining comments.
+
+COMMENT_PREVIEW_LENGTH = 140
+
+COMMENT_READ_COLUMNS = _read_columns(models.TaskComment, schemas.CommentRead)
+
+
+def list_comments(
+    db: Session,
+    task_id: int,
+    *,
+    limit: int | None = None,
+    after: tuple[datetime, int] | None = None,
+) -> Sequence[Row]:
+    """Read-only rows with the `CommentRead` columns of a task's comments, oldest first."""
+
+    stmt = select(*COMMENT_READ_COLUMNS).where(models.TaskComment.task_id == task_id)
+    if after is not None:
+        stmt = stmt.where(
+            _keyset_after(models.TaskComment.created_at, models.TaskComment.id, after)
+        )
+    stmt = stmt.order_by(models.TaskComment.created_at, models.TaskComment.id)
+    if limit is not None:
+        stmt = stmt.limit(limit)
+    return db.execute(stmt).all()
+
+
+def add_comments(
+    db: Session, task: models.Task, comments_in: Sequence[schemas.CommentCreate]
+) -> list[schemas.CommentRead]:
+    """Append `comments_in` to the task's thread, in order, in one transaction."""
+
+    # A single INSERT ... VALUES statement for the whole batch, rather than one per row
+    # as an executemany with ordered RETURNING would issue. Rows get ascending ids in
+    # VALUES order, and the ids order comments sharing a timestamp.
+    created_at = datetime.utcnow()
+    stmt = (
+        insert(models.TaskComment)
+        .values(
+            [
+                {**comment.model_dump(), "task_id": task.id, "created_at": created_at}
+                for comment in comments_in
+            ]
+        )
+        .returning(*COMMENT_READ_COLUMNS)
+    )
+    rows = sorted(db.execute(stmt).all(), key=lambda row: row.id)
+    added = [schemas.CommentRead.model_validate(row) for row in rows]
+
+    last = added[-1]
+    # Incremented in SQL, so concurrent appends cannot lose a count
+    task.comment_count = models.Task.comment_count + len(added)
+    task.last_comment_at = last.created_at
+    task.last_comment_author = last.author
+    task.last_comment_preview = last.body[:COMMENT_PREVIEW_LENGTH]
+    task.change_seq = watermarks.next_sequence(db)
+    db.add(task)
+    _commit_changes(db, [assignee_scope(task.assignee), project_tasks_scope(task.project_id)])
+    db.refresh(task)
+    _publish_task("task.updated", schemas.TaskRead.model_validate(task), task.assignee)
+    return added
+
+
+def refresh_comment_summaries(db: Session) -> int:
+    """Recompute every commented task's count and preview from its comments.
+
+    For comments written around crud (imports, manual SQL). Returns the number of
+    tasks updated; the caller commits.
+    """
+
+    comment = models.TaskComment
+    thread = select(comment).where(comment.task_id == models.Task.id)
+    newest = thread.order_by(comment.created_at.desc(), comment.id.desc()).limit(1)
+    result = db.execute(
+        update(models.Task)
+        .where(models.Task.id.in_(select(comment.task_id)))
+        .values(
+            comment_count=thread.with_only_columns(func.count()).scalar_subquery(),
+            last_comment_at=newest.with_only_columns(comment.created_at).scalar_subquery(),
+            last_comment_author=newest.with_only_columns(comment.author).scalar_subquery(),
+            last_comment_preview=newest.with_only_columns(
+                func.substr(comment.body, 1, COMMENT_PREVIEW_LENGTH)
+            ).scalar_subquery(),
+        )
+        .execution_options(synchronize_session=False)
+    )
+    return result.rowcount
+
+
+# Archival
+#
+# Completed tasks older than `ARCHIVE_COMPLETED_AFTER_DAYS`, and every task of an
+# archived project, move with their comments to `archived_tasks` and
+# `archived_task_comments`, keeping their task ids. The hot tables and their indexes
+# then only hold what the default views show; task lists merge the archive back in
+# when asked to (`include_archived`). Archived tasks leave the task counters, search
+# and the board, and are no longer writable.
+
+_TASK_COLUMN_NAMES = tuple(column.name for column in models.Task.__table__.c)
+_ARCHIVED_COMMENT_COLUMNS = ("task_id", "author", "body", "created_at")
+
+
+def _due_for_archival(completed_before: datetime):
+    archived_projects = select(models.Project.id).where(models.Project.is_archived == true())
+    return or_(
+        and_(
+            models.Task.status == task_counts.COMPLETED,
+            models.Task.completed_at < completed_before,
+        ),
+        models.Task.project_id.in_(archived_projects),
+    )
+
+
+def archive_tasks(db: Session, completed_before: datetime, *, chunk_size: int = 1000) -> int:
+    """Move the tasks due for archival, with their comments; returns how many moved.
+
+    Each chunk of `chunk_size` tasks is copied, deleted and committed in its own short
+    transaction, so concurrent writers wait for one chunk at most.
+    """
+
+    due = _due_for_archival(completed_before)
+    comment = models.TaskComment
+    moved = 0
+    while True:
+        # Moved rows leave `tasks`, so each round just takes the first due ones
+        rows = db.execute(
+            select(
+                models.Task.id,
+                models.Task.project_id,
+                models.Task.section_id,
+                models.Task.status,
+                models.Task.assignee,
+                models.Project.workspace_id,
+            )
+            .join(models.Project, models.Project.id == models.Task.project_id)
+            .where(due)
+            .limit(chunk_size)
+        ).all()
+        if not rows:
+            return moved
+        ids = [row.id for row in rows]
+
+        archived_at = literal(datetime.utcnow(), models.ArchivedTask.archived_at.type)
+        db.execute(
+            insert(models.ArchivedTask).from_select(
+                [*_TASK_COLUMN_NAMES, "archived_at"],
+                select(*models.Task.__table__.c, archived_at).where(models.Task.id.in_(ids)),
+            )
+        )
+        # New comment ids, assigned in thread order
+        db.execute(
+            insert(models.ArchivedTaskComment).from_select(
+                _ARCHIVED_COMMENT_COLUMNS,
+                select(*(comment.__table__.c[name] for name in _ARCHIVED_COMMENT_COLUMNS))
+                .where(comment.task_id.in_(ids))
+                .order_by(comment.task_id, comment.created_at, comment.id),
+            )
+        )
+        db.execute(delete(comment).where(comment.task_id.in_(ids)))
+        db.execute(delete(models.Task).where(models.Task.id.in_(ids)))
+        # To syncing clients an archived task is a deleted one
+        change_seq = watermarks.next_sequence(db)
+        db.execute(
+            insert(models.Tombstone),
+            [
+                {
+                    "entity": "task",
+                    "entity_id": row.id,
+                    "workspace_id": row.workspace_id,
+                    "change_seq": change_seq,
+                }
+                for row in rows
+            ],
+        )
+        task_counts.adjust(
+            db, task_counts.count_changes(removed=[task_counts.key_of(row) for row in rows])
+        )
+        scopes = set()
+        for row in rows:
+            scopes.update([project_tasks_scope(row.project_id), assignee_scope(row.assignee)])
+        _commit_changes(db, scopes)
+        moved += len(rows)
+
+
+# Delta sync
+#
+# Every task and project write stamps the rows it touches with a number from the
+# global change sequence (`watermarks.next_sequence`); deletions leave a tombstone with
+# one. A client that has seen everything up to sequence N only needs the rows and
+# tombstones numbered above N.
+
+SYNC_MAX_CHANGES = 1000
+
+
+def get_changes(
+    db: Session, since: int | None, *, workspace_id: int | None = None
+) -> schemas.SyncResponse:
+    """Changes numbered in `(since, head]`, where `head` is the current sequence.
+
+    Answers with `reset` instead when the client has to reload: on its first sync,
+    when more than `SYNC_MAX_CHANGES` rows changed, or when `since` predates tombstones
+    that have been pruned.
+    """
+
+    # Read first: every change numbered up to head is committed and visible below
+    counters = watermarks.read(db, [watermarks.CHANGE_SEQUENCE, watermarks.TOMBSTONES_PRUNED])
+    head = counters[watermarks.CHANGE_SEQUENCE]
+    reset = schemas.SyncResponse(cursor=encode_sequence_cursor(head), reset=True)
+    if since is None or since < counters[watermarks.TOMBSTONES_PRUNED]:
+        return reset
+
+    def _changed(columns, seq_col, *where):
+        stmt = select(*columns).where(seq_col > since, seq_col <= head, *where)
+        return db.execute(stmt.order_by(seq_col).limit(SYNC_MAX_CHANGES + 1)).all()
+
+    project_filter, task_filter, tombstone_filter = (), (), ()
+    if workspace_id is not None:
+        # `+ 0` keeps the planner on the change_seq indexes: the sequence range is the
+        # selective predicate, not the workspace's full task list followed by a sort
+        workspace_projects = select(models.Project.id).where(
+            models.Project.workspace_id == workspace_id
+        )
+        project_filter = (models.Project.workspace_id + 0 == workspace_id,)
+        task_filter = ((models.Task.project_id + 0).in_(workspace_projects),)
+        tombstone_filter = (models.Tombstone.workspace_id == workspace_id,)
+
+    projects = _changed(PROJECT_READ_COLUMNS, models.Project.change_seq, *project_filter)
+    tasks = _changed(TASK_READ_COLUMNS, models.Task.change_seq, *task_filter)
+    tombstones = _changed(
+        (models.Tombstone.entity, models.Tombstone.entity_id),
+        models.Tombstone.change_seq,
+        *tombstone_filter,
+    )
+    if len(projects) + len(tasks) + len(tombstones) > SYNC_MAX_CHANGES:
+        return reset
+
+    deleted: dict[str, list[int]] = {"project": [], "task": []}
+    for entity, entity_id in tombstones:
+        deleted[entity].append(entity_id)
+    return schemas.SyncResponse(
+        cursor=encode_sequence_cursor(head),
+        projects=[schemas.ProjectRead.model_validate(p) for p in projects],
+        tasks=[schemas.TaskRead.model_validate(t) for t in tasks],
+        deleted_projects=deleted["project"],
+        deleted_tasks=deleted["task"],
+    )
+
+
+def prune_tombstones(db: Session, older_than: datetime) -> int:
+    """Delete tombstones from before `older_than`; returns how many were removed.
+
+    Sync cursors older than the newest pruned tombstone get a reset from then on.
+    """
+
+    pruned_through = db.scalar(
+        select(func.max(models.Tombstone.change_seq)).where(
+            models.Tombstone.deleted_at < older_than
+        )
+    )
+    if pruned_through is None:
+        return 0
+    result = db.execute(
+        delete(models.Tombstone).where(models.Tombstone.change_seq <= pruned_through)
+    )
+    watermarks.set_version(db, watermarks.TOMBSTONES_PRUNED, pruned_through)
+    db.commit()
+    return result.rowcount
+
+
 # Home summaries
 
+HOME_RECENT_PROJECTS_LIMIT = 8
+HOME_MY_TASKS_LIMIT = 20
+
+
 def get_home_summary(db: Session, me_assignee: str = "me") -> schemas.HomeResponse:
-    # Recent projects
-    projects = list_projects(db)
-    recent_projects = [
-        schemas.HomeProjectSummary(
-            id=p.id,
-            name=p.name,
-            color=p.color,
-            icon=p.icon,
+    # Two bounded queries, so the cost does not grow with the size of the workspace
+    projects_stmt = (
+        select(
+            models.Project.id,
+            models.Project.name,
+            models.Project.color,
+            models.Project.icon,
         )
-        for p in projects[:8]
+        .where(models.Project.is_archived == false())
+        .order_by(models.Project.updated_at.desc(), models.Project.id.desc())
+        .limit(HOME_RECENT_PROJECTS_LIMIT)
+    )
+    recent_projects = [
+        schemas.HomeProjectSummary(id=p.id, name=p.name, color=p.color, icon=p.icon)
+        for p in db.execute(projects_stmt)
     ]
 
-    # My tasks (assigned to "me")
-    tasks = list_tasks(db, assignee=me_assignee)
-    project_by_id = {p.id: p for p in projects}
-    my_tasks = []
-    for t in tasks[:20]:
-        project = project_by_id.get(t.project_id)
-        my_tasks.append(
-            schemas.HomeTaskSummary(
-                id=t.id,
-                name=t.name,
-                project_id=t.project_id,
-                project_name=project.name if project else "Unknown",
-                status=t.status,
-            )
+    tasks_stmt = (
+        select(
+            models.Task.id,
+            models.Task.name,
+            models.Task.project_id,
+            func.coalesce(models.Project.name, "Unknown").label("project_name"),
+            models.Task.status,
         )
+        .outerjoin(models.Project, models.Project.id == models.Task.project_id)
+        .where(models.Task.assignee == me_assignee)
+        .order_by(models.Task.created_at.desc(), models.Task.id.desc())
+        .limit(HOME_MY_TASKS_LIMIT)
+    )
+    my_tasks = [
+        schemas.HomeTaskSummary(
+            id=t.id,
+            name=t.name,
+            project_id=t.project_id,
+            project_name=t.project_name,
+            status=t.status,
+        )
+        for t in db.execute(tasks_stmt)
+    ]
 
     return schemas.HomeResponse(my_tasks=my_tasks, recent_projects=recent_projects)
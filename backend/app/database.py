@@ -1,22 +1,151 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Concatenate, ParamSpec, TypeVar
 
-from .config import get_settings
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session, sessionmaker, DeclarativeBase
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
+from starlette.concurrency import run_in_threadpool
+
+from .config import Settings, get_settings
 
 
 settings = get_settings()
 
+P = ParamSpec("P")
+R = TypeVar("R")
+
+# Async drivers used when DB_MODE=async, keyed by the sync URL's backend name
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg"}
+
 
 class Base(DeclarativeBase):
     pass
 
 
-engine = create_engine(
-    settings.database_url,
-    connect_args={"check_same_thread": False} if settings.database_url.startswith("sqlite") else {},
+def to_async_url(database_url: str) -> str:
+    url = make_url(database_url)
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {url.get_backend_name()!r}")
+    return url.set(drivername=f"{url.get_backend_name()}+{driver}").render_as_string(
+        hide_password=False
+    )
+
+
+def _is_sqlite(database_url: str) -> bool:
+    return make_url(database_url).get_backend_name() == "sqlite"
+
+
+def _engine_options(config: Settings, *, read_only: bool, is_async: bool) -> dict:
+    options: dict = {}
+    url = make_url(config.database_url)
+    if _is_sqlite(config.database_url):
+        options["connect_args"] = {"check_same_thread": False}
+        if url.database in (None, "", ":memory:"):
+            # In-memory databases live in a single connection; keep SQLAlchemy's pool
+            return options
+    options.update(
+        poolclass=AsyncAdaptedQueuePool if is_async else QueuePool,
+        pool_size=config.db_read_pool_size if read_only else config.db_pool_size,
+        max_overflow=config.db_read_max_overflow if read_only else config.db_max_overflow,
+        pool_timeout=config.db_pool_timeout,
+    )
+    return options
+
+
+def install_sqlite_pragmas(engine: Engine, config: Settings, *, read_only: bool) -> None:
+    """Apply the production SQLite profile to every new connection of `engine`.
+
+    Writers open their transactions with BEGIN IMMEDIATE so they queue on
+    `busy_timeout` instead of failing with "database is locked" when a deferred
+    transaction tries to upgrade its read lock while another writer holds it.
+    """
+
+    pragmas = [
+        "PRAGMA journal_mode=WAL",
+        "PRAGMA synchronous=NORMAL",
+        f"PRAGMA busy_timeout={config.sqlite_busy_timeout_ms}",
+        f"PRAGMA mmap_size={config.sqlite_mmap_size}",
+        f"PRAGMA cache_size={config.sqlite_cache_size}",
+        "PRAGMA temp_store=MEMORY",
+    ]
+    if read_only:
+        pragmas.append("PRAGMA query_only=ON")
+
+    @event.listens_for(engine, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        # Let SQLAlchemy's "begin" event below own transaction start
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        for pragma in pragmas:
+            cursor.execute(pragma)
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _on_begin(conn):
+        conn.exec_driver_sql("BEGIN" if read_only else "BEGIN IMMEDIATE")
+
+
+def build_engine(config: Settings, *, read_only: bool = False) -> Engine:
+    engine = create_engine(
+        config.database_url, **_engine_options(config, read_only=read_only, is_async=False)
+    )
+    if config.sqlite_profile == "production" and _is_sqlite(config.database_url):
+        install_sqlite_pragmas(engine, config, read_only=read_only)
+    return engine
+
+
+def build_async_engine(config: Settings, *, read_only: bool = False):
+    engine = create_async_engine(
+        to_async_url(config.database_url),
+        **_engine_options(config, read_only=read_only, is_async=True),
+    )
+    if config.sqlite_profile == "production" and _is_sqlite(config.database_url):
+        install_sqlite_pragmas(engine.sync_engine, config, read_only=read_only)
+    return engine
+
+
+# GET routes use the read engine. Under the production SQLite profile it is a separate
+# query_only pool, so in WAL mode reads proceed while the writer holds its lock.
+_separate_read_pool = settings.sqlite_profile == "production" and _is_sqlite(
+    settings.database_url
 )
 
+engine = build_engine(settings)
+read_engine = build_engine(settings, read_only=True) if _separate_read_pool else engine
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+ReadSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=read_engine)
+
+# Only built in async mode, so sync deployments do not need the async driver installed
+async_engine = build_async_engine(settings) if settings.db_mode == "async" else None
+async_read_engine = (
+    build_async_engine(settings, read_only=True)
+    if async_engine is not None and _separate_read_pool
+    else async_engine
+)
+
+AsyncSessionLocal = (
+    async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    if async_engine is not None
+    else None
+)
+AsyncReadSessionLocal = (
+    async_sessionmaker(async_read_engine, autoflush=False, expire_on_commit=False)
+    if async_read_engine is not None
+    else None
+)
+
+
+async def dispose_async_engines() -> None:
+    # aiosqlite runs each connection on a non-daemon thread; pooled connections
+    # have to be closed explicitly or they keep the process alive on shutdown.
+    for engine_ in (async_engine, async_read_engine):
+        if engine_ is not None:
+            await engine_.dispose()
 
 
 def get_db():
@@ -27,3 +156,68 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+def get_read_db():
+    db: Session = ReadSessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+async def get_async_read_db():
+    async with AsyncReadSessionLocal() as db:
+        yield db
+
+
+class DBSession(ABC):
+    """Request-scoped handle that runs the sync `crud` functions from async routes.
+
+    The same crud function serves both modes: `SyncDBSession` runs it on the thread
+    pool against a blocking `Session`, `AsyncDBSession` runs it through
+    `AsyncSession.run_sync`, which drives the async driver on the event loop.
+
+    Routes do all of their database work in a single `run` call. A session held
+    across an `await` keeps its pooled connection (and, for writes, SQLite's write
+    lock) while the request waits for another turn on the thread pool, which
+    deadlocks once the pool and the thread limiter are both saturated.
+    """
+
+    @abstractmethod
+    async def run(
+        self, fn: Callable[Concatenate[Session, P], R], *args: P.args, **kwargs: P.kwargs
+    ) -> R:
+        """Run `fn(session, *args, **kwargs)` and release the session's connection."""
+
+
+class SyncDBSession(DBSession):
+    def __init__(self, session: Session):
+        self.session = session
+
+    async def run(self, fn, *args, **kwargs):
+        return await run_in_threadpool(self._run, fn, *args, **kwargs)
+
+    def _run(self, fn, *args, **kwargs):
+        try:
+            return fn(self.session, *args, **kwargs)
+        finally:
+            # Hand the connection back to the pool on this thread; loaded objects stay
+            # readable for serialization after the session lets go of them.
+            self.session.close()
+
+
+class AsyncDBSession(DBSession):
+    def __init__(self, session: AsyncSession):
+        self.session = session
+
+    async def run(self, fn, *args, **kwargs):
+        try:
+            return await self.session.run_sync(fn, *args, **kwargs)
+        finally:
+            await self.session.close()
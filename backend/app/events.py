@@ -0,0 +1,172 @@
+"""Live change feed: task events pushed to SSE and WebSocket subscribers.
+
+The crud write paths publish an event after each commit, addressed to the same scopes
+they bump (`app.watermarks`): a project's task list, the assignees' Home pages. The
+`EventHub` fans events out to this process's subscribers, each of which has a bounded
+queue. A subscriber that falls `events_queue_size` events behind is not allowed to
+hold the publisher up or buffer without limit: its queue is replaced by a single
+overflow marker and it is disconnected, and the client refetches and reconnects.
+
+Publishing goes through an `EventBackend`. The default `InProcessBackend` delivers
+straight to the local hub, which is enough for a single worker. With several
+workers, point `EVENTS_BACKEND` at a backend built on a shared broker (Redis pub/sub,
+Postgres LISTEN/NOTIFY, ...) that calls `deliver` in every worker.
+"""
+
+import asyncio
+import importlib
+from abc import ABC, abstractmethod
+import json
+import threading
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass, field
+from pydantic import BaseModel
+
+from .config import Settings, get_settings
+
+Deliver = Callable[[list[str], str], None]
+
+
+@dataclass(frozen=True)
+class Event:
+    type: str
+    # The encoded `{"type": ..., "data": ...}` message, shared by every subscriber
+    message: str
+
+
+# Queued in place of the backlog when a subscriber falls too far behind
+OVERFLOW = Event(type="overflow", message='{"type":"overflow","data":{}}')
+
+
+class EventBackend(ABC):
+    """Carries published events to the `deliver` callback of every worker's hub."""
+
+    local_only = False
+
+    def bind(self, deliver: Deliver) -> None:
+        self._deliver = deliver
+
+    @abstractmethod
+    def publish(self, channels: list[str], message: str) -> None:
+        """Called from request threads right after a commit; must not block."""
+
+    async def start(self) -> None:
+        pass
+
+    async def stop(self) -> None:
+        pass
+
+
+class InProcessBackend(EventBackend):
+    # Every subscriber is in this process, so events nobody listens to can be skipped
+    local_only = True
+
+    def publish(self, channels: list[str], message: str) -> None:
+        self._deliver(channels, message)
+
+
+@dataclass(eq=False)
+class Subscription:
+    channels: tuple[str, ...]
+    queue: asyncio.Queue
+    loop: asyncio.AbstractEventLoop
+    closed: bool = field(default=False)
+
+    async def get(self) -> Event:
+        return await self.queue.get()
+
+    def _push(self, event: Event) -> None:
+        # Runs on the subscriber's event loop
+        if self.closed:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(OVERFLOW)
+            self.closed = True
+
+
+class EventHub:
+    def __init__(self, backend: EventBackend, queue_size: int):
+        self.backend = backend
+        self.queue_size = queue_size
+        self._subscribers: dict[str, set[Subscription]] = {}
+        self._lock = threading.Lock()
+        backend.bind(self.deliver)
+
+    def publish(self, channels: Iterable[str], event_type: str, data: BaseModel) -> None:
+        channels = sorted(set(channels))
+        if self.backend.local_only and not self._has_subscribers(channels):
+            return
+        message = f'{{"type":{json.dumps(event_type)},"data":{data.model_dump_json()}}}'
+        self.backend.publish(channels, message)
+
+    def deliver(self, channels: list[str], message: str) -> None:
+        """Hand a published message to the local subscribers of `channels`.
+
+        Thread-safe; each subscriber receives it at most once.
+        """
+
+        event = Event(type=json.loads(message)["type"], message=message)
+        with self._lock:
+            targets = set().union(*(self._subscribers.get(c, ()) for c in channels))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._push, event)
+            except RuntimeError:
+                # The subscriber's loop is gone; it unsubscribes on its way out
+                pass
+
+    def subscribe(self, *channels: str) -> Subscription:
+        """Register a subscriber; must be called from the event loop that consumes it."""
+
+        subscription = Subscription(
+            channels=channels,
+            queue=asyncio.Queue(maxsize=self.queue_size),
+            loop=asyncio.get_running_loop(),
+        )
+        with self._lock:
+            for channel in channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        subscription.closed = True
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def _has_subscribers(self, channels: list[str]) -> bool:
+        with self._lock:
+            return any(channel in self._subscribers for channel in channels)
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(set().union(*self._subscribers.values()))
+
+    async def start(self) -> None:
+        await self.backend.start()
+
+    async def stop(self) -> None:
+        await self.backend.stop()
+
+
+def load_backend(config: Settings) -> EventBackend:
+    """`memory`, or the import path of a backend factory: `package.module:name`."""
+
+    if config.events_backend == "memory":
+        return InProcessBackend()
+    module_name, _, attr = config.events_backend.partition(":")
+    factory = getattr(importlib.import_module(module_name), attr)
+    return factory(config)
+
+
+_settings = get_settings()
+
+hub = EventHub(load_backend(_settings), queue_size=_settings.events_queue_size)
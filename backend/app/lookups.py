@@ -0,0 +1,162 @@
+"""Cached existence lookups for request validation.
+
+Routes check that the workspace, project or section an id refers to exists (and
+which parent it belongs to) before doing the real work. These checks are answered,
+in order, from:
+
+- the session: `Session.info` remembers every lookup, found or not, until the
+  transaction ends, so a request never checks the same id twice;
+- `lookup_cache`, a process-wide LRU of the rows known to exist;
+- a primary-key query, whose result fills both.
+
+Only existing rows are cached across requests: a missing id may be created later,
+but an existing workspace, project or section never moves to another parent. ORM
+updates and deletes of those rows evict them, so write paths that do either stay
+correct. Bulk `update()`/`delete()` statements bypass that and must call
+`lookup_cache.discard` themselves. With several workers, a deletion only evicts the
+worker that handled it.
+"""
+
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from . import models
+from .config import get_settings
+
+# kind -> (model, parent column); a workspace is its own parent
+_KINDS = {
+    "workspace": (models.Workspace, models.Workspace.id),
+    "project": (models.Project, models.Project.workspace_id),
+    "section": (models.Section, models.Section.project_id),
+}
+_MODEL_KINDS = {model: kind for kind, (model, _) in _KINDS.items()}
+
+_SESSION_KEY = "lookups"
+_MISSING = object()
+
+
+class LookupCache:
+    def __init__(self, max_entries: int, enabled: bool = True):
+        self.max_entries = max_entries
+        self.enabled = enabled
+        self._entries: OrderedDict[tuple[str, int], int] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, kind: str, row_id: int) -> Any:
+        with self._lock:
+            parent_id = self._entries.get((kind, row_id), _MISSING)
+            if parent_id is _MISSING:
+                self.misses += 1
+            else:
+                self._entries.move_to_end((kind, row_id))
+                self.hits += 1
+            return parent_id
+
+    def put(self, kind: str, row_id: int, parent_id: int) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self._entries[(kind, row_id)] = parent_id
+            self._entries.move_to_end((kind, row_id))
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, kind: str, row_id: int) -> None:
+        with self._lock:
+            self._entries.pop((kind, row_id), None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_settings = get_settings()
+
+lookup_cache = LookupCache(
+    max_entries=_settings.lookup_cache_max_entries, enabled=_settings.lookup_cache_enabled
+)
+
+
+def _lookup(db: Session, kind: str, row_id: int) -> int | None:
+    """The parent id of an existing row, or None if it does not exist."""
+
+    seen: dict[tuple[str, int], int | None] = db.info.setdefault(_SESSION_KEY, {})
+    key = (kind, row_id)
+    if key in seen:
+        return seen[key]
+    parent_id = lookup_cache.get(kind, row_id) if lookup_cache.enabled else _MISSING
+    if parent_id is _MISSING:
+        model, parent_col = _KINDS[kind]
+        parent_id = db.scalar(select(parent_col).where(model.id == row_id))
+        if parent_id is not None:
+            lookup_cache.put(kind, row_id, parent_id)
+    seen[key] = parent_id
+    return parent_id
+
+
+def workspace_exists(db: Session, workspace_id: int) -> bool:
+    return _lookup(db, "workspace", workspace_id) is not None
+
+
+def project_workspace_id(db: Session, project_id: int) -> int | None:
+    """The workspace of the project, or None if there is no such project."""
+
+    return _lookup(db, "project", project_id)
+
+
+def section_project_id(db: Session, section_id: int) -> int | None:
+    """The project of the section, or None if there is no such section."""
+
+    return _lookup(db, "section", section_id)
+
+
+def remember(db: Session, kind: str, row_id: int, parent_id: int) -> None:
+    """Record a row this request just created, so later checks skip the query."""
+
+    db.info.setdefault(_SESSION_KEY, {})[(kind, row_id)] = parent_id
+    lookup_cache.put(kind, row_id, parent_id)
+
+
+def cached_parents(kind: str, row_ids) -> dict[int, int]:
+    """The process-wide entries among `row_ids`, for callers that batch the rest."""
+
+    if not lookup_cache.enabled:
+        return {}
+    found = {}
+    for row_id in set(row_ids):
+        parent_id = lookup_cache.get(kind, row_id)
+        if parent_id is not _MISSING:
+            found[row_id] = parent_id
+    return found
+
+
+@event.listens_for(Session, "after_transaction_end")
+def _forget_session_lookups(session: Session, transaction) -> None:
+    # Negative answers must not outlive the transaction that saw them
+    if transaction.parent is None:
+        session.info.pop(_SESSION_KEY, None)
+
+
+def _evict(mapper, connection, target) -> None:
+    lookup_cache.discard(_MODEL_KINDS[mapper.class_], target.id)
+
+
+for _model in _MODEL_KINDS:
+    event.listen(_model, "after_update", _evict)
+    event.listen(_model, "after_delete", _evict)
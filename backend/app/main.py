@@ -1,35 +1,55 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 
+from .cache import query_cache
 from .config import get_settings
-from .database import Base, engine, SessionLocal
-from .api import routes_home, routes_projects, routes_tasks
-from . import crud, schemas
-
-
-Base.metadata.create_all(bind=engine)
-
-# Seed a default workspace and project so the UI has something to work with
-with SessionLocal() as db:
-    default_ws = crud.get_or_create_default_workspace(db, get_settings().asana_seed_workspace_name)
-    existing_projects = crud.list_projects(db, workspace_id=default_ws.id)
-    if not existing_projects:
-        crud.create_project(
-            db,
-            schemas.ProjectCreate(
-                name="My First Project",
-                workspace_id=default_ws.id,
-                color="#3a258e",
-                icon="list",
-            ),
-        )
+from .bootstrap import check_schema, init_db
+from .database import dispose_async_engines
+from .events import hub
+from .metrics import install_sql_hooks, render_metrics
+from .pagination import NEXT_CURSOR_HEADER
+from .api import (
+    routes_home,
+    routes_projects,
+    routes_search,
+    routes_sync,
+    routes_tasks,
+    routes_workspaces,
+)
+from .api.conditional import ETAG_HEADER
+from .api.instrumentation import (
+    QUERY_COUNT_HEADER,
+    SERVER_TIMING_HEADER,
+    InstrumentationMiddleware,
+)
+
 
 settings = get_settings()
 
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Off by default: deployments run `python -m app.cli init-db` once, and workers
+    # refuse to start on a schema that is not at the latest migration
+    if settings.init_db_on_startup:
+        await run_in_threadpool(init_db)
+    else:
+        await run_in_threadpool(check_schema)
+    await hub.start()
+    yield
+    await hub.stop()
+    await dispose_async_engines()
+
+
 app = FastAPI(
     title="Clooney Asana Clone API",
     version="0.1.0",
     description="Backend API approximating Asana Home/Projects/Tasks for the Clooney assignment.",
+    lifespan=lifespan,
 )
 
 # CORS for local frontend
@@ -39,14 +59,43 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER, ETAG_HEADER, QUERY_COUNT_HEADER, SERVER_TIMING_HEADER],
 )
 
+_instrumented = (
+    settings.metrics_enabled or settings.server_timing_header or settings.query_count_header
+)
+if _instrumented or settings.slow_query_ms > 0:
+    install_sql_hooks(settings.slow_query_ms)
+if _instrumented:
+    app.add_middleware(
+        InstrumentationMiddleware,
+        record_metrics=settings.metrics_enabled,
+        server_timing=settings.server_timing_header,
+        query_count=settings.query_count_header,
+    )
+
 
 app.include_router(routes_home.router, prefix=settings.api_prefix)
 app.include_router(routes_projects.router, prefix=settings.api_prefix)
 app.include_router(routes_tasks.router, prefix=settings.api_prefix)
+app.include_router(routes_search.router, prefix=settings.api_prefix)
+app.include_router(routes_workspaces.router, prefix=settings.api_prefix)
+app.include_router(routes_sync.router, prefix=settings.api_prefix)
 
 
 @app.get("/health")
 async def health():
     return {"status": "ok"}
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    if not settings.metrics_enabled:
+        return PlainTextResponse("Metrics are disabled\n", status_code=404)
+    return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+
+@app.get("/cache/stats")
+async def cache_stats():
+    return query_cache.stats()
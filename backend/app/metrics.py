@@ -0,0 +1,238 @@
+"""Request and SQL instrumentation, exported at `/metrics` in Prometheus text format.
+
+SQLAlchemy cursor hooks, installed on every engine, add each statement's count and
+duration to the `QueryStats` of the current request. The stats live in a context
+variable, so statements run on the thread pool (sync mode, which copies the context)
+and in the async driver's greenlets are attributed to the request that issued them.
+`app.api.instrumentation` opens the stats per request and records them, with the
+request latency, per route template.
+
+Statements slower than `SLOW_QUERY_MS` are logged to `app.slow_queries` together
+with their query plan.
+"""
+
+import logging
+import threading
+import time
+from bisect import bisect_left
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from .cache import query_cache
+from .events import hub
+from .lookups import lookup_cache
+from .writer import task_writer
+
+slow_query_log = logging.getLogger("app.slow_queries")
+
+# Seconds; Prometheus' defaults, which fit API latencies
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Set on each statement's execution context, which is dropped with the statement even
+# when it fails (after_cursor_execute only runs for statements that succeed)
+_START_TIME = "_metrics_start_time"
+
+
+@dataclass
+class QueryStats:
+    statements: int = 0
+    seconds: float = 0.0
+
+
+_query_stats: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+@contextmanager
+def track_queries() -> Iterator[QueryStats]:
+    """Collect the statements executed in this context while the block runs.
+
+    Nested blocks share the outermost block's stats.
+    """
+
+    stats = _query_stats.get()
+    if stats is not None:
+        yield stats
+        return
+    stats = QueryStats()
+    token = _query_stats.set(stats)
+    try:
+        yield stats
+    finally:
+        _query_stats.reset(token)
+
+
+def _explain(conn, cursor, statement: str, parameters) -> list[str]:
+    prefix = "EXPLAIN QUERY PLAN" if conn.dialect.name == "sqlite" else "EXPLAIN"
+    try:
+        # A raw cursor: the explain itself must not go through these hooks again
+        explain = conn.connection.dbapi_connection.cursor()
+        try:
+            explain.execute(f"{prefix} {statement}", parameters)
+            rows = explain.fetchall()
+        finally:
+            explain.close()
+    except Exception as exc:  # the plan is best effort; the query itself succeeded
+        return [f"(no plan: {exc})"]
+    return [str(row[-1]) for row in rows]
+
+
+class _SqlHooks:
+    def __init__(self, slow_query_seconds: float | None):
+        self.slow_query_seconds = slow_query_seconds
+
+    def before(self, conn, cursor, statement, parameters, context, executemany):
+        setattr(context, _START_TIME, time.perf_counter())
+
+    def after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - getattr(context, _START_TIME)
+        stats = _query_stats.get()
+        if stats is not None:
+            stats.statements += 1
+            stats.seconds += elapsed
+        if self.slow_query_seconds is not None and elapsed >= self.slow_query_seconds:
+            # executemany batches have no single plan
+            plan = [] if executemany else _explain(conn, cursor, statement, parameters)
+            slow_query_log.warning(
+                "slow query (%.1f ms): %s\n%s",
+                elapsed * 1000,
+                statement,
+                "\n".join(f"  {line}" for line in plan),
+            )
+
+
+_hooks: _SqlHooks | None = None
+
+
+def install_sql_hooks(slow_query_ms: float = 0) -> None:
+    """Time every statement of every engine; `slow_query_ms` > 0 logs slow ones.
+
+    Calling it again only updates the threshold.
+    """
+
+    global _hooks
+    slow_query_seconds = slow_query_ms / 1000 if slow_query_ms > 0 else None
+    if _hooks is not None:
+        _hooks.slow_query_seconds = slow_query_seconds
+        return
+    _hooks = _SqlHooks(slow_query_seconds)
+    event.listen(Engine, "before_cursor_execute", _hooks.before)
+    event.listen(Engine, "after_cursor_execute", _hooks.after)
+
+
+class Histogram:
+    def __init__(self, buckets: tuple[float, ...]):
+        self.buckets = buckets
+        # Per bucket, not cumulative; the last slot is +Inf
+        self.counts = [0] * (len(buckets) + 1)
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+
+
+@dataclass
+class _RouteMetrics:
+    latency: Histogram
+    responses: dict[int, int] = field(default_factory=dict)
+    statements: int = 0
+    db_seconds: float = 0.0
+
+
+def _labels(**labels: object) -> str:
+    def _escape(value: object) -> str:
+        return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+class RequestMetrics:
+    """Per-route request counters and latency histograms, keyed by route template."""
+
+    def __init__(self, buckets: tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self._routes: dict[tuple[str, str], _RouteMetrics] = {}
+        self._lock = threading.Lock()
+
+    def observe(
+        self, method: str, route: str, status: int, seconds: float, queries: QueryStats
+    ) -> None:
+        with self._lock:
+            metrics = self._routes.get((method, route))
+            if metrics is None:
+                metrics = self._routes[(method, route)] = _RouteMetrics(Histogram(self.buckets))
+            metrics.latency.observe(seconds)
+            metrics.responses[status] = metrics.responses.get(status, 0) + 1
+            metrics.statements += queries.statements
+            metrics.db_seconds += queries.seconds
+
+    def clear(self) -> None:
+        with self._lock:
+            self._routes.clear()
+
+    def render(self) -> list[str]:
+        with self._lock:
+            routes = sorted(self._routes.items())
+            lines = [
+                "# HELP http_requests_total Requests handled, by route template and status.",
+                "# TYPE http_requests_total counter",
+            ]
+            for (method, route), metrics in routes:
+                for status, count in sorted(metrics.responses.items()):
+                    lines.append(
+                        f"http_requests_total{_labels(method=method, route=route, status=status)}"
+                        f" {count}"
+                    )
+
+            lines += [
+                "# HELP http_request_duration_seconds Request latency.",
+                "# TYPE http_request_duration_seconds histogram",
+            ]
+            for (method, route), metrics in routes:
+                cumulative = 0
+                bounds = [*(repr(b) for b in self.buckets), "+Inf"]
+                for bound, count in zip(bounds, metrics.latency.counts):
+                    cumulative += count
+                    labels = _labels(method=method, route=route, le=bound)
+                    lines.append(f"http_request_duration_seconds_bucket{labels} {cumulative}")
+                labels = _labels(method=method, route=route)
+                lines.append(f"http_request_duration_seconds_sum{labels} {metrics.latency.sum}")
+                lines.append(f"http_request_duration_seconds_count{labels} {cumulative}")
+
+            for name, help_text, attr in (
+                ("http_request_sql_statements_total", "SQL statements executed.", "statements"),
+                ("http_request_db_seconds_total", "Time spent in SQL statements.", "db_seconds"),
+            ):
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} counter"]
+                for (method, route), metrics in routes:
+                    labels = _labels(method=method, route=route)
+                    lines.append(f"{name}{labels} {getattr(metrics, attr)}")
+        return lines
+
+
+request_metrics = RequestMetrics()
+
+
+def render_metrics() -> str:
+    lines = request_metrics.render()
+    for prefix, stats, names in (
+        ("query_cache", query_cache.stats(), ("hits", "misses", "evictions")),
+        ("lookup_cache", lookup_cache.stats(), ("hits", "misses")),
+        ("write_coalescing", task_writer.stats(), ("groups", "writes")),
+    ):
+        for name in names:
+            lines += [
+                f"# TYPE {prefix}_{name}_total counter",
+                f"{prefix}_{name}_total {stats[name]}",
+            ]
+    lines += [
+        "# HELP event_subscribers Open SSE and WebSocket subscriptions in this process.",
+        "# TYPE event_subscribers gauge",
+        f"event_subscribers {hub.subscriber_count()}",
+    ]
+    return "\n".join(lines) + "\n"
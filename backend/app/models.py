@@ -6,9 +6,11 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     String,
     Text,
+    text,
 )
 from sqlalchemy.orm import relationship, Mapped, mapped_column
 
@@ -26,6 +28,27 @@ class Workspace(Base):
 
 class Project(Base):
     __tablename__ = "projects"
+    __table_args__ = (
+        # Partial: the default listings skip archived projects, and their own index
+        # serves `include_archived`
+        Index(
+            "ix_projects_live_workspace_updated",
+            "workspace_id",
+            "updated_at",
+            sqlite_where=text("is_archived = 0"),
+        ),
+        Index("ix_projects_live_updated", "updated_at", sqlite_where=text("is_archived = 0")),
+        Index(
+            "ix_projects_archived_workspace_updated",
+            "workspace_id",
+            "updated_at",
+            sqlite_where=text("is_archived = 1"),
+        ),
+        Index("ix_projects_archived_updated", "updated_at", sqlite_where=text("is_archived = 1")),
+        # Workspace membership of every project, archived or not (sync, export)
+        Index("ix_projects_workspace", "workspace_id"),
+        Index("ix_projects_change_seq", "change_seq"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     workspace_id: Mapped[int] = mapped_column(ForeignKey("workspaces.id"), nullable=False)
@@ -37,6 +60,8 @@ class Project(Base):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.utcnow, onupdate=datetime.utcnow
     )
+    # Set by the crud write paths from `watermarks.next_sequence` (see /api/sync)
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
 
     workspace: Mapped[Workspace] = relationship("Workspace", back_populates="projects")
     sections: Mapped[list["Section"]] = relationship("Section", back_populates="project")
@@ -45,11 +70,15 @@ class Project(Base):
 
 class Section(Base):
     __tablename__ = "sections"
+    # Sections in board order (see app/ranking.py)
+    __table_args__ = (Index("ix_sections_project_rank", "project_id", "rank"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
     name: Mapped[str] = mapped_column(String(255), nullable=False)
     order_index: Mapped[int] = mapped_column(Integer, default=0)
+    # Position among the project's sections; "" until ranked (rows written around crud)
+    rank: Mapped[str] = mapped_column(String(255), nullable=False, default="", server_default="")
 
     project: Mapped[Project] = relationship("Project", back_populates="sections")
     tasks: Mapped[list["Task"]] = relationship("Task", back_populates="section")
@@ -57,6 +86,21 @@ class Section(Base):
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        Index("ix_tasks_project_created", "project_id", "created_at"),
+        Index("ix_tasks_project_status_created", "project_id", "status", "created_at"),
+        Index("ix_tasks_assignee_created", "assignee", "created_at"),
+        Index("ix_tasks_change_seq", "change_seq"),
+        Index("ix_tasks_project_due", "project_id", "due_date"),
+        # Board columns: each section's tasks in order, without a sort
+        Index("ix_tasks_project_section_rank", "project_id", "section_id", "rank"),
+        # Completed tasks due for archival (see crud.archive_tasks)
+        Index(
+            "ix_tasks_completed_at", "completed_at", sqlite_where=text("completed_at IS NOT NULL")
+        ),
+        # Ids are never handed out again, so an archived task's id stays its own
+        {"sqlite_autoincrement": True},
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
@@ -69,6 +113,16 @@ class Task(Base):
     priority: Mapped[str | None] = mapped_column(String(32), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
     completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False, default=0, server_default="0")
+    # Position within the section; "" until ranked (rows written around crud)
+    rank: Mapped[str] = mapped_column(String(255), nullable=False, default="", server_default="")
+    # Summary of the task's comments, kept by crud so task lists never join them
+    comment_count: Mapped[int] = mapped_column(
+        Integer, nullable=False, default=0, server_default="0"
+    )
+    last_comment_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_comment_author: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_comment_preview: Mapped[str | None] = mapped_column(String(255), nullable=True)
 
     project: Mapped[Project] = relationship("Project", back_populates="tasks")
     section: Mapped[Section | None] = relationship("Section", back_populates="tasks")
@@ -76,9 +130,89 @@ class Task(Base):
 
 class TaskComment(Base):
     __tablename__ = "task_comments"
+    __table_args__ = (
+        # A task's thread in order; new comments append at the end of its range
+        Index("ix_task_comments_task_created", "task_id", "created_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, index=True)
     task_id: Mapped[int] = mapped_column(ForeignKey("tasks.id"), nullable=False)
     author: Mapped[str] = mapped_column(String(255), nullable=False)
     body: Mapped[str] = mapped_column(Text, nullable=False)
     created_at: Mapped[datetime] = mapped_column(DateTime, default=datetime.utcnow)
+
+
+class ArchivedTask(Base):
+    """A task moved out of `tasks` by `crud.archive_tasks`; same columns and id."""
+
+    __tablename__ = "archived_tasks"
+    __table_args__ = (Index("ix_archived_tasks_project_created", "project_id", "created_at"),)
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    project_id: Mapped[int] = mapped_column(ForeignKey("projects.id"), nullable=False)
+    section_id: Mapped[int | None] = mapped_column(ForeignKey("sections.id"), nullable=True)
+    name: Mapped[str] = mapped_column(String(255), nullable=False)
+    description: Mapped[str | None] = mapped_column(Text, nullable=True)
+    status: Mapped[str] = mapped_column(String(32), nullable=False)
+    assignee: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    due_date: Mapped[date | None] = mapped_column(Date, nullable=True)
+    priority: Mapped[str | None] = mapped_column(String(32), nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False)
+    rank: Mapped[str] = mapped_column(String(255), nullable=False)
+    comment_count: Mapped[int] = mapped_column(Integer, nullable=False)
+    last_comment_at: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+    last_comment_author: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    last_comment_preview: Mapped[str | None] = mapped_column(String(255), nullable=True)
+    archived_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class ArchivedTaskComment(Base):
+    """A comment of an archived task; ids are new, thread order is kept."""
+
+    __tablename__ = "archived_task_comments"
+    __table_args__ = (
+        Index("ix_archived_task_comments_task_created", "task_id", "created_at", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    task_id: Mapped[int] = mapped_column(ForeignKey("archived_tasks.id"), nullable=False)
+    author: Mapped[str] = mapped_column(String(255), nullable=False)
+    body: Mapped[str] = mapped_column(Text, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+
+
+class ChangeCounter(Base):
+    """Monotonic per-scope version, bumped by the crud write paths (see app/watermarks.py)."""
+
+    __tablename__ = "change_counters"
+
+    scope: Mapped[str] = mapped_column(String(255), primary_key=True)
+    version: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+
+
+class Tombstone(Base):
+    """A deleted task or project, kept so `/api/sync` can report the deletion."""
+
+    __tablename__ = "tombstones"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    entity: Mapped[str] = mapped_column(String(32), nullable=False)
+    entity_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    workspace_id: Mapped[int] = mapped_column(Integer, nullable=False)
+    change_seq: Mapped[int] = mapped_column(Integer, nullable=False, index=True)
+    deleted_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=datetime.utcnow)
+
+
+class TaskCount(Base):
+    """Number of tasks per project, section and status (see app/task_counts.py)."""
+
+    __tablename__ = "task_counts"
+
+    project_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # 0 for tasks without a section, "" for tasks without a status: key columns
+    # cannot be NULL
+    section_id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    status: Mapped[str] = mapped_column(String(32), primary_key=True)
+    count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
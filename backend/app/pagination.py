@@ -0,0 +1,97 @@
+import base64
+import json
+from collections.abc import Callable, Sequence
+from datetime import datetime
+from typing import TypeVar
+
+T = TypeVar("T")
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+class InvalidCursor(ValueError):
+    pass
+
+
+def encode_cursor(sort_value: datetime, row_id: int) -> str:
+    """Encode a `(timestamp, id)` keyset position as an opaque, URL-safe token."""
+
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return datetime.fromisoformat(sort_value), int(row_id)
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def encode_column_cursor(section_id: int | None, rank: str, row_id: int) -> str:
+    """`(rank, id)` position within one board column; `section_id` None is the unsectioned one."""
+
+    raw = json.dumps([section_id, rank, row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_column_cursor(cursor: str) -> tuple[int | None, tuple[str, int]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        section_id, rank, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(rank, str):
+            raise TypeError(rank)
+        section_id = None if section_id is None else int(section_id)
+        return section_id, (rank, int(row_id))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursor(cursor) from exc
+
+
+def _encode_counter(name: str, value: int) -> str:
+    return base64.urlsafe_b64encode(json.dumps({name: value}).encode()).decode().rstrip("=")
+
+
+def _decode_counter(name: str, cursor: str) -> int:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        value = int(json.loads(base64.urlsafe_b64decode(padded.encode()))[name])
+    except (ValueError, TypeError, KeyError) as exc:
+        raise InvalidCursor(cursor) from exc
+    if value < 0:
+        raise InvalidCursor(cursor)
+    return value
+
+
+def encode_offset_cursor(offset: int) -> str:
+    """Cursor for result sets without a stable keyset, such as ranked search results."""
+
+    return _encode_counter("offset", offset)
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    return _decode_counter("offset", cursor)
+
+
+def encode_sequence_cursor(sequence: int) -> str:
+    """Position in the global change sequence, for `/api/sync`."""
+
+    return _encode_counter("seq", sequence)
+
+
+def decode_sequence_cursor(cursor: str) -> int:
+    return _decode_counter("seq", cursor)
+
+
+def paginate(
+    rows: Sequence[T], limit: int, key: Callable[[T], tuple[datetime, int]]
+) -> tuple[list[T], str | None]:
+    """Split a `limit + 1` result into the page and the cursor of the next one."""
+
+    page = list(rows[:limit])
+    if len(rows) <= limit or not page:
+        return page, None
+    return page, encode_cursor(*key(page[-1]))
@@ -0,0 +1,41 @@
+import re
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from sqlalchemy.engine import Connection, Engine
+
+# "SCAN tasks" walks the whole table; "SCAN tasks USING INDEX ..." walks an index in
+# order and stops at the LIMIT, which is what keyset listings without a filter do.
+# "SCAN tasks_fts VIRTUAL TABLE INDEX ..." is an FTS5 index lookup, not a scan.
+_FULL_SCAN = re.compile(r"^SCAN \w+\b(?! USING| VIRTUAL TABLE)")
+_TEMP_SORT = "USE TEMP B-TREE FOR ORDER BY"
+
+
+def explain_query_plan(connection: Connection, statement: str, parameters=()) -> list[str]:
+    rows = connection.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)
+    return [row[3] for row in rows]
+
+
+def plan_problems(plan: list[str]) -> list[str]:
+    """Plan lines that indicate a full table scan or an unindexed sort."""
+
+    return [line for line in plan if _FULL_SCAN.match(line) or _TEMP_SORT in line]
+
+
+@contextmanager
+def capture_statements(engine: Engine) -> Iterator[list[tuple[str, tuple]]]:
+    """Record every SELECT issued on `engine` while the block runs."""
+
+    captured: list[tuple[str, tuple]] = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            captured.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+        yield captured
+    finally:
+        event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
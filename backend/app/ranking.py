@@ -0,0 +1,175 @@
+"""Fractional order keys ("ranks") for sections and tasks.
+
+Siblings are ordered by `(rank, id)`, comparing ranks as plain strings. Between any
+two ranks there is always another one, so moving a row rewrites only that row's rank
+instead of renumbering its siblings.
+
+A rank is an integer part followed by a fraction, in base 62 (`0-9A-Za-z`, which
+sorts the same as ASCII). The integer part's first character encodes its length:
+`a`-`z` start integers of 2 to 27 characters, `A`-`Z` negative ones. Appending after
+the last row or prepending before the first increments or decrements the integer
+part, which grows logarithmically; only inserting between two neighbours extends the
+fraction, by about one character per six inserts into the same gap. Once ranks grow
+past `RANK_REBALANCE_LENGTH`, `crud` respaces the siblings with `spread`.
+
+This is the scheme of David Greenspan's "Implementing Fractional Indexing".
+"""
+
+from collections.abc import Iterator
+
+DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+_ZERO = DIGITS[0]
+# The smallest integer part has no predecessor
+_SMALLEST_INTEGER = "A" + _ZERO * 26
+
+
+class InvalidRank(ValueError):
+    pass
+
+
+def _integer_length(head: str) -> int:
+    if "a" <= head <= "z":
+        return ord(head) - ord("a") + 2
+    if "A" <= head <= "Z":
+        return ord("Z") - ord(head) + 2
+    raise InvalidRank(f"invalid rank head: {head!r}")
+
+
+def _split(key: str) -> tuple[str, str]:
+    if not key:
+        raise InvalidRank("empty rank")
+    length = _integer_length(key[0])
+    integer, fraction = key[:length], key[length:]
+    if len(integer) != length or key == _SMALLEST_INTEGER or fraction.endswith(_ZERO):
+        raise InvalidRank(f"invalid rank: {key!r}")
+    return integer, fraction
+
+
+def is_valid(key: str) -> bool:
+    try:
+        _split(key)
+    except InvalidRank:
+        return False
+    return True
+
+
+def _midpoint(a: str, b: str | None) -> str:
+    # A fraction strictly between `a` and `b` (None: no upper bound); neither ends in 0
+    if b is not None:
+        common = 0
+        while (a[common] if common < len(a) else _ZERO) == b[common]:
+            common += 1
+        if common:
+            return b[:common] + _midpoint(a[common:], b[common:])
+    digit_a = DIGITS.index(a[0]) if a else 0
+    digit_b = DIGITS.index(b[0]) if b is not None else len(DIGITS)
+    if digit_b - digit_a > 1:
+        return DIGITS[(digit_a + digit_b + 1) // 2]
+    if b is not None and len(b) > 1:
+        return b[:1]
+    return DIGITS[digit_a] + _midpoint(a[1:], None)
+
+
+def _increment(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        position = DIGITS.index(digits[i]) + 1
+        if position < len(DIGITS):
+            digits[i] = DIGITS[position]
+            return head + "".join(digits)
+        digits[i] = _ZERO
+    if head == "Z":
+        return "a" + _ZERO
+    if head == "z":
+        return None
+    head = chr(ord(head) + 1)
+    if head > "a":
+        digits.append(_ZERO)
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def _decrement(integer: str) -> str | None:
+    head, digits = integer[0], list(integer[1:])
+    for i in reversed(range(len(digits))):
+        position = DIGITS.index(digits[i]) - 1
+        if position >= 0:
+            digits[i] = DIGITS[position]
+            return head + "".join(digits)
+        digits[i] = DIGITS[-1]
+    if head == "a":
+        return "Z" + DIGITS[-1]
+    if head == "A":
+        return None
+    head = chr(ord(head) - 1)
+    if head < "Z":
+        digits.append(DIGITS[-1])
+    else:
+        digits.pop()
+    return head + "".join(digits)
+
+
+def key_between(before: str | None, after: str | None) -> str:
+    """A rank that sorts after `before` and before `after`; None leaves that side open."""
+
+    if before is not None and after is not None and before >= after:
+        raise InvalidRank(f"{before!r} is not before {after!r}")
+    if before is None and after is None:
+        return "a" + _ZERO
+    if before is None:
+        integer, fraction = _split(after)
+        if integer == _SMALLEST_INTEGER:
+            return integer + _midpoint("", fraction)
+        if integer < after:
+            return integer
+        previous = _decrement(integer)
+        if previous is None:
+            raise InvalidRank("no rank before the smallest one")
+        return previous
+    integer, fraction = _split(before)
+    if after is None:
+        following = _increment(integer)
+        return integer + _midpoint(fraction, None) if following is None else following
+    after_integer, after_fraction = _split(after)
+    if integer == after_integer:
+        return integer + _midpoint(fraction, after_fraction)
+    following = _increment(integer)
+    if following is None:
+        raise InvalidRank("no rank after the largest one")
+    return following if following < after else integer + _midpoint(fraction, None)
+
+
+def keys_between(before: str | None, after: str | None, count: int) -> list[str]:
+    """`count` ascending ranks between `before` and `after`, spaced to keep them short."""
+
+    if count == 0:
+        return []
+    if count == 1:
+        return [key_between(before, after)]
+    if after is None:
+        keys = [key_between(before, None)]
+        for _ in range(count - 1):
+            keys.append(key_between(keys[-1], None))
+        return keys
+    if before is None:
+        keys = [key_between(None, after)]
+        for _ in range(count - 1):
+            keys.append(key_between(None, keys[-1]))
+        return keys[::-1]
+    middle = key_between(before, after)
+    half = count // 2
+    return [
+        *keys_between(before, middle, half),
+        middle,
+        *keys_between(middle, after, count - half - 1),
+    ]
+
+
+def spread(count: int) -> Iterator[str]:
+    """`count` short ascending ranks, for numbering a whole list of siblings afresh."""
+
+    key = key_between(None, None)
+    for _ in range(count):
+        yield key
+        key = key_between(key, None)
@@ -1,6 +1,6 @@
 from datetime import date, datetime
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, model_validator
 
 
 class WorkspaceBase(BaseModel):
@@ -27,6 +27,8 @@ class ProjectCreate(ProjectBase):
 class ProjectRead(ProjectBase):
     id: int
     workspace_id: int
+    # Archived projects are only listed with `include_archived`
+    is_archived: bool = False
 
     class Config:
         from_attributes = True
@@ -40,6 +42,8 @@ class SectionBase(BaseModel):
 class SectionRead(SectionBase):
     id: int
     project_id: int
+    # Sections are listed by rank; order_index is kept for older clients
+    rank: str = ""
 
     class Config:
         from_attributes = True
@@ -69,17 +73,90 @@ class TaskUpdate(BaseModel):
     section_id: int | None = None
 
 
+class _MoveAnchor(BaseModel):
+    # The sibling to place the row right after, or right before; neither: last
+    after_id: int | None = None
+    before_id: int | None = None
+
+    @model_validator(mode="after")
+    def _one_anchor(self):
+        if self.after_id is not None and self.before_id is not None:
+            raise ValueError("Pass after_id or before_id, not both")
+        return self
+
+
+class SectionMove(_MoveAnchor):
+    pass
+
+
+class TaskMove(_MoveAnchor):
+    # Without an anchor task, the section to move to (null: no section); an anchor
+    # implies its section
+    section_id: int | None = None
+
+
 class TaskRead(TaskBase):
     id: int
     project_id: int
     section_id: int | None = None
     created_at: datetime
     completed_at: datetime | None = None
+    # Position within the section (see GET /projects/{id}/board)
+    rank: str = ""
+    # Denormalized from the task's comments, for list views
+    comment_count: int = 0
+    last_comment_at: datetime | None = None
+    last_comment_author: str | None = None
+    last_comment_preview: str | None = None
 
     class Config:
         from_attributes = True
 
 
+class CommentCreate(BaseModel):
+    author: str
+    body: str
+
+
+class CommentRead(CommentCreate):
+    id: int
+    task_id: int
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+MAX_BATCH_SIZE = 1000
+
+
+class TaskBatchUpdateItem(TaskUpdate):
+    id: int
+
+
+class TaskBatchCreate(BaseModel):
+    items: list[TaskCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchUpdate(BaseModel):
+    items: list[TaskBatchUpdateItem] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class CommentBatchCreate(BaseModel):
+    items: list[CommentCreate] = Field(min_length=1, max_length=MAX_BATCH_SIZE)
+
+
+class TaskBatchItemResult(BaseModel):
+    index: int
+    status: int
+    task: TaskRead | None = None
+    error: str | None = None
+
+
+class TaskBatchResponse(BaseModel):
+    results: list[TaskBatchItemResult]
+
+
 class HomeProjectSummary(BaseModel):
     id: int
     name: str
@@ -98,3 +175,44 @@ class HomeTaskSummary(BaseModel):
 class HomeResponse(BaseModel):
     my_tasks: list[HomeTaskSummary]
     recent_projects: list[HomeProjectSummary]
+
+
+class SectionStats(BaseModel):
+    # None for tasks outside any section
+    section_id: int | None
+    total: int
+    by_status: dict[str, int]
+
+
+class ProjectStats(BaseModel):
+    project_id: int
+    total: int
+    # Due before today and not completed
+    overdue: int
+    by_status: dict[str, int]
+    sections: list[SectionStats]
+
+
+class BoardColumn(BaseModel):
+    # None for the column of tasks outside any section
+    section: SectionRead | None
+    tasks: list[TaskRead]
+    # Pass back as `?cursor=` to load more of this column
+    next_cursor: str | None = None
+
+
+class BoardResponse(BaseModel):
+    project_id: int
+    columns: list[BoardColumn]
+
+
+class SyncResponse(BaseModel):
+    # Pass back as `since` on the next call
+    cursor: str
+    # Too much changed since `since` (or it predates pruned tombstones): reload the
+    # data with the list endpoints and continue from `cursor`
+    reset: bool = False
+    projects: list[ProjectRead] = []
+    tasks: list[TaskRead] = []
+    deleted_projects: list[int] = []
+    deleted_tasks: list[int] = []
@@ -0,0 +1,154 @@
+"""Full-text task search on an SQLite FTS5 index.
+
+`tasks_fts` is an external-content FTS5 table over `tasks.name` and
+`tasks.description`: it stores only the inverted index and reads the text back from
+`tasks` by rowid. Triggers on `tasks` keep it in sync, so every write path (single,
+batch and bulk ORM statements alike) is covered without hooks in `crud`.
+
+Other databases have no FTS5; `search_tasks` raises `SearchUnavailable` there.
+"""
+
+import re
+from collections.abc import Sequence
+
+from sqlalchemy import DDL, column, event, select, table
+from sqlalchemy.engine import Connection, Row
+from sqlalchemy.orm import Session
+
+from . import crud, models
+
+FTS_TABLE = "tasks_fts"
+
+# Name matches weigh ten times as much as description matches. Stored in the
+# index's config, so `ORDER BY rank` uses it and FTS5 can optimise the LIMIT.
+RANK_FUNCTION = "bm25(10.0, 1.0)"
+
+CREATE_STATEMENTS = (
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, description,
+        content='tasks', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2',
+        prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    # Only text changes touch the index; status or assignee updates skip it
+    f"""
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF name, description ON tasks
+    BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO {FTS_TABLE}(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+# Only run right after creating the table: rewriting the config, even with the same
+# value, breaks queries on other connections that already use the index.
+CONFIGURE_RANK = f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rank) VALUES ('rank', '{RANK_FUNCTION}')"
+
+DROP_STATEMENTS = (
+    "DROP TRIGGER IF EXISTS tasks_fts_au",
+    "DROP TRIGGER IF EXISTS tasks_fts_ad",
+    "DROP TRIGGER IF EXISTS tasks_fts_ai",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+)
+
+# Created and dropped together with `tasks` by `Base.metadata.create_all/drop_all`
+_LIFECYCLE = (
+    ("after_create", (*CREATE_STATEMENTS, CONFIGURE_RANK)),
+    ("before_drop", DROP_STATEMENTS),
+)
+for _event, _statements in _LIFECYCLE:
+    for _statement in _statements:
+        event.listen(
+            models.Task.__table__, _event, DDL(_statement).execute_if(dialect="sqlite")
+        )
+
+# Core handle for queries; `tasks_fts` is its hidden full-row column used by MATCH
+tasks_fts = table(FTS_TABLE, column("rowid"), column("rank"), column(FTS_TABLE))
+
+_TOKEN = re.compile(r"\w+")
+
+
+class SearchUnavailable(RuntimeError):
+    pass
+
+
+def is_search_table(name: str) -> bool:
+    """The FTS5 table and its shadow tables, which the ORM metadata does not model."""
+
+    return name == FTS_TABLE or name.startswith(f"{FTS_TABLE}_")
+
+
+def match_expression(query: str) -> str | None:
+    """Turn free text into an FTS5 query matching every word as a prefix.
+
+    Words are quoted, so FTS5 operators and punctuation in user input are inert.
+    Returns None if the text has no searchable words.
+    """
+
+    tokens = _TOKEN.findall(query)
+    if not tokens:
+        return None
+    return " ".join(f'"{token}"*' for token in tokens)
+
+
+def rebuild_index(connection: Connection) -> None:
+    """Create the index if missing and rebuild its content from `tasks`."""
+
+    if connection.dialect.name != "sqlite":
+        raise SearchUnavailable(connection.dialect.name)
+    exists = connection.exec_driver_sql(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).first()
+    for statement in CREATE_STATEMENTS:
+        connection.exec_driver_sql(statement)
+    if not exists:
+        connection.exec_driver_sql(CONFIGURE_RANK)
+    connection.exec_driver_sql(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+
+
+def search_tasks(
+    db: Session,
+    query: str,
+    *,
+    project_id: int | None = None,
+    assignee: str | None = None,
+    limit: int,
+    offset: int = 0,
+) -> Sequence[Row]:
+    """Rows with the `TaskRead` columns of the tasks matching `query`, best match first."""
+
+    if db.get_bind().dialect.name != "sqlite":
+        raise SearchUnavailable(db.get_bind().dialect.name)
+    expression = match_expression(query)
+    if expression is None:
+        return []
+
+    stmt = (
+        select(*crud.TASK_READ_COLUMNS)
+        .join(tasks_fts, tasks_fts.c.rowid == models.Task.id)
+        .where(tasks_fts.c[FTS_TABLE].match(expression))
+    )
+    if project_id is not None:
+        stmt = stmt.where(models.Task.project_id == project_id)
+    if assignee is not None:
+        stmt = stmt.where(models.Task.assignee == assignee)
+    # Ordering by `rank` alone lets FTS5 sort internally instead of a temp b-tree;
+    # ties come back in a stable order for a given index state.
+    stmt = stmt.order_by(tasks_fts.c.rank).limit(limit).offset(offset)
+    return db.execute(stmt).all()
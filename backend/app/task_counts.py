@@ -0,0 +1,139 @@
+"""Denormalized task counts per `(project, section, status)`.
+
+The crud write paths adjust the counts in the same transaction as the task rows
+they change, so `/api/projects/{id}/stats` reads a few counter rows instead of
+counting the project's tasks. `reconcile` recounts everything from `tasks` and
+reports (and by default repairs) any drift, for rows written around `crud`.
+
+Overdue counts depend on the current date, so they are not stored; `overdue_count`
+reads them from the `(project_id, due_date)` index instead.
+"""
+
+from collections import Counter
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import dataclass
+from datetime import date
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import Row
+from sqlalchemy.orm import Session
+
+from . import models
+
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+NO_SECTION = 0
+NO_STATUS = ""
+COMPLETED = "completed"
+
+# (project_id, section_id, status) as stored on the task
+Key = tuple[int, int | None, str | None]
+
+
+def key_of(task) -> Key:
+    return task.project_id, task.section_id, task.status
+
+
+def count_changes(removed: Iterable[Key] = (), added: Iterable[Key] = ()) -> Counter[Key]:
+    deltas: Counter[Key] = Counter()
+    for key in removed:
+        deltas[key] -= 1
+    for key in added:
+        deltas[key] += 1
+    return deltas
+
+
+def adjust(db: Session, deltas: Mapping[Key, int]) -> None:
+    """Apply `deltas` in the current transaction; the caller commits."""
+
+    insert_ = _UPSERT_DIALECTS[db.get_bind().dialect.name]
+    table = models.TaskCount.__table__
+    # Sorted, so concurrent writers take the row locks in the same order
+    for (project_id, section_id, status), delta in sorted(
+        deltas.items(), key=lambda item: (item[0][0], item[0][1] or 0, item[0][2] or "")
+    ):
+        if not delta:
+            continue
+        stmt = insert_(table).values(
+            project_id=project_id,
+            section_id=section_id or NO_SECTION,
+            status=status or NO_STATUS,
+            count=delta,
+        )
+        db.execute(
+            stmt.on_conflict_do_update(
+                index_elements=[table.c.project_id, table.c.section_id, table.c.status],
+                set_={"count": table.c.count + delta},
+            )
+        )
+
+
+def project_counts(db: Session, project_id: int) -> Sequence[Row]:
+    """`(section_id, status, count)` rows of the project, empty ones left out."""
+
+    stmt = select(
+        models.TaskCount.section_id, models.TaskCount.status, models.TaskCount.count
+    ).where(models.TaskCount.project_id == project_id, models.TaskCount.count != 0)
+    return db.execute(stmt).all()
+
+
+def overdue_count(db: Session, project_id: int, today: date) -> int:
+    stmt = (
+        select(func.count())
+        .select_from(models.Task)
+        .where(
+            models.Task.project_id == project_id,
+            models.Task.due_date < today,
+            or_(models.Task.status.is_(None), models.Task.status != COMPLETED),
+        )
+    )
+    return db.scalar(stmt)
+
+
+@dataclass(frozen=True)
+class Drift:
+    project_id: int
+    section_id: int
+    status: str
+    stored: int
+    actual: int
+
+
+def reconcile(db: Session, *, fix: bool = True) -> list[Drift]:
+    """Recount every project from `tasks` and return the counters that were off.
+
+    With `fix`, the counters are replaced by the recount; the caller commits.
+    """
+
+    key = (
+        models.Task.project_id,
+        func.coalesce(models.Task.section_id, NO_SECTION),
+        func.coalesce(models.Task.status, NO_STATUS),
+    )
+    actual_stmt = select(*key, func.count()).group_by(*key)
+    actual = {tuple(row[:3]): row[3] for row in db.execute(actual_stmt)}
+    stored_stmt = select(
+        models.TaskCount.project_id,
+        models.TaskCount.section_id,
+        models.TaskCount.status,
+        models.TaskCount.count,
+    )
+    stored = {tuple(row[:3]): row[3] for row in db.execute(stored_stmt)}
+
+    drift = [
+        Drift(*counter, stored=stored.get(counter, 0), actual=actual.get(counter, 0))
+        for counter in sorted(actual.keys() | stored.keys())
+        if stored.get(counter, 0) != actual.get(counter, 0)
+    ]
+    if fix and (drift or len(stored) != len(actual)):
+        db.execute(delete(models.TaskCount))
+        if actual:
+            db.execute(
+                insert(models.TaskCount),
+                [
+                    {"project_id": p, "section_id": s, "status": st, "count": n}
+                    for (p, s, st), n in actual.items()
+                ],
+            )
+    return drift
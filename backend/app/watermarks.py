@@ -0,0 +1,97 @@
+"""Persistent change counters ("watermarks") for cheap change detection.
+
+Each scope names a slice of data a response depends on. The crud write paths bump
+the scopes they touch inside their own transaction, so a reader can tell whether
+anything changed with a single primary-key lookup instead of re-reading the rows.
+The same scope names key the in-process query cache.
+"""
+
+from collections.abc import Iterable
+
+from sqlalchemy import select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from . import models
+
+_UPSERT_DIALECTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+def workspace_scope(workspace_id: int | None) -> str:
+    # `None` is the unfiltered, all-workspaces listing
+    return "projects" if workspace_id is None else f"workspace:{workspace_id}"
+
+
+def assignee_scope(assignee: str | None) -> str:
+    return f"assignee:{assignee}"
+
+
+def project_tasks_scope(project_id: int) -> str:
+    return f"project:{project_id}:tasks"
+
+
+def project_sections_scope(project_id: int) -> str:
+    return f"project:{project_id}:sections"
+
+
+# Global change sequence stamped on every task and project write (see `/api/sync`)
+CHANGE_SEQUENCE = "sequence"
+# Highest sequence whose tombstones have been pruned; older sync cursors must reset
+TOMBSTONES_PRUNED = "tombstones:pruned"
+
+
+def next_sequence(db: Session) -> int:
+    """Allocate the next change sequence number in the current transaction.
+
+    The counter row stays write-locked until the transaction ends, so sequence numbers
+    become visible in commit order: a reader that sees sequence N has every change
+    numbered N or lower.
+    """
+
+    insert = _UPSERT_DIALECTS[db.get_bind().dialect.name]
+    table = models.ChangeCounter.__table__
+    stmt = (
+        insert(table)
+        .values(scope=CHANGE_SEQUENCE, version=1)
+        .on_conflict_do_update(
+            index_elements=[table.c.scope], set_={"version": table.c.version + 1}
+        )
+        .returning(table.c.version)
+    )
+    return db.execute(stmt).scalar_one()
+
+
+def bump(db: Session, scopes: Iterable[str]) -> None:
+    """Increment `scopes` in the current transaction; the caller commits.
+
+    One multi-row upsert however many scopes a write touches.
+    """
+
+    scopes = sorted(set(scopes))
+    if not scopes:
+        return
+    insert = _UPSERT_DIALECTS[db.get_bind().dialect.name]
+    table = models.ChangeCounter.__table__
+    stmt = insert(table).values([{"scope": scope, "version": 1} for scope in scopes])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[table.c.scope], set_={"version": table.c.version + 1}
+    )
+    db.execute(stmt)
+
+
+def set_version(db: Session, scope: str, version: int) -> None:
+    insert = _UPSERT_DIALECTS[db.get_bind().dialect.name]
+    table = models.ChangeCounter.__table__
+    stmt = insert(table).values(scope=scope, version=version)
+    db.execute(
+        stmt.on_conflict_do_update(index_elements=[table.c.scope], set_={"version": version})
+    )
+
+
+def read(db: Session, scopes: Iterable[str]) -> dict[str, int]:
+    scopes = sorted(set(scopes))
+    stmt = select(models.ChangeCounter.scope, models.ChangeCounter.version).where(
+        models.ChangeCounter.scope.in_(scopes)
+    )
+    versions = dict(db.execute(stmt).all())
+    return {scope: versions.get(scope, 0) for scope in scopes}
@@ -0,0 +1,162 @@
+"""Group commit for single-task writes (`WRITE_COALESCING`).
+
+SQLite has one writer at a time, and every write transaction pays its own commit, so
+concurrent `POST /tasks` and `PATCH /tasks/{id}` requests queue on the write lock one
+transaction each. With coalescing on, such a request instead joins the open group of
+writes of its kind. The request that opened the group starts a writer task on its
+session, which waits `write_coalescing_window_ms` for others to join (or until
+`write_coalescing_max_batch` have) and applies the whole group in one transaction
+through the batch write paths, `crud.create_tasks` and `crud.update_tasks`. Each
+caller gets back the result for its own item, success or error.
+
+Groups of one kind are written one after another, and a group fills while the one
+before it commits. A second update of a task already in the open group goes to the
+next group, so updates of one task still apply in the order they arrived. If the
+group's transaction fails as a whole, its items are retried one transaction each, so
+one bad write only fails its own request.
+
+The window is latency every coalesced write pays when it is alone; under load, one
+commit serves many requests.
+"""
+
+import asyncio
+import threading
+from collections.abc import Callable, Hashable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from sqlalchemy.orm import Session
+
+from . import crud, schemas
+from .config import get_settings
+from .database import DBSession
+
+# Applies a group's items in one transaction: one result per item, in order
+ApplyGroup = Callable[[Session, Sequence[Any]], list[schemas.TaskBatchItemResult]]
+
+
+@dataclass(eq=False)
+class _Group:
+    apply: ApplyGroup
+    previous: "_Group | None"
+    items: list = field(default_factory=list)
+    keys: set = field(default_factory=set)
+    futures: list[asyncio.Future] = field(default_factory=list)
+    full: asyncio.Event = field(default_factory=asyncio.Event)
+    done: asyncio.Event = field(default_factory=asyncio.Event)
+
+
+class WriteCoalescer:
+    """Collects single-task writes on the event loop and commits them in groups."""
+
+    def __init__(self, window_seconds: float, max_batch: int, enabled: bool = True):
+        self.window_seconds = window_seconds
+        self.max_batch = max_batch
+        self.enabled = enabled
+        # Per kind of write: the group still taking items, and the newest group
+        self._open: dict[str, _Group] = {}
+        self._last: dict[str, _Group] = {}
+        self._lock = threading.Lock()
+        self.groups = 0
+        self.writes = 0
+
+    async def create_task(
+        self, db: DBSession, task_in: schemas.TaskCreate
+    ) -> schemas.TaskBatchItemResult:
+        return await self._submit("create", crud.create_tasks, db, task_in, None)
+
+    async def update_task(
+        self, db: DBSession, task_id: int, task_in: schemas.TaskUpdate
+    ) -> schemas.TaskBatchItemResult:
+        item = schemas.TaskBatchUpdateItem(id=task_id, **task_in.model_dump(exclude_unset=True))
+        return await self._submit("update", crud.update_tasks, db, item, task_id)
+
+    async def _submit(
+        self, kind: str, apply: ApplyGroup, db: DBSession, item: Any, key: Hashable | None
+    ) -> schemas.TaskBatchItemResult:
+        group = self._open.get(kind)
+        writer = None
+        if group is None or (key is not None and key in group.keys):
+            group = _Group(apply, previous=self._last.get(kind))
+            self._open[kind] = self._last[kind] = group
+            writer = asyncio.create_task(self._write(kind, group, db))
+        future = asyncio.get_running_loop().create_future()
+        group.items.append(item)
+        group.futures.append(future)
+        if key is not None:
+            group.keys.add(key)
+        if len(group.items) >= self.max_batch:
+            self._close(kind, group)
+            group.full.set()
+
+        if writer is not None:
+            # The writer runs on this request's session, which the request's teardown
+            # closes: even when the request is cancelled, stay until the writer is done
+            cancelled = False
+            while not writer.done():
+                try:
+                    await asyncio.shield(writer)
+                except asyncio.CancelledError:
+                    cancelled = True
+            if cancelled:
+                # Its own write's outcome goes unread
+                if not future.cancelled():
+                    future.exception()
+                raise asyncio.CancelledError
+        return await future
+
+    def _close(self, kind: str, group: _Group) -> None:
+        if self._open.get(kind) is group:
+            del self._open[kind]
+
+    async def _write(self, kind: str, group: _Group, db: DBSession) -> None:
+        try:
+            try:
+                await asyncio.wait_for(group.full.wait(), self.window_seconds)
+            except asyncio.TimeoutError:
+                pass
+            if group.previous is not None:
+                await group.previous.done.wait()
+            self._close(kind, group)
+            group.previous = None
+            with self._lock:
+                self.groups += 1
+                self.writes += len(group.items)
+
+            try:
+                results = await db.run(group.apply, group.items)
+            except Exception:
+                for item, future in zip(group.items, group.futures):
+                    try:
+                        (result,) = await db.run(group.apply, [item])
+                    except Exception as exc:
+                        future.set_exception(exc)
+                    else:
+                        future.set_result(result)
+            else:
+                for result, future in zip(results, group.futures):
+                    future.set_result(result)
+        finally:
+            self._close(kind, group)
+            for future in group.futures:
+                if not future.done():
+                    future.cancel()
+            group.done.set()
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "groups": self.groups,
+                "writes": self.writes,
+                "mean_group_size": self.writes / self.groups if self.groups else None,
+            }
+
+
+_settings = get_settings()
+
+task_writer = WriteCoalescer(
+    window_seconds=_settings.write_coalescing_window_ms / 1000,
+    max_batch=_settings.write_coalescing_max_batch,
+    enabled=_settings.write_coalescing,
+)
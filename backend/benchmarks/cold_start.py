@@ -0,0 +1,60 @@
+"""Cold start of a worker: importing `app.main` and serving the first request.
+
+    python -m benchmarks.cold_start [--runs 5]
+
+Each run is a fresh interpreter against an already initialized database (the
+`init-db` step has run once for the deployment), with `INIT_DB_ON_STARTUP` off and
+on. Reports the median import time, lifespan startup time and first-request latency.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+_PROBE = """
+import json, time
+t0 = time.perf_counter()
+import app.main
+t1 = time.perf_counter()
+from fastapi.testclient import TestClient
+with TestClient(app.main.app) as client:
+    t2 = time.perf_counter()
+    assert client.get("/api/projects").status_code == 200
+    t3 = time.perf_counter()
+print(json.dumps({"import": t1 - t0, "startup": t2 - t1, "first request": t3 - t2}))
+"""
+
+
+def run_probe(env: dict[str, str]) -> dict[str, float]:
+    out = subprocess.run(
+        [sys.executable, "-c", _PROBE], env=env, check=True, capture_output=True, text=True
+    ).stdout
+    return json.loads(out.splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        env = {**os.environ, "DATABASE_URL": f"sqlite:///{tmp}/cold_start.db"}
+        subprocess.run([sys.executable, "-m", "app.cli", "init-db"], env=env, check=True)
+
+        for init_on_startup in ("false", "true"):
+            runs = [
+                run_probe({**env, "INIT_DB_ON_STARTUP": init_on_startup})
+                for _ in range(args.runs)
+            ]
+            print(f"INIT_DB_ON_STARTUP={init_on_startup} (median of {args.runs})")
+            for phase in runs[0]:
+                median = statistics.median(run[phase] for run in runs)
+                print(f"  {phase:<14} {median * 1000:7.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,198 @@
+"""Reproducible synthetic dataset for load tests, with realistic skew.
+
+    python -m benchmarks.dataset --database-url sqlite:///./bench.db [--tasks 200000]
+
+Initializes the schema (as `python -m app.cli init-db` does) and bulk-loads
+workspaces, projects, sections, tasks and comments. Sizes follow Zipf-like
+distributions: a few hot projects hold most tasks, a few power users are assigned
+most of them, and recently created tasks draw most comments. The same `--seed`
+always produces the same rows.
+"""
+
+import argparse
+import itertools
+import random
+from collections.abc import Iterator
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from app import crud, models, ranking, task_counts
+from app.bootstrap import init_db
+
+STATUSES = ("inbox", "today", "upcoming", "later", "completed")
+STATUS_WEIGHTS = (30, 10, 15, 10, 35)
+PRIORITIES = (None, "low", "medium", "high")
+SECTION_NAMES = ("Inbox", "To do", "Doing", "Review", "Done")
+INSERT_CHUNK = 10_000
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    workspaces: int = 2
+    projects: int = 200
+    tasks: int = 200_000
+    comments: int = 100_000
+    users: int = 50
+    # Zipf exponent for project and assignee popularity; 0 spreads rows evenly
+    skew: float = 1.1
+    seed: int = 42
+
+
+@dataclass(frozen=True)
+class DatasetSummary:
+    workspace_ids: list[int]
+    project_ids: list[int]
+    # Hottest first
+    assignees: list[str]
+
+
+def zipf_weights(n: int, skew: float) -> list[float]:
+    return list(itertools.accumulate(1 / (rank**skew) for rank in range(1, n + 1)))
+
+
+def _chunks(rows: Iterator[dict], size: int = INSERT_CHUNK) -> Iterator[list[dict]]:
+    while chunk := list(itertools.islice(rows, size)):
+        yield chunk
+
+
+def generate(engine: Engine, spec: DatasetSpec) -> DatasetSummary:
+    rng = random.Random(spec.seed)
+    init_db(bind=engine)
+    start = datetime(2024, 1, 1)
+    span = timedelta(days=365).total_seconds()
+    assignees = [f"user-{i}" for i in range(spec.users)]
+
+    with Session(engine) as db:
+        next_id = {
+            model: (db.scalar(select(func.max(model.id))) or 0) + 1
+            for model in (models.Workspace, models.Project, models.Section, models.Task)
+        }
+
+        workspace_ids = [next_id[models.Workspace] + i for i in range(spec.workspaces)]
+        db.execute(
+            insert(models.Workspace),
+            [{"id": ws_id, "name": f"Bench Workspace {ws_id}"} for ws_id in workspace_ids],
+        )
+
+        project_ids = [next_id[models.Project] + i for i in range(spec.projects)]
+        db.execute(
+            insert(models.Project),
+            [
+                {
+                    "id": project_id,
+                    "workspace_id": rng.choice(workspace_ids),
+                    "name": f"Project {project_id}",
+                    "color": f"#{rng.randrange(0x1000000):06x}",
+                    "icon": "list",
+                    "created_at": start,
+                    "updated_at": start + timedelta(seconds=rng.uniform(0, span)),
+                }
+                for project_id in project_ids
+            ],
+        )
+
+        sections: dict[int, list[int]] = {}
+        section_rows = []
+        section_id = next_id[models.Section]
+        for project_id in project_ids:
+            count = rng.randint(2, len(SECTION_NAMES))
+            for order_index, rank in zip(range(count), ranking.spread(count)):
+                sections.setdefault(project_id, []).append(section_id)
+                section_rows.append(
+                    {
+                        "id": section_id,
+                        "project_id": project_id,
+                        "name": SECTION_NAMES[order_index],
+                        "order_index": order_index,
+                        "rank": rank,
+                    }
+                )
+                section_id += 1
+        db.execute(insert(models.Section), section_rows)
+
+        # Hot projects and power users are the first ones, after a shuffle
+        hot_projects = rng.sample(project_ids, len(project_ids))
+        project_weights = zipf_weights(len(hot_projects), spec.skew)
+        assignee_weights = zipf_weights(len(assignees), spec.skew)
+
+        task_ranks = ranking.spread(spec.tasks)
+
+        def _tasks() -> Iterator[dict]:
+            for offset in range(spec.tasks):
+                project_id = rng.choices(hot_projects, cum_weights=project_weights)[0]
+                created_at = start + timedelta(seconds=span * offset / spec.tasks)
+                status = rng.choices(STATUSES, weights=STATUS_WEIGHTS)[0]
+                yield {
+                    "id": next_id[models.Task] + offset,
+                    "project_id": project_id,
+                    "section_id": rng.choice(sections[project_id]),
+                    "name": f"Task {offset} {rng.choice(('Fix', 'Plan', 'Review', 'Ship'))}",
+                    "description": "Details to follow" if rng.random() < 0.4 else None,
+                    "status": status,
+                    "assignee": (
+                        rng.choices(assignees, cum_weights=assignee_weights)[0]
+                        if rng.random() < 0.8
+                        else None
+                    ),
+                    "due_date": (
+                        date(2024, 1, 1) + timedelta(days=rng.randrange(400))
+                        if rng.random() < 0.5
+                        else None
+                    ),
+                    "priority": rng.choice(PRIORITIES),
+                    "created_at": created_at,
+                    "completed_at": created_at if status == "completed" else None,
+                    # Increasing with creation, like tasks appended one by one
+                    "rank": next(task_ranks),
+                }
+
+        for chunk in _chunks(_tasks()):
+            db.execute(insert(models.Task), chunk)
+
+        # Later tasks are discussed more: pick from the newest end of the id range
+        def _comments() -> Iterator[dict]:
+            for _ in range(spec.comments if spec.tasks else 0):
+                offset = int(spec.tasks * (1 - rng.random() ** 3))
+                yield {
+                    "task_id": next_id[models.Task] + min(offset, spec.tasks - 1),
+                    "author": rng.choices(assignees, cum_weights=assignee_weights)[0],
+                    "body": "Looks good to me",
+                    "created_at": start + timedelta(seconds=rng.uniform(0, span)),
+                }
+
+        for chunk in _chunks(_comments()):
+            db.execute(insert(models.TaskComment), chunk)
+        # Bulk inserts bypass crud, which maintains the counters and comment summaries
+        task_counts.reconcile(db)
+        crud.refresh_comment_summaries(db)
+        db.commit()
+
+    return DatasetSummary(
+        workspace_ids=workspace_ids, project_ids=hot_projects, assignees=assignees
+    )
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", default="sqlite:///./bench.db")
+    for name in DatasetSpec.__dataclass_fields__:
+        default = getattr(defaults, name)
+        parser.add_argument(f"--{name}", type=type(default), default=default)
+    args = parser.parse_args()
+
+    spec = DatasetSpec(**{name: getattr(args, name) for name in DatasetSpec.__dataclass_fields__})
+    engine = create_engine(args.database_url)
+    summary = generate(engine, spec)
+    print(
+        f"Loaded {spec.workspaces} workspaces, {spec.projects} projects, {spec.tasks} tasks"
+        f" and {spec.comments} comments; hottest project {summary.project_ids[0]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
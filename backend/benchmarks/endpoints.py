@@ -0,0 +1,359 @@
+"""Load test of the home, project, section, task and comment routes on a local uvicorn.
+
+    python -m benchmarks.endpoints [--tasks 200000] [--concurrency 16] [--requests 500]
+    python -m benchmarks.endpoints --save baseline.json
+    python -m benchmarks.endpoints --compare baseline.json
+
+Generates a skewed dataset (`benchmarks.dataset`) into a temporary SQLite file unless
+`--database-url` points at an existing one, starts uvicorn on it with
+`QUERY_COUNT_HEADER` on, and sends `--requests` requests to each endpoint with
+`--concurrency` in flight. Reports p50/p95/p99 latency, throughput and the median SQL
+statement count per endpoint.
+
+`--save` writes the results as a JSON baseline. `--compare` checks them against a
+baseline and exits with status 1 if an endpoint's p95 grew by more than
+`--tolerance` or it issues more SQL statements than before.
+
+The event streams (SSE and WebSocket) are long-lived and not measured here.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from collections.abc import Callable
+from dataclasses import asdict, dataclass, fields
+
+import httpx
+from sqlalchemy import create_engine, func, select
+
+from app import models
+from app.api.instrumentation import QUERY_COUNT_HEADER
+
+from .dataset import DatasetSpec, DatasetSummary, generate
+
+# (method, path, JSON body or None) for one request
+Request = tuple[str, str, dict | None]
+
+
+@dataclass
+class Endpoint:
+    name: str
+    make_request: Callable[[random.Random], Request]
+
+
+@dataclass
+class EndpointResult:
+    requests: int
+    errors: int
+    p50_ms: float
+    p95_ms: float
+    p99_ms: float
+    throughput_rps: float
+    queries: int
+
+
+def build_endpoints(
+    summary: DatasetSummary, task_ids: list[int], sections: list[tuple[int, int]]
+) -> list[Endpoint]:
+    """Endpoints over the dataset; `sections` are `(project_id, section_id)` pairs."""
+
+    hot_projects = summary.project_ids[:10]
+    power_users = summary.assignees[:5]
+    workspace_id = summary.workspace_ids[0]
+    # Deleted ones are taken off the end, so each is deleted once
+    deletable = task_ids[len(task_ids) // 2 :]
+    kept = task_ids[: len(task_ids) // 2]
+
+    def _get(path: str) -> Request:
+        return "GET", path, None
+
+    return [
+        Endpoint("GET /home", lambda r: _get(f"/api/home?assignee={r.choice(power_users)}")),
+        Endpoint("GET /projects", lambda r: _get("/api/projects")),
+        Endpoint(
+            "GET /projects?workspace_id",
+            lambda r: _get(f"/api/projects?workspace_id={workspace_id}"),
+        ),
+        Endpoint(
+            "POST /projects",
+            lambda r: ("POST", "/api/projects", {"workspace_id": workspace_id, "name": "Bench"}),
+        ),
+        Endpoint("GET /projects/{id}", lambda r: _get(f"/api/projects/{r.choice(hot_projects)}")),
+        Endpoint(
+            "GET /projects/{id}/sections",
+            lambda r: _get(f"/api/projects/{r.choice(hot_projects)}/sections"),
+        ),
+        Endpoint(
+            "POST /projects/{id}/sections/{id}/move",
+            # To the end of its project's section list
+            lambda r: (
+                "POST",
+                "/api/projects/{}/sections/{}/move".format(*r.choice(sections)),
+                {},
+            ),
+        ),
+        Endpoint(
+            "GET /projects/{id}/tasks",
+            lambda r: _get(f"/api/projects/{r.choice(hot_projects)}/tasks"),
+        ),
+        Endpoint(
+            "GET /projects/{id}/tasks?status",
+            lambda r: _get(f"/api/projects/{r.choice(hot_projects)}/tasks?status=today"),
+        ),
+        Endpoint(
+            "GET /projects/{id}/tasks?assignee",
+            lambda r: _get(
+                f"/api/projects/{r.choice(hot_projects)}/tasks?assignee={r.choice(power_users)}"
+            ),
+        ),
+        Endpoint(
+            "GET /projects/{id}/board",
+            lambda r: _get(f"/api/projects/{r.choice(hot_projects)}/board"),
+        ),
+        Endpoint(
+            "GET /projects/{id}/stats",
+            lambda r: _get(f"/api/projects/{r.choice(hot_projects)}/stats"),
+        ),
+        Endpoint(
+            "POST /tasks",
+            lambda r: ("POST", "/api/tasks", {"project_id": r.choice(hot_projects), "name": "New"}),
+        ),
+        Endpoint(
+            "POST /tasks/batch",
+            lambda r: (
+                "POST",
+                "/api/tasks/batch",
+                {"items": [{"project_id": r.choice(hot_projects), "name": "B"}] * 20},
+            ),
+        ),
+        Endpoint(
+            "PATCH /tasks/batch",
+            lambda r: (
+                "PATCH",
+                "/api/tasks/batch",
+                {"items": [{"id": i, "status": "today"} for i in r.sample(task_ids, 20)]},
+            ),
+        ),
+        Endpoint("GET /tasks/{id}", lambda r: _get(f"/api/tasks/{r.choice(task_ids)}")),
+        Endpoint(
+            "PATCH /tasks/{id}",
+            lambda r: ("PATCH", f"/api/tasks/{r.choice(task_ids)}", {"status": "upcoming"}),
+        ),
+        Endpoint(
+            "GET /tasks/{id}/comments",
+            lambda r: _get(f"/api/tasks/{r.choice(kept)}/comments"),
+        ),
+        Endpoint(
+            "POST /tasks/{id}/comments",
+            lambda r: (
+                "POST",
+                f"/api/tasks/{r.choice(kept)}/comments",
+                {"author": r.choice(power_users), "body": "Bench"},
+            ),
+        ),
+        Endpoint(
+            "POST /tasks/{id}/comments/batch",
+            lambda r: (
+                "POST",
+                f"/api/tasks/{r.choice(kept)}/comments/batch",
+                {"items": [{"author": r.choice(power_users), "body": "Bench"}] * 20},
+            ),
+        ),
+        Endpoint(
+            "POST /tasks/{id}/move",
+            # To the end of its section
+            lambda r: ("POST", f"/api/tasks/{r.choice(kept)}/move", {}),
+        ),
+        Endpoint("DELETE /tasks/{id}", lambda r: ("DELETE", f"/api/tasks/{deletable.pop()}", None)),
+    ]
+
+
+def summarize(latencies: list[float], errors: int, queries: list[int], elapsed: float):
+    cuts = statistics.quantiles(latencies, n=100, method="inclusive")
+    return EndpointResult(
+        requests=len(latencies),
+        errors=errors,
+        p50_ms=round(cuts[49] * 1000, 2),
+        p95_ms=round(cuts[94] * 1000, 2),
+        p99_ms=round(cuts[98] * 1000, 2),
+        throughput_rps=round(len(latencies) / elapsed, 1),
+        queries=round(statistics.median(queries)) if queries else -1,
+    )
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient, endpoint: Endpoint, requests: int, concurrency: int, seed: int
+) -> EndpointResult:
+    rng = random.Random(seed)
+    pending = [endpoint.make_request(rng) for _ in range(requests)]
+    latencies: list[float] = []
+    queries: list[int] = []
+    errors = 0
+
+    async def _worker() -> None:
+        nonlocal errors
+        while pending:
+            method, path, body = pending.pop()
+            start = time.perf_counter()
+            resp = await client.request(method, path, json=body)
+            latencies.append(time.perf_counter() - start)
+            if resp.status_code >= 400:
+                errors += 1
+            if QUERY_COUNT_HEADER in resp.headers:
+                queries.append(int(resp.headers[QUERY_COUNT_HEADER]))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(_worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, queries, time.perf_counter() - start)
+
+
+async def run_all(base_url: str, endpoints: list[Endpoint], args) -> dict[str, EndpointResult]:
+    limits = httpx.Limits(max_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        # Warm up connections, caches and the interpreter before measuring
+        for endpoint in endpoints:
+            if endpoint.make_request(random.Random(0))[0] == "GET":
+                await run_endpoint(client, endpoint, args.concurrency, args.concurrency, 0)
+        return {
+            endpoint.name: await run_endpoint(
+                client, endpoint, args.requests, args.concurrency, args.seed
+            )
+            for endpoint in endpoints
+        }
+
+
+def start_server(database_url: str, port: int) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "DATABASE_URL": database_url,
+        "INIT_DB_ON_STARTUP": "false",
+        "QUERY_COUNT_HEADER": "true",
+    }
+    command = ["uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"]
+    server = subprocess.Popen([sys.executable, "-m", *command], env=env)
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            if httpx.get(f"http://127.0.0.1:{port}/health").status_code == 200:
+                return server
+        except httpx.TransportError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError("uvicorn did not start")
+
+
+def compare(results: dict[str, EndpointResult], baseline: dict, tolerance: float) -> list[str]:
+    """Endpoints that got slower than the baseline allows, or issue more SQL."""
+
+    regressions = []
+    for name, result in results.items():
+        before = baseline["endpoints"].get(name)
+        if before is None:
+            continue
+        if result.p95_ms > before["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{name}: p95 {before['p95_ms']} -> {result.p95_ms} ms")
+        if result.queries > before["queries"]:
+            regressions.append(f"{name}: {before['queries']} -> {result.queries} SQL statements")
+    return regressions
+
+
+def main() -> None:
+    defaults = DatasetSpec()
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--database-url", help="Existing database; skips generating one")
+    parser.add_argument("--tasks", type=int, default=defaults.tasks)
+    parser.add_argument("--projects", type=int, default=defaults.projects)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500, help="Per endpoint")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--save", help="Write the results to this JSON file")
+    parser.add_argument("--compare", help="Baseline JSON file to check the results against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="Allowed p95 growth")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        database_url = args.database_url or f"sqlite:///{tmp}/bench.db"
+        spec = DatasetSpec(
+            tasks=args.tasks,
+            projects=args.projects,
+            comments=args.tasks // 2,
+            seed=args.seed,
+        )
+        engine = create_engine(database_url)
+        summary = generate(engine, spec) if args.database_url is None else None
+        with engine.connect() as conn:
+            if summary is None:
+                summary = DatasetSummary(
+                    workspace_ids=list(conn.scalars(select(models.Workspace.id))),
+                    project_ids=list(
+                        conn.scalars(
+                            select(models.Task.project_id)
+                            .group_by(models.Task.project_id)
+                            .order_by(func.count().desc())
+                        )
+                    ),
+                    assignees=list(
+                        conn.scalars(
+                            select(models.Task.assignee)
+                            .where(models.Task.assignee.is_not(None))
+                            .group_by(models.Task.assignee)
+                            .order_by(func.count().desc())
+                        )
+                    ),
+                )
+            task_ids = list(conn.scalars(select(models.Task.id).limit(args.requests * 4)))
+            sections = [
+                tuple(row)
+                for row in conn.execute(
+                    select(models.Section.project_id, models.Section.id).where(
+                        models.Section.project_id.in_(summary.project_ids[:10])
+                    )
+                )
+            ]
+        engine.dispose()
+
+        server = start_server(database_url, args.port)
+        try:
+            endpoints = build_endpoints(summary, task_ids, sections)
+            results = asyncio.run(run_all(f"http://127.0.0.1:{args.port}", endpoints, args))
+        finally:
+            server.terminate()
+            server.wait()
+
+    columns = [f.name for f in fields(EndpointResult)]
+    width = max(map(len, results)) + 2
+    print(f"{'endpoint':<{width}}" + "".join(f"{c:>15}" for c in columns))
+    for name, result in results.items():
+        print(f"{name:<{width}}" + "".join(f"{getattr(result, c):>15}" for c in columns))
+
+    report = {
+        "params": {
+            "tasks": args.tasks,
+            "projects": args.projects,
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+        },
+        "endpoints": {name: asdict(result) for name, result in results.items()},
+    }
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump(report, f, indent=2)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
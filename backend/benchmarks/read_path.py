@@ -0,0 +1,116 @@
+"""Latency and memory of listing a 100k-task project: ORM entities vs Core rows.
+
+    python -m benchmarks.read_path [--rows 100000] [--repeat 3]
+
+"orm" hydrates `models.Task` instances (identity map, instrumented attributes) and
+encodes them with `dump_json` (see `benchmarks.serialization`), which is what the list
+endpoints used to do. "rows" is `crud.list_tasks`, which selects only the `TaskRead`
+columns as Core rows, encoded with `dump_rows`. Both are timed for the query alone and
+for query plus serialization, with peak memory measured by tracemalloc.
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.api.responses import dump_rows
+from app.database import Base
+
+from .serialization import TASK_LIST, dump_json
+
+
+def build_database(rows: int):
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(models.Workspace(id=1, name="Bench"))
+        db.add(models.Project(id=1, workspace_id=1, name="Bench"))
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.execute(
+            insert(models.Task),
+            [
+                {
+                    "project_id": 1,
+                    "name": f"Task {i}",
+                    "description": "Some description text" if i % 2 else None,
+                    "status": "inbox",
+                    "assignee": "me",
+                    "due_date": date(2024, 6, 1),
+                    "priority": "high",
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+    return engine
+
+
+def orm_query(db: Session) -> list[models.Task]:
+    stmt = (
+        select(models.Task)
+        .where(models.Task.project_id == 1)
+        .order_by(models.Task.created_at.desc(), models.Task.id.desc())
+    )
+    return list(db.scalars(stmt))
+
+
+def rows_query(db: Session):
+    return crud.list_tasks(db, project_id=1)
+
+
+def orm_serialize(tasks) -> bytes:
+    return dump_json(TASK_LIST, tasks)
+
+
+def rows_serialize(rows) -> bytes:
+    return dump_rows(rows, schemas.TaskRead)
+
+
+def measure(engine, query, serialize, repeat: int) -> tuple[float, float]:
+    best = float("inf")
+    for _ in range(repeat):
+        with Session(engine) as db:
+            start = time.perf_counter()
+            result = query(db)
+            if serialize:
+                serialize(result)
+            best = min(best, time.perf_counter() - start)
+    with Session(engine) as db:
+        tracemalloc.start()
+        result = query(db)
+        if serialize:
+            serialize(result)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+    return best, peak
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    engine = build_database(args.rows)
+    print(f"{args.rows} tasks in one project, best of {args.repeat}")
+    with Session(engine) as db:
+        expected = orm_serialize(orm_query(db))
+        assert rows_serialize(rows_query(db)) == expected, "both paths must produce the same JSON"
+
+    paths = (("orm", orm_query, orm_serialize), ("rows", rows_query, rows_serialize))
+    for with_json in (False, True):
+        label = "query + JSON" if with_json else "query only"
+        for name, query, serialize in paths:
+            seconds, peak = measure(engine, query, serialize if with_json else None, args.repeat)
+            print(f"  {label:<12} {name:<5} {seconds * 1000:8.1f} ms  peak {peak / 2**20:7.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,109 @@
+"""Per-row cost of serializing a task list, before and after the single-pass path.
+
+    python -m benchmarks.serialization [--rows 10000] [--repeat 5]
+
+"before" is what list routes used to do: `TaskRead.model_validate` per ORM object,
+then FastAPI's `serialize_response` against `response_model` and `JSONResponse`.
+"after" is `dump_json` below, which validates the objects once through a `TypeAdapter`
+and lets pydantic-core write the JSON; list routes did that until they moved to Core
+rows (see `benchmarks.read_path`). Both start from the same ORM objects loaded
+from an in-memory SQLite database, so query time is excluded.
+"""
+
+import argparse
+import asyncio
+import time
+from collections.abc import Iterable
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_model_field
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine, insert, select
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.database import Base
+
+_RESPONSE_FIELD = create_model_field(name="Response", type_=list[schemas.TaskRead])
+
+TASK_LIST = TypeAdapter(list[schemas.TaskRead])
+
+
+def dump_json(adapter: TypeAdapter, items: Iterable[Any]) -> bytes:
+    """Validate `items` (ORM objects, rows or models) once and encode them to JSON."""
+
+    return adapter.dump_json(adapter.validate_python(items, from_attributes=True))
+
+
+def load_tasks(rows: int) -> list[models.Task]:
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        db.add(models.Workspace(id=1, name="Bench"))
+        db.add(models.Project(id=1, workspace_id=1, name="Bench"))
+        db.flush()
+        start = datetime(2024, 1, 1)
+        db.execute(
+            insert(models.Task),
+            [
+                {
+                    "project_id": 1,
+                    "name": f"Task {i}",
+                    "description": "Some description text" if i % 2 else None,
+                    "status": "inbox",
+                    "assignee": "me",
+                    "due_date": date(2024, 6, 1),
+                    "priority": "high",
+                    "created_at": start + timedelta(seconds=i),
+                }
+                for i in range(rows)
+            ],
+        )
+        db.commit()
+        tasks = list(db.scalars(select(models.Task)))
+        db.expunge_all()
+    return tasks
+
+
+def before(tasks: list[models.Task]) -> bytes:
+    content = [schemas.TaskRead.model_validate(t) for t in tasks]
+    encoded = asyncio.run(serialize_response(field=_RESPONSE_FIELD, response_content=content))
+    return JSONResponse(encoded).body
+
+
+def after(tasks: list[models.Task]) -> bytes:
+    return dump_json(TASK_LIST, tasks)
+
+
+def best_of(fn, tasks, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn(tasks)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    tasks = load_tasks(args.rows)
+    assert before(tasks) == after(tasks), "both paths must produce the same JSON"
+
+    print(f"{args.rows} tasks, best of {args.repeat}")
+    results = {
+        name: best_of(fn, tasks, args.repeat) for name, fn in (("before", before), ("after", after))
+    }
+    for name, seconds in results.items():
+        print(f"  {name:<6} {seconds * 1000:8.1f} ms  {seconds / args.rows * 1e6:6.2f} us/row")
+    print(f"  speedup {results['before'] / results['after']:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
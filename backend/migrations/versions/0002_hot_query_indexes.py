@@ -0,0 +1,38 @@
+"""Composite indexes for the task and project listing queries
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 09:30:00
+"""
+from collections.abc import Sequence
+
+from alembic import op
+
+
+revision: str = "0002"
+down_revision: str | None = "0001"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+# (name, table, columns) -- kept in sync with the models' __table_args__
+INDEXES = [
+    ("ix_tasks_project_created", "tasks", ["project_id", "created_at"]),
+    ("ix_tasks_project_status_created", "tasks", ["project_id", "status", "created_at"]),
+    ("ix_tasks_assignee_created", "tasks", ["assignee", "created_at"]),
+    ("ix_projects_workspace_updated", "projects", ["workspace_id", "updated_at"]),
+    ("ix_projects_updated", "projects", ["updated_at"]),
+]
+
+
+def upgrade() -> None:
+    # IF NOT EXISTS so databases bootstrapped by create_all can be stamped at 0001
+    # and upgraded without tripping over indexes they already have.
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, if_not_exists=True)
+    op.execute("ANALYZE")
+
+
+def downgrade() -> None:
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table, if_exists=True)
@@ -0,0 +1,28 @@
+"""Change counters backing ETags and cache invalidation
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:00:00
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0003"
+down_revision: str | None = "0002"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "change_counters",
+        sa.Column("scope", sa.String(length=255), primary_key=True),
+        sa.Column("version", sa.Integer(), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("change_counters")
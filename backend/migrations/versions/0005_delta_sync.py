@@ -0,0 +1,47 @@
+"""Change sequence columns and tombstones for delta sync
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 14:00:00
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0005"
+down_revision: str | None = "0004"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    # Existing rows start at 0: clients begin with a reset, so they never need them
+    # as deltas, and they are picked up again the next time they are written.
+    for table in ("projects", "tasks"):
+        op.add_column(
+            table,
+            sa.Column("change_seq", sa.Integer(), nullable=False, server_default="0"),
+        )
+        op.create_index(f"ix_{table}_change_seq", table, ["change_seq"])
+
+    op.create_table(
+        "tombstones",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("entity", sa.String(length=32), nullable=False),
+        sa.Column("entity_id", sa.Integer(), nullable=False),
+        sa.Column("workspace_id", sa.Integer(), nullable=False),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("deleted_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index("ix_tombstones_change_seq", "tombstones", ["change_seq"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tombstones_change_seq", table_name="tombstones")
+    op.drop_table("tombstones")
+    for table in ("tasks", "projects"):
+        op.drop_index(f"ix_{table}_change_seq", table_name=table)
+        with op.batch_alter_table(table) as batch_op:
+            batch_op.drop_column("change_seq")
@@ -0,0 +1,41 @@
+"""Task counts per project, section and status; due-date index for overdue counts
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 16:00:00
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0006"
+down_revision: str | None = "0005"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "task_counts",
+        sa.Column("project_id", sa.Integer(), primary_key=True),
+        sa.Column("section_id", sa.Integer(), primary_key=True),
+        sa.Column("status", sa.String(length=32), primary_key=True),
+        sa.Column("count", sa.Integer(), nullable=False),
+    )
+    # Same keys as app/task_counts.py: 0 for no section, "" for no status
+    op.execute(
+        """
+        INSERT INTO task_counts (project_id, section_id, status, count)
+        SELECT project_id, COALESCE(section_id, 0), COALESCE(status, ''), COUNT(*)
+        FROM tasks
+        GROUP BY project_id, COALESCE(section_id, 0), COALESCE(status, '')
+        """
+    )
+    op.create_index("ix_tasks_project_due", "tasks", ["project_id", "due_date"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_project_due", table_name="tasks")
+    op.drop_table("task_counts")
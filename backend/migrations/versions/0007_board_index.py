@@ -0,0 +1,30 @@
+"""Indexes for the board view: sections in order, tasks by section, newest first
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 17:00:00
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0007"
+down_revision: str | None = "0006"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+
+def upgrade() -> None:
+    op.create_index("ix_sections_project_order", "sections", ["project_id", "order_index"])
+    op.create_index(
+        "ix_tasks_project_section_created",
+        "tasks",
+        ["project_id", "section_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_project_section_created", table_name="tasks")
+    op.drop_index("ix_sections_project_order", table_name="sections")
@@ -0,0 +1,90 @@
+"""Fractional order keys for sections and tasks; board indexes ordered by them
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-18 18:00:00
+"""
+import itertools
+from collections.abc import Iterator, Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0008"
+down_revision: str | None = "0007"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The rank scheme of app/ranking.py as of this revision, frozen: ranks are base-62
+# integers whose first letter encodes their length (a0, a1, ..., az, b00, ...)
+RANK_DIGITS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz"
+FIRST_RANK = "a0"
+
+
+def _next_rank(rank: str) -> str:
+    head, digits = rank[0], list(rank[1:])
+    for i in reversed(range(len(digits))):
+        position = RANK_DIGITS.index(digits[i]) + 1
+        if position < len(RANK_DIGITS):
+            digits[i] = RANK_DIGITS[position]
+            return head + "".join(digits)
+        digits[i] = RANK_DIGITS[0]
+    # Every digit wrapped: the next head letter announces one more digit
+    return chr(ord(head) + 1) + "".join(digits) + RANK_DIGITS[0]
+
+
+def _spread(count: int) -> Iterator[str]:
+    # `ranking.spread`: `count` short ascending ranks
+    rank = FIRST_RANK
+    for _ in range(count):
+        yield rank
+        rank = _next_rank(rank)
+
+
+def _backfill(table: str, group_by: str, order_by: str) -> None:
+    # Ranks follow the order the rows were shown in so far, per group
+    conn = op.get_bind()
+    rows = conn.exec_driver_sql(
+        f"SELECT id, {group_by} FROM {table} ORDER BY {group_by}, {order_by}"
+    ).all()
+    params = []
+    for _, group in itertools.groupby(rows, key=lambda row: tuple(row[1:])):
+        group = list(group)
+        ranks = _spread(len(group))
+        params += [{"id": row[0], "rank": rank} for row, rank in zip(group, ranks)]
+    if params:
+        conn.execute(sa.text(f"UPDATE {table} SET rank = :rank WHERE id = :id"), params)
+
+
+def upgrade() -> None:
+    op.add_column(
+        "sections", sa.Column("rank", sa.String(length=255), nullable=False, server_default="")
+    )
+    op.add_column(
+        "tasks", sa.Column("rank", sa.String(length=255), nullable=False, server_default="")
+    )
+    _backfill("sections", "project_id", "order_index, id")
+    _backfill("tasks", "project_id, section_id", "created_at, id")
+
+    op.drop_index("ix_sections_project_order", table_name="sections")
+    op.drop_index("ix_tasks_project_section_created", table_name="tasks")
+    op.create_index("ix_sections_project_rank", "sections", ["project_id", "rank"])
+    op.create_index(
+        "ix_tasks_project_section_rank", "tasks", ["project_id", "section_id", "rank"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_tasks_project_section_rank", table_name="tasks")
+    op.drop_index("ix_sections_project_rank", table_name="sections")
+    op.create_index("ix_sections_project_order", "sections", ["project_id", "order_index"])
+    op.create_index(
+        "ix_tasks_project_section_created",
+        "tasks",
+        ["project_id", "section_id", sa.text("created_at DESC"), sa.text("id DESC")],
+    )
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("rank")
+    with op.batch_alter_table("sections") as batch:
+        batch.drop_column("rank")
@@ -0,0 +1,54 @@
+"""Comment thread index and per-task comment summaries
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-18 19:00:00
+"""
+from collections.abc import Sequence
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0009"
+down_revision: str | None = "0008"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# Matches crud.COMMENT_PREVIEW_LENGTH
+PREVIEW_LENGTH = 140
+
+
+def upgrade() -> None:
+    op.add_column(
+        "tasks", sa.Column("comment_count", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.add_column("tasks", sa.Column("last_comment_at", sa.DateTime(), nullable=True))
+    op.add_column("tasks", sa.Column("last_comment_author", sa.String(length=255), nullable=True))
+    op.add_column("tasks", sa.Column("last_comment_preview", sa.String(length=255), nullable=True))
+    op.create_index(
+        "ix_task_comments_task_created", "task_comments", ["task_id", "created_at", "id"]
+    )
+
+    # Summaries of the comments written so far; the new index serves each lookup
+    last = (
+        "SELECT {column} FROM task_comments c WHERE c.task_id = tasks.id"
+        " ORDER BY c.created_at DESC, c.id DESC LIMIT 1"
+    )
+    op.execute(
+        "UPDATE tasks SET"
+        " comment_count = (SELECT count(*) FROM task_comments c WHERE c.task_id = tasks.id),"
+        f" last_comment_at = ({last.format(column='c.created_at')}),"
+        f" last_comment_author = ({last.format(column='c.author')}),"
+        f" last_comment_preview = ({last.format(column=f'substr(c.body, 1, {PREVIEW_LENGTH})')})"
+        " WHERE id IN (SELECT task_id FROM task_comments)"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_task_comments_task_created", table_name="task_comments")
+    with op.batch_alter_table("tasks") as batch:
+        batch.drop_column("last_comment_preview")
+        batch.drop_column("last_comment_author")
+        batch.drop_column("last_comment_at")
+        batch.drop_column("comment_count")
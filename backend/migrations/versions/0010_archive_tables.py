@@ -0,0 +1,156 @@
+"""Archive tables for old completed tasks; partial indexes without archived projects
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-18 20:00:00
+"""
+from collections.abc import Sequence
+from datetime import datetime
+
+import sqlalchemy as sa
+from alembic import op
+
+
+revision: str = "0010"
+down_revision: str | None = "0009"
+branch_labels: str | Sequence[str] | None = None
+depends_on: str | Sequence[str] | None = None
+
+# The search triggers as created by migration 0004 (a frozen copy, like its DDL)
+SEARCH_TRIGGERS = (
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ai AFTER INSERT ON tasks BEGIN
+        INSERT INTO tasks_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_ad AFTER DELETE ON tasks BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER IF NOT EXISTS tasks_fts_au AFTER UPDATE OF name, description ON tasks
+    BEGIN
+        INSERT INTO tasks_fts(tasks_fts, rowid, name, description)
+        VALUES ('delete', old.id, old.name, old.description);
+        INSERT INTO tasks_fts(rowid, name, description)
+        VALUES (new.id, new.name, new.description);
+    END
+    """,
+)
+
+
+def _rebuild_tasks(*, autoincrement: bool) -> None:
+    # With AUTOINCREMENT, SQLite never hands out an id again, so a new task cannot take
+    # the id of an archived one. The table has to be rebuilt to get it.
+    if op.get_bind().dialect.name != "sqlite":
+        return
+    with op.batch_alter_table(
+        "tasks", recreate="always", table_kwargs={"sqlite_autoincrement": autoincrement}
+    ):
+        pass
+    # The rebuild dropped the search triggers; ids are unchanged, so the index holds
+    for statement in SEARCH_TRIGGERS:
+        op.execute(statement)
+
+
+def upgrade() -> None:
+    op.create_table(
+        "archived_tasks",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("project_id", sa.Integer(), sa.ForeignKey("projects.id"), nullable=False),
+        sa.Column("section_id", sa.Integer(), sa.ForeignKey("sections.id"), nullable=True),
+        sa.Column("name", sa.String(length=255), nullable=False),
+        sa.Column("description", sa.Text(), nullable=True),
+        sa.Column("status", sa.String(length=32), nullable=False),
+        sa.Column("assignee", sa.String(length=255), nullable=True),
+        sa.Column("due_date", sa.Date(), nullable=True),
+        sa.Column("priority", sa.String(length=32), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("completed_at", sa.DateTime(), nullable=True),
+        sa.Column("change_seq", sa.Integer(), nullable=False),
+        sa.Column("rank", sa.String(length=255), nullable=False),
+        sa.Column("comment_count", sa.Integer(), nullable=False),
+        sa.Column("last_comment_at", sa.DateTime(), nullable=True),
+        sa.Column("last_comment_author", sa.String(length=255), nullable=True),
+        sa.Column("last_comment_preview", sa.String(length=255), nullable=True),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_archived_tasks_project_created", "archived_tasks", ["project_id", "created_at"]
+    )
+    op.create_table(
+        "archived_task_comments",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("task_id", sa.Integer(), sa.ForeignKey("archived_tasks.id"), nullable=False),
+        sa.Column("author", sa.String(length=255), nullable=False),
+        sa.Column("body", sa.Text(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+    )
+    op.create_index(
+        "ix_archived_task_comments_task_created",
+        "archived_task_comments",
+        ["task_id", "created_at", "id"],
+    )
+
+    # Completed tasks never got a completion time; count them as completed now, so
+    # none is archived before the configured age has passed
+    op.execute(
+        sa.text(
+            "UPDATE tasks SET completed_at = :now"
+            " WHERE status = 'completed' AND completed_at IS NULL"
+        ).bindparams(now=datetime.utcnow())
+    )
+    _rebuild_tasks(autoincrement=True)
+    op.create_index(
+        "ix_tasks_completed_at",
+        "tasks",
+        ["completed_at"],
+        sqlite_where=sa.text("completed_at IS NOT NULL"),
+    )
+
+    op.drop_index("ix_projects_workspace_updated", table_name="projects")
+    op.drop_index("ix_projects_updated", table_name="projects")
+    op.create_index("ix_projects_workspace", "projects", ["workspace_id"])
+    op.create_index(
+        "ix_projects_live_workspace_updated",
+        "projects",
+        ["workspace_id", "updated_at"],
+        sqlite_where=sa.text("is_archived = 0"),
+    )
+    op.create_index(
+        "ix_projects_live_updated",
+        "projects",
+        ["updated_at"],
+        sqlite_where=sa.text("is_archived = 0"),
+    )
+    op.create_index(
+        "ix_projects_archived_workspace_updated",
+        "projects",
+        ["workspace_id", "updated_at"],
+        sqlite_where=sa.text("is_archived = 1"),
+    )
+    op.create_index(
+        "ix_projects_archived_updated",
+        "projects",
+        ["updated_at"],
+        sqlite_where=sa.text("is_archived = 1"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_projects_archived_updated", table_name="projects")
+    op.drop_index("ix_projects_archived_workspace_updated", table_name="projects")
+    op.drop_index("ix_projects_live_updated", table_name="projects")
+    op.drop_index("ix_projects_live_workspace_updated", table_name="projects")
+    op.drop_index("ix_projects_workspace", table_name="projects")
+    op.create_index("ix_projects_updated", "projects", ["updated_at"])
+    op.create_index("ix_projects_workspace_updated", "projects", ["workspace_id", "updated_at"])
+    op.drop_index("ix_tasks_completed_at", table_name="tasks")
+    _rebuild_tasks(autoincrement=False)
+    op.drop_index("ix_archived_task_comments_task_created", table_name="archived_task_comments")
+    op.drop_table("archived_task_comments")
+    op.drop_index("ix_archived_tasks_project_created", table_name="archived_tasks")
+    op.drop_table("archived_tasks")
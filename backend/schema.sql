@@ -13,14 +13,17 @@ CREATE TABLE IF NOT EXISTS projects (
     icon VARCHAR(64),
     is_archived BOOLEAN DEFAULT 0,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP
+    updated_at DATETIME DEFAULT CURRENT_TIMESTAMP,
+    change_seq INTEGER NOT NULL DEFAULT 0
 );
 
 CREATE TABLE IF NOT EXISTS sections (
     id INTEGER PRIMARY KEY AUTOINCREMENT,
     project_id INTEGER NOT NULL REFERENCES projects(id),
     name VARCHAR(255) NOT NULL,
-    order_index INTEGER DEFAULT 0
+    order_index INTEGER DEFAULT 0,
+    -- Fractional order key (app/ranking.py); '' until ranked
+    rank VARCHAR(255) NOT NULL DEFAULT ''
 );
 
 CREATE TABLE IF NOT EXISTS tasks (
@@ -34,7 +37,15 @@ CREATE TABLE IF NOT EXISTS tasks (
     due_date DATE,
     priority VARCHAR(32),
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP,
-    completed_at DATETIME
+    completed_at DATETIME,
+    change_seq INTEGER NOT NULL DEFAULT 0,
+    -- Fractional order key within the section (app/ranking.py); '' until ranked
+    rank VARCHAR(255) NOT NULL DEFAULT '',
+    -- Summary of the task's comments, kept by app/crud.py so lists never join them
+    comment_count INTEGER NOT NULL DEFAULT 0,
+    last_comment_at DATETIME,
+    last_comment_author VARCHAR(255),
+    last_comment_preview VARCHAR(255)
 );
 
 CREATE TABLE IF NOT EXISTS task_comments (
@@ -44,3 +55,92 @@ CREATE TABLE IF NOT EXISTS task_comments (
     body TEXT NOT NULL,
     created_at DATETIME DEFAULT CURRENT_TIMESTAMP
 );
+
+-- Indexes for the listing queries in app/crud.py (see migrations/versions/0002_*)
+CREATE INDEX IF NOT EXISTS ix_tasks_project_created ON tasks (project_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_project_status_created ON tasks (project_id, status, created_at);
+CREATE INDEX IF NOT EXISTS ix_tasks_assignee_created ON tasks (assignee, created_at);
+CREATE INDEX IF NOT EXISTS ix_projects_workspace ON projects (workspace_id);
+-- Project lists cover live and archived projects with separate partial indexes
+CREATE INDEX IF NOT EXISTS ix_projects_live_workspace_updated
+    ON projects (workspace_id, updated_at) WHERE is_archived = 0;
+CREATE INDEX IF NOT EXISTS ix_projects_live_updated ON projects (updated_at) WHERE is_archived = 0;
+CREATE INDEX IF NOT EXISTS ix_projects_archived_workspace_updated
+    ON projects (workspace_id, updated_at) WHERE is_archived = 1;
+CREATE INDEX IF NOT EXISTS ix_projects_archived_updated
+    ON projects (updated_at) WHERE is_archived = 1;
+
+-- Per-scope change counters bumped by the crud write paths (ETags, cache invalidation)
+CREATE TABLE IF NOT EXISTS change_counters (
+    scope VARCHAR(255) PRIMARY KEY,
+    version INTEGER NOT NULL
+);
+
+-- Delta sync (GET /api/sync): rows changed or deleted after a client's sequence number
+CREATE INDEX IF NOT EXISTS ix_projects_change_seq ON projects (change_seq);
+CREATE INDEX IF NOT EXISTS ix_tasks_change_seq ON tasks (change_seq);
+
+CREATE TABLE IF NOT EXISTS tombstones (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    entity VARCHAR(32) NOT NULL,
+    entity_id INTEGER NOT NULL,
+    workspace_id INTEGER NOT NULL,
+    change_seq INTEGER NOT NULL,
+    deleted_at DATETIME NOT NULL
+);
+CREATE INDEX IF NOT EXISTS ix_tombstones_change_seq ON tombstones (change_seq);
+
+-- Task counts per project, section (0 = none) and status ('' = none), kept by app/crud.py
+CREATE TABLE IF NOT EXISTS task_counts (
+    project_id INTEGER NOT NULL,
+    section_id INTEGER NOT NULL,
+    status VARCHAR(32) NOT NULL,
+    count INTEGER NOT NULL,
+    PRIMARY KEY (project_id, section_id, status)
+);
+-- Overdue counts for GET /api/projects/{id}/stats
+CREATE INDEX IF NOT EXISTS ix_tasks_project_due ON tasks (project_id, due_date);
+-- Board columns for GET /api/projects/{id}/board: sections in order, and each
+-- section's tasks in order
+CREATE INDEX IF NOT EXISTS ix_sections_project_rank ON sections (project_id, rank);
+CREATE INDEX IF NOT EXISTS ix_tasks_project_section_rank ON tasks (project_id, section_id, rank);
+-- Comment threads for GET /api/tasks/{id}/comments, oldest first
+CREATE INDEX IF NOT EXISTS ix_task_comments_task_created ON task_comments (task_id, created_at, id);
+
+-- Cold storage for old completed tasks and archived projects' tasks (archive-tasks)
+CREATE TABLE IF NOT EXISTS archived_tasks (
+    id INTEGER PRIMARY KEY,
+    project_id INTEGER NOT NULL REFERENCES projects(id),
+    section_id INTEGER REFERENCES sections(id),
+    name VARCHAR(255) NOT NULL,
+    description TEXT,
+    status VARCHAR(32) NOT NULL,
+    assignee VARCHAR(255),
+    due_date DATE,
+    priority VARCHAR(32),
+    created_at DATETIME NOT NULL,
+    completed_at DATETIME,
+    change_seq INTEGER NOT NULL,
+    rank VARCHAR(255) NOT NULL,
+    comment_count INTEGER NOT NULL,
+    last_comment_at DATETIME,
+    last_comment_author VARCHAR(255),
+    last_comment_preview VARCHAR(255),
+    archived_at DATETIME NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS archived_task_comments (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    task_id INTEGER NOT NULL REFERENCES archived_tasks(id),
+    author VARCHAR(255) NOT NULL,
+    body TEXT NOT NULL,
+    created_at DATETIME NOT NULL
+);
+
+CREATE INDEX IF NOT EXISTS ix_archived_tasks_project_created
+    ON archived_tasks (project_id, created_at);
+CREATE INDEX IF NOT EXISTS ix_archived_task_comments_task_created
+    ON archived_task_comments (task_id, created_at, id);
+-- Finds completed tasks due for archival
+CREATE INDEX IF NOT EXISTS ix_tasks_completed_at
+    ON tasks (completed_at) WHERE completed_at IS NOT NULL;
@@ -1,20 +1,29 @@
 import os
 from collections.abc import Generator
 
+# Point the app at a throwaway SQLite DB before anything reads the settings
+os.environ["DATABASE_URL"] = "sqlite:///./test_asana_clone.db"
+
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
 
+from app.cache import query_cache
 from app.config import get_settings
-from app.database import Base, get_db
+from app.database import (
+    Base,
+    get_async_db,
+    get_async_read_db,
+    get_db,
+    get_read_db,
+    to_async_url,
+)
+from app.lookups import lookup_cache
 from app.main import app
-
-
-@pytest.fixture(scope="session", autouse=True)
-def _test_database_url() -> None:
-    # Use an in-memory SQLite DB for tests
-    os.environ["DATABASE_URL"] = "sqlite:///./test_asana_clone.db"
+from app.writer import task_writer
 
 
 @pytest.fixture(scope="session")
@@ -26,14 +35,36 @@ def engine() -> Generator:
         if settings.database_url.startswith("sqlite")
         else {},
     )
-    Base.metadata.drop_all(bind=engine)
-    Base.metadata.create_all(bind=engine)
     yield engine
     Base.metadata.drop_all(bind=engine)
 
 
+@pytest.fixture(scope="session")
+def async_engine():
+    # DB_MODE=async routes use the same test database. Each TestClient request runs on
+    # a new event loop, so connections are not pooled across requests.
+    return create_async_engine(to_async_url(get_settings().database_url), poolclass=NullPool)
+
+
+@pytest.fixture(scope="session")
+def app_engine(engine, async_engine):
+    """The engine the routes run their statements on, for tests that capture them."""
+
+    return async_engine.sync_engine if get_settings().db_mode == "async" else engine
+
+
+@pytest.fixture(scope="session")
+def async_session_factory(async_engine):
+    return async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+
 @pytest.fixture()
 def db_session(engine):
+    # Every test starts from an empty schema so seeded rows never collide
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    query_cache.clear()
+    lookup_cache.clear()
     TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
     db = TestingSessionLocal()
     try:
@@ -43,12 +74,28 @@ def db_session(engine):
 
 
 @pytest.fixture()
-def client(db_session):
+def client(db_session, async_session_factory):
     def override_get_db():
         try:
             yield db_session
         finally:
             pass
 
+    async def override_get_async_db():
+        async with async_session_factory() as db:
+            yield db
+
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_read_db] = override_get_db
+    app.dependency_overrides[get_async_db] = override_get_async_db
+    app.dependency_overrides[get_async_read_db] = override_get_async_db
     return TestClient(app)
+
+
+@pytest.fixture(params=[False, True], ids=["direct", "coalesced"])
+def write_coalescing(request, monkeypatch):
+    """Runs a test with single-task writes committed directly and through app/writer.py."""
+
+    monkeypatch.setattr(task_writer, "enabled", request.param)
+    monkeypatch.setattr(task_writer, "window_seconds", 0)
+    return request.param
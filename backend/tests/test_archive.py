@@ -0,0 +1,131 @@
+from datetime import datetime, timedelta
+
+from sqlalchemy import update
+
+from app import crud, models, task_counts
+from app.cli import main as cli_main
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_completed_at_follows_status(client, db_session):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    proj_id, task_id = proj.id, task1.id
+
+    done = client.patch(f"/api/tasks/{task_id}", json={"status": "completed"}).json()
+    assert done["completed_at"] is not None
+    renamed = client.patch(f"/api/tasks/{task_id}", json={"name": "Renamed"}).json()
+    assert renamed["completed_at"] == done["completed_at"]
+    reopened = client.patch(f"/api/tasks/{task_id}", json={"status": "today"}).json()
+    assert reopened["completed_at"] is None
+
+    created = client.post(
+        "/api/tasks", json={"project_id": proj_id, "name": "Done", "status": "completed"}
+    ).json()
+    assert created["completed_at"] is not None
+    batch = client.patch(
+        "/api/tasks/batch", json={"items": [{"id": created["id"], "status": "inbox"}]}
+    ).json()
+    assert batch["results"][0]["task"]["completed_at"] is None
+
+
+def _seed_archive(db):
+    ws, proj, _, task1, task2 = seed_sample_data(db)
+    old = datetime.utcnow() - timedelta(days=400)
+    # Completed long ago, with a thread; and one completed just now
+    task1.status, task1.completed_at = "completed", old
+    task2.status, task2.completed_at = "completed", datetime.utcnow()
+    db.add_all(
+        [models.TaskComment(task_id=task1.id, author="me", body=f"Note {i}") for i in range(2)]
+    )
+    shelved = models.Project(workspace_id=ws.id, name="Shelved", is_archived=True)
+    db.add(shelved)
+    db.flush()
+    shelved_task = models.Task(project_id=shelved.id, name="Forgotten")
+    newest = models.Task(project_id=proj.id, name="Newest")
+    db.add_all([shelved_task, newest])
+    db.flush()
+    task_counts.reconcile(db)
+    db.commit()
+    return proj.id, shelved.id, [task1.id, task2.id, shelved_task.id, newest.id]
+
+
+def test_archive_moves_due_tasks_in_chunks(client, db_session):
+    proj_id, shelved_id, (old_id, recent_id, shelved_task_id, newest_id) = _seed_archive(
+        db_session
+    )
+
+    since = client.get("/api/sync").json()["cursor"]
+    cutoff = datetime.utcnow() - timedelta(days=90)
+    assert crud.archive_tasks(db_session, cutoff, chunk_size=1) == 2
+    db_session.expire_all()
+    assert {t.id for t in db_session.query(models.ArchivedTask)} == {old_id, shelved_task_id}
+    thread = db_session.query(models.ArchivedTaskComment).order_by(models.ArchivedTaskComment.id)
+    assert [(c.task_id, c.body) for c in thread] == [(old_id, "Note 0"), (old_id, "Note 1")]
+    assert db_session.query(models.TaskComment).count() == 0
+    synced = client.get("/api/sync", params={"since": since}).json()
+    assert sorted(synced["deleted_tasks"]) == sorted([old_id, shelved_task_id])
+
+    live = [t["id"] for t in client.get(f"/api/projects/{proj_id}/tasks").json()]
+    assert sorted(live) == sorted([recent_id, newest_id])
+    assert client.get(f"/api/tasks/{old_id}").status_code == 404
+    stats = client.get(f"/api/projects/{proj_id}/stats").json()
+    assert stats["total"] == 2
+
+    # Archived tasks come back merged in, newest first, across pages
+    ids, cursor = [], None
+    while True:
+        params = {"include_archived": "true", "limit": 1}
+        if cursor:
+            params["cursor"] = cursor
+        resp = client.get(f"/api/projects/{proj_id}/tasks", params=params)
+        ids += [t["id"] for t in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert ids == [newest_id, recent_id, old_id]
+    resp = client.get(f"/api/projects/{shelved_id}/tasks?include_archived=true&fields=name")
+    assert resp.json() == [{"name": "Forgotten", "id": shelved_task_id}]
+
+    assert crud.archive_tasks(db_session, cutoff) == 0
+
+
+def test_archived_task_ids_are_not_reused(client, db_session):
+    proj_id, _, (old_id, recent_id, shelved_task_id, newest_id) = _seed_archive(db_session)
+    cutoff = datetime.utcnow() - timedelta(days=90)
+    assert crud.archive_tasks(db_session, cutoff) == 2
+
+    # Without the newest task, max(id) + 1 would be an archived id again
+    assert client.delete(f"/api/tasks/{newest_id}").status_code == 204
+    created = [
+        client.post("/api/tasks", json={"project_id": proj_id, "name": f"New {i}"}).json()["id"]
+        for i in range(3)
+    ]
+    assert min(created) > newest_id
+
+    for task_id in created:
+        client.patch(f"/api/tasks/{task_id}", json={"status": "completed"})
+    db_session.execute(
+        update(models.Task)
+        .where(models.Task.id.in_(created))
+        .values(completed_at=datetime.utcnow() - timedelta(days=400))
+    )
+    db_session.commit()
+    assert crud.archive_tasks(db_session, cutoff) == 3
+    resp = client.get(f"/api/projects/{proj_id}/tasks?include_archived=true")
+    ids = [t["id"] for t in resp.json()]
+    assert sorted(ids) == sorted([old_id, recent_id, *created])
+
+
+def test_archived_projects_are_listed_on_request(client, db_session):
+    proj_id, shelved_id, _ = _seed_archive(db_session)
+
+    assert [p["id"] for p in client.get("/api/projects").json()] == [proj_id]
+    listed = client.get("/api/projects?include_archived=true").json()
+    assert [(p["id"], p["is_archived"]) for p in listed] == [(shelved_id, True), (proj_id, False)]
+    home = client.get("/api/home").json()
+    assert [p["id"] for p in home["recent_projects"]] == [proj_id]
+
+    assert cli_main(["archive-tasks", "--days", "30"]) == 0
+    resp = client.get(f"/api/projects/{shelved_id}/tasks")
+    assert resp.status_code == 200 and resp.json() == []
@@ -0,0 +1,73 @@
+import pytest
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app import crud, schemas
+from app.api import deps
+from app.database import AsyncDBSession, Base, DBSession, to_async_url
+from app.main import app
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_to_async_url():
+    assert to_async_url("sqlite:///./asana_clone.db") == "sqlite+aiosqlite:///./asana_clone.db"
+    assert to_async_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    with pytest.raises(ValueError):
+        to_async_url("oracle://db/app")
+
+
+@pytest.mark.asyncio
+async def test_async_db_session_runs_crud(tmp_path):
+    engine = create_async_engine(to_async_url(f"sqlite:///{tmp_path / 'async.db'}"))
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    async with async_sessionmaker(engine, expire_on_commit=False)() as session:
+        db = AsyncDBSession(session)
+        ws = await db.run(crud.get_or_create_default_workspace, "Async Workspace")
+        project = await db.run(
+            crud.create_project, schemas.ProjectCreate(name="Async", workspace_id=ws.id)
+        )
+        await db.run(
+            crud.create_task,
+            schemas.TaskCreate(name="Async task", project_id=project.id, assignee="me"),
+        )
+        summary = await db.run(crud.get_home_summary)
+
+    assert [t.project_name for t in summary.my_tasks] == ["Async"]
+    await engine.dispose()
+
+
+def test_db_session_is_abstract():
+    with pytest.raises(TypeError):
+        DBSession()
+
+
+def test_routes_run_on_async_sessions(client, db_session, monkeypatch):
+    _, proj, inbox, task1, _ = seed_sample_data(db_session)
+    proj_id, inbox_id, task_id = proj.id, inbox.id, task1.id
+    # What DB_MODE=async selects at import time
+    monkeypatch.setitem(app.dependency_overrides, deps._get_sync_db_dep, deps._get_async_db_dep)
+    monkeypatch.setitem(
+        app.dependency_overrides, deps._get_sync_read_db_dep, deps._get_async_read_db_dep
+    )
+    runs = []
+    run = AsyncDBSession.run
+
+    async def _counted(self, fn, *args, **kwargs):
+        runs.append(fn)
+        return await run(self, fn, *args, **kwargs)
+
+    monkeypatch.setattr(AsyncDBSession, "run", _counted)
+
+    created = client.post(
+        "/api/tasks", json={"project_id": proj_id, "section_id": inbox_id, "name": "Async"}
+    )
+    assert created.status_code == 201
+    resp = client.patch(f"/api/tasks/{task_id}", json={"status": "completed"})
+    assert resp.status_code == 200 and resp.json()["completed_at"] is not None
+    names = {t["name"] for t in client.get(f"/api/projects/{proj_id}/tasks").json()}
+    assert "Async" in names
+    assert client.get(f"/api/tasks/{created.json()['id']}").json()["name"] == "Async"
+    assert client.get("/api/tasks/9999").status_code == 404
+    assert len(runs) == 5
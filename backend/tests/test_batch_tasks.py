@@ -0,0 +1,103 @@
+from sqlalchemy import event
+
+from app import models, watermarks
+from app.query_plans import capture_statements
+from app.watermarks import project_tasks_scope
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_batch_create_reports_per_item_results(client, db_session, app_engine):
+    ws, proj, inbox, _, _ = seed_sample_data(db_session)
+    other = models.Project(workspace_id=ws.id, name="Other")
+    db_session.add(other)
+    db_session.commit()
+    project_id, inbox_id, other_id = proj.id, inbox.id, other.id
+
+    items = [
+        {"name": "A", "project_id": project_id, "section_id": inbox_id, "assignee": "me"},
+        {"name": "B", "project_id": 9999},
+        {"name": "C", "project_id": other_id, "section_id": inbox_id},
+        {"name": "D", "project_id": other_id},
+    ]
+    with capture_statements(app_engine) as selects:
+        resp = client.post("/api/tasks/batch", json={"items": items})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+
+    assert [r["status"] for r in results] == [201, 404, 400, 201]
+    assert results[0]["task"]["section_id"] == inbox_id
+    assert results[3]["task"]["project_id"] == other_id
+    assert results[1]["task"] is None and results[1]["error"] == "Project not found"
+    # All projects and sections were validated with a single SELECT, and the last
+    # ranks of the sections the new tasks join were read with another
+    assert len(selects) == 2
+
+    names = {t["name"] for t in client.get(f"/api/projects/{other_id}/tasks").json()}
+    assert names == {"D"}
+    assert "A" in [t["name"] for t in client.get("/api/home").json()["my_tasks"]]
+
+
+def test_batch_update_applies_valid_items(client, db_session):
+    ws, proj, inbox, task1, task2 = seed_sample_data(db_session)
+    foreign = models.Section(project_id=proj.id + 1, name="Elsewhere")
+    db_session.add(foreign)
+    db_session.commit()
+    project_id, task1_id, task2_id, foreign_id = proj.id, task1.id, task2.id, foreign.id
+
+    items = [
+        {"id": task1_id, "status": "completed"},
+        {"id": task2_id, "assignee": "me", "status": "completed"},
+        {"id": 9999, "status": "completed"},
+        {"id": task1_id, "name": "Again"},
+        {"id": task2_id, "section_id": foreign_id},
+    ]
+    resp = client.patch("/api/tasks/batch", json={"items": items})
+    assert resp.status_code == 200
+    results = resp.json()["results"]
+    assert [r["status"] for r in results] == [200, 200, 404, 400, 400]
+    assert results[1]["task"]["assignee"] == "me"
+
+    tasks = client.get(f"/api/projects/{project_id}/tasks").json()
+    assert {t["status"] for t in tasks} == {"completed"}
+    assert {t["name"] for t in tasks} == {"Task 1", "Task 2"}
+
+
+def test_batch_limits(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    assert client.post("/api/tasks/batch", json={"items": []}).status_code == 422
+    too_many = [{"name": "x", "project_id": proj.id}] * 1001
+    assert client.post("/api/tasks/batch", json={"items": too_many}).status_code == 422
+
+
+def test_batch_bumps_every_watermark_in_one_statement(client, db_session, app_engine):
+    ws, proj, _, _, _ = seed_sample_data(db_session)
+    projects = [models.Project(workspace_id=ws.id, name=f"P{i}") for i in range(5)]
+    db_session.add_all(projects)
+    db_session.commit()
+    project_ids = [proj.id, *(p.id for p in projects)]
+
+    upserts = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO change_counters"):
+            upserts.append(statement)
+
+    items = [
+        {"name": f"T{i}", "project_id": project_ids[i % 6], "assignee": f"user-{i}"}
+        for i in range(20)
+    ]
+    event.listen(app_engine, "before_cursor_execute", _record)
+    try:
+        resp = client.post("/api/tasks/batch", json={"items": items})
+    finally:
+        event.remove(app_engine, "before_cursor_execute", _record)
+    assert [r["status"] for r in resp.json()["results"]] == [201] * 20
+    # The change sequence, then 26 project and assignee scopes at once
+    assert len(upserts) == 2
+
+    # Existing and new counters alike go up by one
+    client.post("/api/tasks/batch", json={"items": items[:1]})
+    scopes = [project_tasks_scope(project_ids[0]), project_tasks_scope(project_ids[1])]
+    db_session.expire_all()
+    assert watermarks.read(db_session, scopes) == {scopes[0]: 2, scopes[1]: 1}
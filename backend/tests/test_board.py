@@ -0,0 +1,97 @@
+from app import models, ranking
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def _seed_board(db):
+    ws, proj, inbox, task1, task2 = seed_sample_data(db)
+    # Created out of rank order, so grouping cannot rely on ids
+    a0, a1, a2, a3, a4 = ranking.spread(5)
+    inbox.rank = a0
+    done = models.Section(project_id=proj.id, name="Done", rank=a2)
+    doing = models.Section(project_id=proj.id, name="Doing", rank=a1)
+    empty = models.Section(project_id=proj.id, name="Later", rank=a3)
+    db.add_all([done, doing, empty])
+    db.flush()
+    for i, rank in enumerate([a3, a1, a4, a0, a2]):
+        db.add(models.Task(project_id=proj.id, section_id=doing.id, name=f"Doing {i}", rank=rank))
+    db.add(models.Task(project_id=proj.id, section_id=done.id, name="Shipped"))
+    db.add(models.Task(project_id=proj.id, name="Loose"))
+    db.commit()
+    return proj.id, [inbox.id, doing.id, done.id, empty.id]
+
+
+def test_board_groups_tasks_by_section_in_order(client, db_session):
+    proj_id, section_ids = _seed_board(db_session)
+
+    resp = client.get(f"/api/projects/{proj_id}/board")
+    assert resp.status_code == 200
+    board = resp.json()
+    assert board["project_id"] == proj_id
+    columns = board["columns"]
+    # Unsectioned tasks first, then every section by rank, empty ones included
+    assert [c["section"] and c["section"]["id"] for c in columns] == [None, *section_ids]
+    assert [[t["name"] for t in c["tasks"]] for c in columns] == [
+        ["Loose"],
+        # Unranked tasks go first, by id
+        ["Task 1", "Task 2"],
+        ["Doing 3", "Doing 1", "Doing 4", "Doing 0", "Doing 2"],
+        ["Shipped"],
+        [],
+    ]
+    assert all(c["next_cursor"] is None for c in columns)
+
+
+def test_board_caps_columns_and_continues_one_column(client, db_session):
+    proj_id, section_ids = _seed_board(db_session)
+    doing_id = section_ids[1]
+
+    columns = client.get(f"/api/projects/{proj_id}/board?limit=2").json()["columns"]
+    doing = next(c for c in columns if c["section"] and c["section"]["id"] == doing_id)
+    assert [t["name"] for t in doing["tasks"]] == ["Doing 3", "Doing 1"]
+    assert len(columns[1]["tasks"]) == 2 and columns[1]["next_cursor"] is None
+
+    names, cursor = [], doing["next_cursor"]
+    while cursor:
+        resp = client.get(f"/api/projects/{proj_id}/board?limit=2&cursor={cursor}")
+        (column,) = resp.json()["columns"]
+        assert column["section"]["id"] == doing_id
+        names += [t["name"] for t in column["tasks"]]
+        cursor = column["next_cursor"]
+    assert names == ["Doing 4", "Doing 0", "Doing 2"]
+
+
+def test_board_errors_and_revalidation(client, db_session):
+    proj_id, _ = _seed_board(db_session)
+
+    assert client.get("/api/projects/999/board").status_code == 404
+    assert client.get(f"/api/projects/{proj_id}/board?cursor=bogus").status_code == 400
+
+    first = client.get(f"/api/projects/{proj_id}/board")
+    headers = {"If-None-Match": first.headers["ETag"]}
+    assert client.get(f"/api/projects/{proj_id}/board", headers=headers).status_code == 304
+    client.post("/api/tasks", json={"project_id": proj_id, "name": "New"})
+    resp = client.get(f"/api/projects/{proj_id}/board", headers=headers)
+    assert resp.status_code == 200
+    # New tasks go last in their section
+    assert [t["name"] for t in resp.json()["columns"][0]["tasks"]] == ["Loose", "New"]
+
+
+def test_board_skips_tasks_in_another_projects_section(client, db_session):
+    proj_id, section_ids = _seed_board(db_session)
+    workspace_id = db_session.get(models.Project, proj_id).workspace_id
+    other = models.Project(workspace_id=workspace_id, name="Other")
+    db_session.add(other)
+    db_session.flush()
+    foreign = models.Section(
+        project_id=other.id, name="Foreign", rank=ranking.key_between(None, None)
+    )
+    db_session.add(foreign)
+    db_session.flush()
+    # Written around the API, which refuses such a section
+    db_session.add(models.Task(project_id=proj_id, section_id=foreign.id, name="Stray"))
+    db_session.commit()
+
+    columns = client.get(f"/api/projects/{proj_id}/board").json()["columns"]
+    assert [c["section"] and c["section"]["id"] for c in columns] == [None, *section_ids]
+    assert [len(c["tasks"]) for c in columns] == [1, 2, 5, 1, 0]
@@ -0,0 +1,81 @@
+import subprocess
+import sys
+
+import pytest
+from alembic import command
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, inspect, select
+from sqlalchemy.orm import Session
+
+from app import models
+from app.bootstrap import SchemaOutOfDate, alembic_config, check_schema, init_db
+from app.config import Settings
+from app.main import app
+
+
+def test_importing_the_app_does_not_touch_the_database(tmp_path):
+    db_path = tmp_path / "untouched.db"
+    subprocess.run(
+        [sys.executable, "-c", "import app.main"],
+        check=True,
+        env={"DATABASE_URL": f"sqlite:///{db_path}", "PATH": ""},
+    )
+    assert not db_path.exists()
+
+
+def test_init_db_creates_schema_and_seeds_once(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'fresh.db'}")
+    config = Settings(asana_seed_workspace_name="Seeded")
+
+    init_db(engine, config)
+    init_db(engine, config)
+
+    assert {"tasks", "tasks_fts", "change_counters"} <= set(inspect(engine).get_table_names())
+    with Session(engine) as db:
+        assert db.scalar(select(func.count()).select_from(models.Workspace)) == 1
+        assert db.scalar(select(func.count()).select_from(models.Project)) == 1
+    # Stamped, so later migrations apply on top of it
+    check_schema(engine)
+
+
+def test_init_db_upgrades_databases_created_before_migrations(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'baseline.db'}")
+    with engine.begin() as conn:
+        command.upgrade(alembic_config(conn), "0001")
+        conn.exec_driver_sql("DROP TABLE alembic_version")
+    with pytest.raises(SchemaOutOfDate, match="revision is none"):
+        check_schema(engine)
+
+    init_db(engine, Settings())
+
+    check_schema(engine)
+    columns = {c["name"] for c in inspect(engine).get_columns("tasks")}
+    assert {"rank", "completed_at", "change_seq"} <= columns
+
+
+def test_lifespan_initializes_unless_disabled(db_session, monkeypatch):
+    from app import main
+
+    calls = []
+    monkeypatch.setattr(main, "init_db", lambda: calls.append("init"))
+    monkeypatch.setattr(main, "check_schema", lambda: calls.append("check"))
+
+    monkeypatch.setattr(main.settings, "init_db_on_startup", False)
+    with TestClient(app):
+        pass
+    assert calls == ["check"]
+
+    monkeypatch.setattr(main.settings, "init_db_on_startup", True)
+    with TestClient(app):
+        pass
+    assert calls == ["check", "init"]
+
+
+def test_startup_refuses_an_unmigrated_schema(db_session, monkeypatch):
+    from app import main
+
+    # The test schema comes from create_all and carries no revision
+    monkeypatch.setattr(main.settings, "init_db_on_startup", False)
+    with pytest.raises(SchemaOutOfDate):
+        with TestClient(app):
+            pass
@@ -0,0 +1,54 @@
+import asyncio
+import time
+
+from app.cache import VersionedCache
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def load_through(cache, key, scopes, value):
+    async def _load():
+        return value
+
+    return asyncio.run(cache.get_or_load(key, scopes, _load))
+
+
+def test_versioned_cache_lru_ttl_and_bump(monkeypatch):
+    cache = VersionedCache(max_entries=2, ttl_seconds=10)
+
+    assert load_through(cache, "a", ["ws:1"], 1) == 1
+    assert load_through(cache, "a", ["ws:1"], 2) == 1  # hit
+    cache.bump("ws:1")
+    assert load_through(cache, "a", ["ws:1"], 3) == 3  # new version, reloaded
+
+    load_through(cache, "b", [], "b")
+    load_through(cache, "c", [], "c")  # evicts the least recently used entry
+    assert cache.stats()["entries"] == 2
+    assert load_through(cache, "a", ["ws:1"], 4) == 4
+
+    now = time.monotonic()
+    monkeypatch.setattr("app.cache.time.monotonic", lambda: now + 11)
+    assert load_through(cache, "c", [], "fresh") == "fresh"  # expired
+    assert cache.stats()["hits"] == 1
+
+
+def test_home_and_projects_are_cached_until_a_write(client, db_session):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+
+    first = client.get("/api/home").json()
+    assert client.get("/api/home").json() == first
+    client.get("/api/projects")
+    client.get("/api/projects")
+    stats = client.get("/cache/stats").json()
+    assert (stats["hits"], stats["misses"]) == (2, 2)
+
+    client.post("/api/tasks", json={"name": "New mine", "project_id": proj.id, "assignee": "me"})
+    assert client.get("/api/home").json()["my_tasks"][0]["name"] == "New mine"
+
+    # Reassigning away from "me" invalidates the previous assignee's Home as well
+    client.patch(f"/api/tasks/{task1.id}", json={"assignee": "someone-else"})
+    names = [t["name"] for t in client.get("/api/home").json()["my_tasks"]]
+    assert names == ["New mine"]
+
+    created = client.post("/api/projects", json={"name": "Fresh", "workspace_id": 1}).json()
+    assert created["id"] in [p["id"] for p in client.get("/api/projects").json()]
@@ -0,0 +1,93 @@
+from sqlalchemy import event
+
+from app import crud, models
+from app.cli import main as cli_main
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_comments_update_the_task_summary(client, db_session):
+    _, proj, _, task1, task2 = seed_sample_data(db_session)
+    proj_id, task_id, other_id = proj.id, task1.id, task2.id
+
+    resp = client.post(f"/api/tasks/{task_id}/comments", json={"author": "me", "body": "First"})
+    assert resp.status_code == 201
+    assert resp.json()["task_id"] == task_id and resp.json()["body"] == "First"
+    long_body = "x" * (crud.COMMENT_PREVIEW_LENGTH + 10)
+    client.post(f"/api/tasks/{task_id}/comments", json={"author": "you", "body": long_body})
+
+    task = client.get(f"/api/tasks/{task_id}").json()
+    assert task["comment_count"] == 2 and task["last_comment_author"] == "you"
+    assert task["last_comment_preview"] == "x" * crud.COMMENT_PREVIEW_LENGTH
+    listed = {t["id"]: t for t in client.get(f"/api/projects/{proj_id}/tasks").json()}
+    assert listed[task_id]["comment_count"] == 2
+    assert listed[other_id]["comment_count"] == 0
+    assert listed[other_id]["last_comment_preview"] is None
+
+    comment = {"author": "a", "body": "b"}
+    assert client.post("/api/tasks/999/comments", json=comment).status_code == 404
+    assert client.post(f"/api/tasks/{task_id}/comments", json={"body": "b"}).status_code == 422
+
+
+def test_comment_pages_are_keyset_paginated(client, db_session):
+    _, _, _, task1, task2 = seed_sample_data(db_session)
+    task_id, other_id = task1.id, task2.id
+    items = [{"author": "me", "body": f"Comment {i}"} for i in range(5)]
+    client.post(f"/api/tasks/{other_id}/comments", json={"author": "me", "body": "Elsewhere"})
+
+    resp = client.post(f"/api/tasks/{task_id}/comments/batch", json={"items": items})
+    assert resp.status_code == 201
+    assert [c["body"] for c in resp.json()] == [item["body"] for item in items]
+
+    bodies, cursor = [], None
+    while True:
+        params = {"limit": 2, **({"cursor": cursor} if cursor else {})}
+        resp = client.get(f"/api/tasks/{task_id}/comments", params=params)
+        bodies += [c["body"] for c in resp.json()]
+        cursor = resp.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert bodies == [item["body"] for item in items]
+
+    task = client.get(f"/api/tasks/{task_id}").json()
+    assert task["comment_count"] == 5 and task["last_comment_preview"] == "Comment 4"
+    assert client.get("/api/tasks/999/comments").status_code == 404
+    assert client.get(f"/api/tasks/{task_id}/comments?cursor=bogus").status_code == 400
+    resp = client.post(f"/api/tasks/{task_id}/comments/batch", json={"items": []})
+    assert resp.status_code == 422
+
+
+def test_batch_comments_are_one_insert(client, db_session, app_engine):
+    _, _, _, task1, _ = seed_sample_data(db_session)
+    task_id = task1.id
+    items = [{"author": "me", "body": f"Comment {i}"} for i in range(50)]
+
+    inserts = []
+
+    def _record(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("INSERT INTO task_comments"):
+            inserts.append(statement)
+
+    event.listen(app_engine, "before_cursor_execute", _record)
+    try:
+        resp = client.post(f"/api/tasks/{task_id}/comments/batch", json={"items": items})
+    finally:
+        event.remove(app_engine, "before_cursor_execute", _record)
+    assert resp.status_code == 201 and len(resp.json()) == 50
+    assert len(inserts) == 1
+
+
+def test_refresh_comment_summaries_command(client, db_session):
+    _, _, _, task1, task2 = seed_sample_data(db_session)
+    task_id, other_id = task1.id, task2.id
+    # Written around crud, as an import would
+    db_session.add_all(
+        [models.TaskComment(task_id=task_id, author="me", body=f"Old {i}") for i in range(3)]
+    )
+    db_session.commit()
+    assert client.get(f"/api/tasks/{task_id}").json()["comment_count"] == 0
+
+    assert cli_main(["refresh-comment-summaries"]) == 0
+    task = client.get(f"/api/tasks/{task_id}").json()
+    assert task["comment_count"] == 3 and task["last_comment_preview"] == "Old 2"
+    assert client.get(f"/api/tasks/{other_id}").json()["comment_count"] == 0
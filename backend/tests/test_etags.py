@@ -0,0 +1,88 @@
+import pytest
+
+from app.query_plans import capture_statements
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def revalidate(client, url, etag):
+    return client.get(url, headers={"If-None-Match": etag})
+
+
+@pytest.mark.parametrize(
+    "path", ["/api/home", "/api/projects", "/api/projects/{id}/sections", "/api/projects/{id}/tasks"]
+)
+def test_conditional_get_returns_304(client, db_session, path):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    url = path.format(id=proj.id)
+
+    first = client.get(url)
+    assert first.status_code == 200
+    etag = first.headers["ETag"]
+    assert etag.startswith('"')
+
+    again = revalidate(client, url, etag)
+    assert again.status_code == 304
+    assert again.headers["ETag"] == etag
+    assert again.content == b""
+
+    assert revalidate(client, url, '"stale"').status_code == 200
+
+
+def test_task_list_304_reads_no_task_rows(client, db_session, app_engine):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    url = f"/api/projects/{proj.id}/tasks"
+    etag = client.get(url).headers["ETag"]
+
+    with capture_statements(app_engine) as statements:
+        assert revalidate(client, url, etag).status_code == 304
+    # The watermark, then the project's existence (cached for later requests)
+    assert [sql.split("FROM ")[1].split()[0] for sql, _ in statements] == [
+        "change_counters",
+        "projects",
+    ]
+    with capture_statements(app_engine) as statements:
+        assert revalidate(client, url, etag).status_code == 304
+    assert len(statements) == 1
+
+    # Any task write moves the watermark, and filtered views get their own ETags
+    client.patch(f"/api/tasks/{task1.id}", json={"status": "completed"})
+    changed = revalidate(client, url, etag)
+    assert changed.status_code == 200
+    assert changed.headers["ETag"] != etag
+    assert client.get(url, params={"status": "today"}).headers["ETag"] != changed.headers["ETag"]
+
+
+@pytest.mark.parametrize(
+    "path",
+    [
+        "/api/projects/999/sections",
+        "/api/projects/999/tasks",
+        "/api/projects/999/board",
+        "/api/projects/999/stats",
+    ],
+)
+def test_missing_project_is_404_whatever_the_etag(client, db_session, path):
+    seed_sample_data(db_session)
+
+    # An unknown project's scopes have versions too, so any ETag could match
+    assert revalidate(client, path, "*").status_code == 404
+
+
+def test_invalid_parameters_are_400_whatever_the_etag(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+
+    for path in ("tasks?cursor=bogus", "tasks?status=" + "x" * 65, "board?cursor=bogus"):
+        resp = revalidate(client, f"/api/projects/{proj.id}/{path}", "*")
+        assert resp.status_code in (400, 422)
+
+
+def test_home_etag_tracks_assignee_writes(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    etag = client.get("/api/home").headers["ETag"]
+
+    client.post("/api/tasks", json={"name": "Someone's", "project_id": proj.id, "assignee": "x"})
+    assert revalidate(client, "/api/home", etag).status_code == 304
+
+    client.post("/api/tasks", json={"name": "Mine", "project_id": proj.id, "assignee": "me"})
+    assert revalidate(client, "/api/home", etag).status_code == 200
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+from starlette.websockets import WebSocketDisconnect
+
+from app import schemas
+from app.api.live import sse_events
+from app.config import Settings
+from app.events import OVERFLOW, EventBackend, EventHub, InProcessBackend, hub, load_backend
+from app.watermarks import project_tasks_scope
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def _task(task_id: int = 1, project_id: int = 1) -> schemas.TaskRead:
+    return schemas.TaskRead(
+        id=task_id, project_id=project_id, name="T", created_at="2024-01-01T00:00:00"
+    )
+
+
+class NoPublishBackend(EventBackend):
+    def __init__(self, config: Settings):
+        pass
+
+
+def test_incomplete_backend_fails_when_loaded():
+    with pytest.raises(TypeError):
+        load_backend(Settings(events_backend="test_events:NoPublishBackend"))
+
+
+def test_websocket_feed_receives_task_writes(client, db_session):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    proj_id, task1_id = proj.id, task1.id
+
+    with client.websocket_connect(f"/api/projects/{proj_id}/events/ws") as ws:
+        client.post("/api/tasks", json={"name": "Live", "project_id": proj_id})
+        created = ws.receive_json()
+        assert created["type"] == "task.created"
+        assert created["data"]["name"] == "Live"
+
+        client.patch(f"/api/tasks/{task1_id}", json={"status": "completed"})
+        updated = ws.receive_json()
+        assert updated["type"] == "task.updated"
+        assert (updated["data"]["id"], updated["data"]["status"]) == (task1_id, "completed")
+
+    assert hub.subscriber_count() == 0
+
+
+def test_websocket_feed_rejects_unknown_project(client, db_session):
+    seed_sample_data(db_session)
+    with pytest.raises(WebSocketDisconnect):
+        with client.websocket_connect("/api/projects/999/events/ws") as ws:
+            ws.receive_json()
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_is_cut_off_with_overflow():
+    local = EventHub(InProcessBackend(), queue_size=2)
+    slow = local.subscribe("project:1:tasks")
+    other = local.subscribe("project:2:tasks")
+
+    for i in range(3):
+        local.publish(["project:1:tasks"], "task.updated", _task(i))
+    await asyncio.sleep(0)
+
+    assert await slow.get() is OVERFLOW
+    assert slow.closed
+    assert other.queue.empty()
+
+
+@pytest.mark.asyncio
+async def test_publish_from_worker_threads_reaches_subscribers_once():
+    local = EventHub(InProcessBackend(), queue_size=10)
+    subscription = local.subscribe("project:1:tasks", "assignee:me")
+
+    # crud publishes from the threadpool; one event addressed to both channels
+    await asyncio.to_thread(
+        local.publish, ["project:1:tasks", "assignee:me"], "task.created", _task()
+    )
+    event = await asyncio.wait_for(subscription.get(), 1)
+    assert json.loads(event.message)["data"]["id"] == 1
+    assert subscription.queue.empty()
+
+    local.unsubscribe(subscription)
+    assert local.subscriber_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_sse_stream_formats_events_and_stops_on_disconnect():
+    channel = project_tasks_scope(1)
+    disconnected = False
+
+    async def is_disconnected():
+        return disconnected
+
+    stream = sse_events([channel], is_disconnected, heartbeat_seconds=0.05)
+    assert await stream.__anext__() == "retry: 3000\n\n"
+
+    hub.publish([channel], "task.created", _task())
+    chunk = await stream.__anext__()
+    event_line, data_line, _, _ = chunk.split("\n")
+    assert event_line == "event: task.created"
+    assert json.loads(data_line.removeprefix("data: "))["data"]["id"] == 1
+
+    assert await stream.__anext__() == ": ping\n\n"
+    disconnected = True
+    with pytest.raises(StopAsyncIteration):
+        await stream.__anext__()
+    assert hub.subscriber_count() == 0
@@ -0,0 +1,89 @@
+import csv
+import io
+import json
+
+from app import crud, models
+from app.api import routes_workspaces
+from app.database import ReadSessionLocal
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_export_ndjson_streams_all_workspace_tasks(client, db_session, monkeypatch):
+    ws, proj, _, _, _ = seed_sample_data(db_session)
+    other_ws = models.Workspace(name="Other Workspace")
+    db_session.add(other_ws)
+    db_session.flush()
+    other_proj = models.Project(workspace_id=other_ws.id, name="Elsewhere")
+    db_session.add(other_proj)
+    db_session.flush()
+    db_session.add_all(models.Task(project_id=proj.id, name=f"Bulk {i}") for i in range(5))
+    db_session.add(models.Task(project_id=other_proj.id, name="Not exported"))
+    db_session.commit()
+    ws_id = ws.id
+
+    # Small chunks, so the export spans several keyset reads
+    monkeypatch.setattr(routes_workspaces, "EXPORT_CHUNK_SIZE", 2)
+    resp = client.get(f"/api/workspaces/{ws_id}/tasks/export")
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("application/x-ndjson")
+
+    rows = [json.loads(line) for line in resp.text.splitlines()]
+    assert len(rows) == 7
+    assert [r["id"] for r in rows] == sorted(r["id"] for r in rows)
+    assert "Not exported" not in {r["name"] for r in rows}
+    assert set(rows[0]) == set(crud.TASK_EXPORT_COLUMNS)
+
+
+def test_export_csv_honors_filters(client, db_session):
+    ws, proj, _, task1, _ = seed_sample_data(db_session)
+    ws_id, proj_id, task1_id = ws.id, proj.id, task1.id
+
+    resp = client.get(
+        f"/api/workspaces/{ws_id}/tasks/export",
+        params={"format": "csv", "project_id": proj_id, "status": "today", "assignee": "me"},
+    )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"].startswith("text/csv")
+
+    rows = list(csv.DictReader(io.StringIO(resp.text)))
+    assert [int(r["id"]) for r in rows] == [task1_id]
+    assert rows[0]["name"] == "Task 1"
+
+    # Dates and times are written as in the NDJSON export
+    resp = client.get(f"/api/workspaces/{ws_id}/tasks/export", params={"project_id": proj_id})
+    (exported,) = [
+        row for row in map(json.loads, resp.text.splitlines()) if row["id"] == task1_id
+    ]
+    for column in ("created_at", "due_date"):
+        assert rows[0][column] == exported[column]
+
+
+def test_export_empty_csv_has_header(client, db_session):
+    ws, _, _, _, _ = seed_sample_data(db_session)
+
+    resp = client.get(
+        f"/api/workspaces/{ws.id}/tasks/export", params={"format": "csv", "status": "none"}
+    )
+    assert resp.status_code == 200
+    assert resp.text.splitlines() == [",".join(crud.TASK_EXPORT_COLUMNS)]
+
+
+def test_export_unknown_workspace_or_foreign_project(client, db_session):
+    ws, _, _, _, _ = seed_sample_data(db_session)
+    ws_id = ws.id
+
+    assert client.get("/api/workspaces/999/tasks/export").status_code == 404
+    resp = client.get(f"/api/workspaces/{ws_id}/tasks/export", params={"project_id": 999})
+    assert resp.status_code == 404
+    resp = client.get(f"/api/workspaces/{ws_id}/tasks/export", params={"format": "xml"})
+    assert resp.status_code == 422
+
+
+def test_export_chunks_are_bounded(db_session):
+    ws, proj, _, _, _ = seed_sample_data(db_session)
+    db_session.add_all(models.Task(project_id=proj.id, name=f"Bulk {i}") for i in range(5))
+    db_session.commit()
+
+    chunks = list(crud.iter_workspace_task_chunks(ReadSessionLocal, ws.id, chunk_size=3))
+    assert [len(c) for c in chunks] == [3, 3, 1]
@@ -0,0 +1,57 @@
+from app.query_plans import capture_statements
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_task_list_returns_only_requested_fields(client, db_session, app_engine):
+    _, proj, _, task1, task2 = seed_sample_data(db_session)
+    proj_id, task_ids = proj.id, {task1.id, task2.id}
+
+    with capture_statements(app_engine) as selects:
+        resp = client.get(f"/api/projects/{proj_id}/tasks?fields=name,status")
+    assert resp.status_code == 200
+    # `id` is always included, in schema field order
+    assert [list(task) for task in resp.json()] == [["name", "status", "id"]] * 2
+    assert {task["id"] for task in resp.json()} == task_ids
+    listing = next(statement for statement, _ in selects if "FROM tasks" in statement)
+    assert "description" not in listing and "assignee" not in listing
+
+
+def test_sparse_task_pages_keep_their_cursor(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    proj_id = proj.id
+
+    first = client.get(f"/api/projects/{proj_id}/tasks?limit=1&fields=name")
+    cursor = first.headers["X-Next-Cursor"]
+    second = client.get(f"/api/projects/{proj_id}/tasks?limit=1&fields=name&cursor={cursor}")
+    assert list(second.json()[0]) == ["name", "id"]
+    assert second.json()[0]["id"] != first.json()[0]["id"]
+    assert "X-Next-Cursor" not in second.headers
+
+
+def test_project_routes_accept_fields(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    proj_id = proj.id
+
+    assert client.get("/api/projects?fields=name").json() == [{"name": "My Project", "id": proj_id}]
+    full = client.get("/api/projects").json()
+    assert set(full[0]) == {"name", "color", "icon", "id", "workspace_id", "is_archived"}
+
+    resp = client.get(f"/api/projects/{proj_id}?fields=color")
+    assert resp.json() == {"color": "#3a258e", "id": proj_id}
+    assert client.get(f"/api/projects/{proj_id}").json() == full[0]
+
+
+def test_task_detail_fields_and_unknown_fields(client, db_session):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    proj_id, task_id = proj.id, task1.id
+
+    resp = client.get(f"/api/tasks/{task_id}?fields=status,assignee")
+    assert resp.json() == {"status": "today", "assignee": "me", "id": task_id}
+    assert client.get(f"/api/tasks/{task_id}").json()["priority"] == "high"
+
+    resp = client.get(f"/api/projects/{proj_id}/tasks?fields=name,secret,workspace_id")
+    assert resp.status_code == 400
+    assert resp.json()["detail"].startswith("Unknown fields: secret, workspace_id;")
+    assert client.get(f"/api/tasks/{task_id}?fields=nope").status_code == 400
+    assert client.get("/api/tasks/999?fields=name").status_code == 404
@@ -57,6 +57,24 @@ def test_home_summary_my_tasks_and_recent_projects(client, db_session):
     assert any(t["project_name"] == "My Project" for t in data["my_tasks"])
 
 
+def test_home_summary_is_bounded_and_filters_by_assignee(client, db_session):
+    ws, proj, _, _, _ = seed_sample_data(db_session)
+    db_session.add_all(models.Project(workspace_id=ws.id, name=f"Extra {i}") for i in range(10))
+    db_session.add_all(
+        models.Task(project_id=proj.id, name=f"Mine {i}", assignee="me") for i in range(25)
+    )
+    db_session.commit()
+
+    data = client.get("/api/home").json()
+    assert len(data["recent_projects"]) == crud.HOME_RECENT_PROJECTS_LIMIT
+    assert len(data["my_tasks"]) == crud.HOME_MY_TASKS_LIMIT
+    assert data["my_tasks"][0]["name"] == "Mine 24"
+
+    other = client.get("/api/home", params={"assignee": "someone-else"}).json()
+    assert [t["name"] for t in other["my_tasks"]] == ["Task 2"]
+    assert other["my_tasks"][0]["project_name"] == "My Project"
+
+
 @pytest.mark.parametrize(
     "status_param, expected_code",
     [
@@ -93,8 +111,8 @@ def test_project_tasks_assignee_variants(client, db_session, assignee_param):
     assert resp.status_code == 200
 
 
-def test_get_and_update_task_edge_cases(client, db_session):
-    _, proj, _, task1, _ = seed_sample_data(db_session)
+def test_get_and_update_task_edge_cases(client, db_session, write_coalescing):
+    ws, proj, inbox, task1, _ = seed_sample_data(db_session)
 
     # Get existing
     resp = client.get(f"/api/tasks/{task1.id}")
@@ -117,6 +135,22 @@ def test_get_and_update_task_edge_cases(client, db_session):
     assert body["name"].startswith("Updated")
     assert body["status"] == "completed"
 
+    assert client.patch("/api/tasks/9999", json={"name": "x"}).status_code == 404
+
+    # Sections must belong to the task's project; leaving every section is fine
+    other = models.Project(workspace_id=ws.id, name="Other")
+    db_session.add(other)
+    db_session.flush()
+    foreign = models.Section(project_id=other.id, name="Foreign")
+    db_session.add(foreign)
+    db_session.commit()
+    resp = client.patch(f"/api/tasks/{task1.id}", json={"section_id": foreign.id})
+    assert resp.status_code == 400 and resp.json()["detail"] == "Invalid section_id"
+    resp = client.patch(f"/api/tasks/{task1.id}", json={"section_id": None})
+    assert resp.status_code == 200 and resp.json()["section_id"] is None
+    resp = client.patch(f"/api/tasks/{task1.id}", json={"section_id": inbox.id})
+    assert resp.status_code == 200 and resp.json()["section_id"] == inbox.id
+
 
 def test_create_project_invalid_workspace(client, db_session):
     body = {"name": "No Workspace Project", "workspace_id": 9999}
@@ -0,0 +1,61 @@
+from fastapi.testclient import TestClient
+
+from app import lookups, models
+from app.api.instrumentation import QUERY_COUNT_HEADER, InstrumentationMiddleware
+from app.main import app
+from app.query_plans import capture_statements
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def _counted():
+    return TestClient(InstrumentationMiddleware(app, record_metrics=False, query_count=True))
+
+
+def test_create_task_validation_is_cached(client, db_session, write_coalescing):
+    _, proj, inbox, _, _ = seed_sample_data(db_session)
+    proj_id, inbox_id = proj.id, inbox.id
+    payload = {"project_id": proj_id, "section_id": inbox_id, "name": "Cached"}
+
+    first = _counted().post("/api/tasks", json=payload)
+    second = _counted().post("/api/tasks", json=payload)
+    assert first.status_code == second.status_code == 201
+    # The project and section lookups only run for the first request (coalesced
+    # writes look both up in one round trip)
+    saved = int(first.headers[QUERY_COUNT_HEADER]) - int(second.headers[QUERY_COUNT_HEADER])
+    assert saved == (1 if write_coalescing else 2)
+
+    resp = client.post("/api/tasks", json={**payload, "project_id": 999})
+    assert resp.status_code == 404
+    resp = client.post("/api/tasks", json={**payload, "section_id": 999})
+    assert resp.status_code == 400
+
+
+def test_missing_ids_are_not_cached_across_requests(client, db_session):
+    ws, _, _, _, _ = seed_sample_data(db_session)
+    ws_id = ws.id
+    assert client.get("/api/projects/2/tasks").status_code == 404
+
+    created = client.post("/api/projects", json={"workspace_id": ws_id, "name": "Later"})
+    assert created.json()["id"] == 2
+    assert client.get("/api/projects/2/tasks").status_code == 200
+    assert client.get("/api/projects/2/sections").json() == []
+
+
+def test_orm_updates_and_deletes_evict(db_session, engine):
+    _, proj, inbox, _, _ = seed_sample_data(db_session)
+    assert lookups.section_project_id(db_session, inbox.id) == proj.id
+    db_session.commit()
+
+    other = models.Project(workspace_id=proj.workspace_id, name="Other")
+    db_session.add(other)
+    db_session.flush()
+    inbox.project_id = other.id
+    db_session.commit()
+    assert lookups.section_project_id(db_session, inbox.id) == other.id
+
+    db_session.delete(inbox)
+    db_session.commit()
+    with capture_statements(engine) as selects:
+        assert lookups.section_project_id(db_session, inbox.id) is None
+    assert len(selects) == 1
@@ -0,0 +1,81 @@
+import logging
+
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from fastapi.testclient import TestClient
+
+from app import metrics
+from app.api.instrumentation import (
+    QUERY_COUNT_HEADER,
+    SERVER_TIMING_HEADER,
+    InstrumentationMiddleware,
+)
+from app.main import app
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_server_timing_and_query_count_headers(client, db_session):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    proj_id, task1_id = proj.id, task1.id
+    counted = TestClient(InstrumentationMiddleware(app, record_metrics=False, query_count=True))
+
+    # Watermark read and task page
+    resp = counted.get(f"/api/projects/{proj_id}/tasks")
+    assert resp.headers[QUERY_COUNT_HEADER] == "2"
+    assert resp.headers[SERVER_TIMING_HEADER].startswith("db;dur=")
+    assert 'desc="2 queries"' in resp.headers[SERVER_TIMING_HEADER]
+    assert counted.get(f"/api/tasks/{task1_id}").headers[QUERY_COUNT_HEADER] == "1"
+
+    # The app's own middleware has the Server-Timing header but no query count
+    resp = client.get(f"/api/tasks/{task1_id}")
+    assert SERVER_TIMING_HEADER in resp.headers
+    assert QUERY_COUNT_HEADER not in resp.headers
+
+
+def test_metrics_are_recorded_per_route_template(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    proj_id = proj.id
+    metrics.request_metrics.clear()
+
+    client.get(f"/api/projects/{proj_id}/tasks")
+    client.get(f"/api/projects/{proj_id}/tasks")
+    client.get("/api/projects/999/tasks")
+    client.get("/no/such/path")
+
+    body = client.get("/metrics").text
+    route = 'method="GET",route="/api/projects/{project_id}/tasks"'
+    assert f'http_requests_total{{{route},status="200"}} 2' in body
+    assert f'http_requests_total{{{route},status="404"}} 1' in body
+    assert f'http_request_duration_seconds_count{{{route}}} 3' in body
+    assert f'http_request_duration_seconds_bucket{{{route},le="+Inf"}} 3' in body
+    # 2 statements per listing, plus the existence check for the empty unknown project
+    assert f"http_request_sql_statements_total{{{route}}} 7" in body
+    assert 'route="unmatched",status="404"' in body
+    assert "query_cache_hits_total" in body
+
+
+def test_slow_query_log_includes_plan(client, db_session, caplog):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    proj_id = proj.id
+
+    metrics.install_sql_hooks(slow_query_ms=1e-6)
+    try:
+        with caplog.at_level(logging.WARNING, logger="app.slow_queries"):
+            client.get(f"/api/projects/{proj_id}/tasks")
+    finally:
+        metrics.install_sql_hooks(slow_query_ms=0)
+
+    listing = [r.getMessage() for r in caplog.records if "FROM tasks" in r.getMessage()]
+    assert listing
+    assert "ix_tasks_project_created" in listing[0]
+
+
+def test_failed_statements_leave_no_timing_state(engine):
+    with engine.connect() as conn, metrics.track_queries() as stats:
+        with pytest.raises(OperationalError):
+            conn.exec_driver_sql("SELECT * FROM no_such_table")
+        conn.exec_driver_sql("SELECT 1")
+        assert stats.statements == 1
+        assert not any("metrics" in str(key) for key in conn.info)
@@ -0,0 +1,50 @@
+from alembic import command
+from alembic.autogenerate import compare_metadata
+from alembic.config import Config
+from alembic.migration import MigrationContext
+from sqlalchemy import create_engine
+
+from app.config import Settings
+from app.database import Base
+from app.search import is_search_table
+
+
+def test_migration_chain_matches_models(tmp_path, monkeypatch):
+    url = f"sqlite:///{tmp_path / 'migrated.db'}"
+    monkeypatch.setattr("app.config.get_settings", lambda: Settings(database_url=url))
+
+    command.upgrade(Config("alembic.ini"), "head")
+
+    engine = create_engine(url)
+    with engine.connect() as conn:
+        context = MigrationContext.configure(
+            conn,
+            opts={
+                "include_name": lambda name, type_, _: not (
+                    type_ == "table" and is_search_table(name)
+                )
+            },
+        )
+        diff = compare_metadata(context, Base.metadata)
+        assert diff == []
+
+        # Triggers keep the search index in sync with the migrated tasks table
+        triggers = conn.exec_driver_sql(
+            "SELECT name FROM sqlite_master WHERE type = 'trigger'"
+        ).scalars()
+        assert set(triggers) == {"tasks_fts_ai", "tasks_fts_ad", "tasks_fts_au"}
+        migrated_search = _search_schema(conn)
+
+    # Migrations carry their own copy of the search DDL; it must still match the app's
+    created = create_engine(f"sqlite:///{tmp_path / 'created.db'}")
+    Base.metadata.create_all(created)
+    with created.connect() as conn:
+        assert migrated_search == _search_schema(conn)
+
+
+def _search_schema(conn) -> dict:
+    objects = conn.exec_driver_sql(
+        "SELECT name, sql FROM sqlite_master WHERE name LIKE 'tasks_fts%' AND sql IS NOT NULL"
+    ).all()
+    config = conn.exec_driver_sql("SELECT k, v FROM tasks_fts_config").all()
+    return {"objects": {name: " ".join(sql.split()) for name, sql in objects}, "config": config}
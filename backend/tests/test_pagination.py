@@ -0,0 +1,71 @@
+from app import models
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def collect_pages(client, url, params=None):
+    params = dict(params or {})
+    ids, pages = [], 0
+    while True:
+        resp = client.get(url, params=params)
+        assert resp.status_code == 200
+        ids.extend(item["id"] for item in resp.json())
+        pages += 1
+        cursor = resp.headers.get("X-Next-Cursor")
+        if not cursor:
+            return ids, pages
+        params["cursor"] = cursor
+
+
+def test_project_tasks_keyset_pages_cover_all_rows(client, db_session):
+    _, proj, inbox, _, _ = seed_sample_data(db_session)
+    db_session.add_all(
+        models.Task(project_id=proj.id, section_id=inbox.id, name=f"Bulk {i}") for i in range(7)
+    )
+    db_session.commit()
+
+    ids, pages = collect_pages(client, f"/api/projects/{proj.id}/tasks", {"limit": 2})
+    assert pages == 5
+    assert len(ids) == len(set(ids)) == 9
+
+    unpaged = client.get(f"/api/projects/{proj.id}/tasks").json()
+    assert [t["id"] for t in unpaged] == ids
+
+
+def test_project_tasks_pages_are_stable_under_inserts(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    db_session.add_all(models.Task(project_id=proj.id, name=f"Bulk {i}") for i in range(4))
+    db_session.commit()
+
+    first = client.get(f"/api/projects/{proj.id}/tasks", params={"limit": 3})
+    seen = [t["id"] for t in first.json()]
+
+    # A task created between page loads sorts ahead of the cursor and must not shift pages
+    client.post("/api/tasks", json={"name": "Late arrival", "project_id": proj.id})
+
+    rest, _ = collect_pages(
+        client,
+        f"/api/projects/{proj.id}/tasks",
+        {"limit": 3, "cursor": first.headers["X-Next-Cursor"]},
+    )
+    assert len(seen + rest) == len(set(seen + rest)) == 6
+
+
+def test_projects_keyset_pagination(client, db_session):
+    ws, _, _, _, _ = seed_sample_data(db_session)
+    db_session.add_all(models.Project(workspace_id=ws.id, name=f"P{i}") for i in range(4))
+    db_session.commit()
+
+    ids, pages = collect_pages(client, "/api/projects", {"limit": 2, "workspace_id": ws.id})
+    assert pages == 3
+    assert len(ids) == len(set(ids)) == 5
+
+
+def test_invalid_cursor_and_limit(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+
+    resp = client.get(f"/api/projects/{proj.id}/tasks", params={"cursor": "not-a-cursor"})
+    assert resp.status_code == 400
+
+    resp = client.get("/api/projects", params={"limit": 0})
+    assert resp.status_code == 422
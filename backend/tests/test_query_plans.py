@@ -0,0 +1,65 @@
+import pytest
+
+from app import models
+from app.pagination import encode_sequence_cursor
+from app.query_plans import capture_statements, explain_query_plan, plan_problems
+
+from test_home_projects_tasks import seed_sample_data
+
+
+@pytest.mark.parametrize(
+    "path, params",
+    [
+        ("/api/home", {}),
+        ("/api/projects", {}),
+        ("/api/projects", {"workspace_id": 1}),
+        ("/api/projects/{project_id}/tasks", {}),
+        ("/api/projects/{project_id}/tasks", {"status": "today"}),
+        ("/api/projects/{project_id}/tasks", {"limit": 1}),
+        ("/api/projects/{project_id}/tasks", {"limit": 1, "fields": "name,status"}),
+        ("/api/projects", {"include_archived": "true", "limit": 1}),
+        ("/api/projects", {"include_archived": "true", "workspace_id": 1}),
+        ("/api/projects/{project_id}/tasks", {"include_archived": "true", "limit": 1}),
+        ("/api/projects/{project_id}/stats", {}),
+        ("/api/tasks/{task_id}/comments", {"limit": 1}),
+        ("/api/search/tasks", {"q": "task"}),
+        ("/api/search/tasks", {"q": "task", "project_id": 1, "assignee": "me"}),
+        ("/api/sync", {"since": encode_sequence_cursor(0)}),
+        ("/api/sync", {"since": encode_sequence_cursor(0), "workspace_id": 1}),
+    ],
+)
+def test_hot_endpoints_use_indexes(client, db_session, engine, app_engine, path, params):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    db_session.add_all(
+        [models.TaskComment(task_id=task1.id, author="me", body=body) for body in ("A", "B")]
+    )
+    db_session.commit()
+    url = path.format(project_id=proj.id, task_id=task1.id)
+
+    # Follow one cursor too, so the keyset predicate is checked as well
+    with capture_statements(app_engine) as statements:
+        resp = client.get(url, params=params)
+        assert resp.status_code == 200
+        if "X-Next-Cursor" in resp.headers:
+            client.get(url, params={**params, "cursor": resp.headers["X-Next-Cursor"]})
+
+    assert statements
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = explain_query_plan(conn, statement, parameters)
+            assert not plan_problems(plan), f"{statement}\n{plan}"
+
+
+def test_board_ranks_tasks_without_sorting_them(client, db_session, engine, app_engine):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+
+    with capture_statements(app_engine) as statements:
+        assert client.get(f"/api/projects/{proj.id}/board").status_code == 200
+
+    with engine.connect() as conn:
+        lines = [line for s in statements for line in explain_query_plan(conn, *s)]
+    # The window reads the index in column order; only the capped rows it keeps are
+    # sorted into board order afterwards
+    assert any("COVERING INDEX ix_tasks_project_section_rank" in line for line in lines)
+    assert not [line for line in lines if line.startswith(("SCAN tasks", "SCAN sections"))]
+    assert not [line for line in lines if "RIGHT PART OF ORDER BY" in line]
@@ -0,0 +1,151 @@
+import random
+
+import pytest
+
+from app import models, ranking, task_counts
+from app.cli import main as cli_main
+from app.query_plans import capture_statements
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_keys_between_stay_ordered_and_short():
+    keys: list[str] = []
+    rng = random.Random(7)
+    for _ in range(2000):
+        position = rng.randint(0, len(keys))
+        before = keys[position - 1] if position else None
+        after = keys[position] if position < len(keys) else None
+        key = ranking.key_between(before, after)
+        assert (before is None or before < key) and (after is None or key < after)
+        assert ranking.is_valid(key)
+        keys.insert(position, key)
+    assert max(map(len, keys)) < 12
+
+    # Appending and prepending only grow the integer part
+    spread = list(ranking.spread(10_000))
+    assert spread == sorted(spread) and max(map(len, spread)) <= 4
+    many = ranking.keys_between("a0", "a1", 1000)
+    assert many == sorted(many) and all("a0" < key < "a1" for key in many)
+
+    with pytest.raises(ranking.InvalidRank):
+        ranking.key_between("a1", "a0")
+    assert not ranking.is_valid("") and not ranking.is_valid("a10")
+
+
+def _seed_column(db, count: int):
+    _, proj, inbox, task1, task2 = seed_sample_data(db)
+    other = models.Section(project_id=proj.id, name="Other")
+    db.add(other)
+    db.delete(task1)
+    db.delete(task2)
+    tasks = [
+        models.Task(project_id=proj.id, section_id=inbox.id, name=f"T{i}", rank=rank)
+        for i, rank in enumerate(ranking.spread(count))
+    ]
+    db.add_all(tasks)
+    db.flush()
+    task_counts.reconcile(db)
+    db.commit()
+    return proj.id, inbox.id, other.id, [task.id for task in tasks]
+
+
+def _names(client, project_id: int, section_id: int | None) -> list[str]:
+    columns = client.get(f"/api/projects/{project_id}/board").json()["columns"]
+    column = next(c for c in columns if (c["section"] or {}).get("id") == section_id)
+    return [task["name"] for task in column["tasks"]]
+
+
+def test_move_task_writes_one_row(client, db_session, app_engine):
+    proj_id, inbox_id, other_id, ids = _seed_column(db_session, 4)
+
+    with capture_statements(app_engine) as selects:
+        resp = client.post(f"/api/tasks/{ids[3]}/move", json={"after_id": ids[0]})
+    assert resp.status_code == 200
+    assert resp.json()["id"] == ids[3] and resp.json()["section_id"] == inbox_id
+    assert _names(client, proj_id, inbox_id) == ["T0", "T3", "T1", "T2"]
+    # Lookups by id plus one for the anchor's successor; siblings are never scanned
+    reads = [s for s, _ in selects if "FROM tasks" in s]
+    assert all("WHERE tasks.id = ?" in s or "LIMIT" in s for s in reads)
+    db_session.expire_all()
+    ranks = [db_session.get(models.Task, task_id).rank for task_id in ids]
+    assert ranks[:3] == list(ranking.spread(3)) and ranks[0] < ranks[3] < ranks[1]
+
+    resp = client.post(f"/api/tasks/{ids[0]}/move", json={"before_id": ids[2]})
+    assert _names(client, proj_id, inbox_id) == ["T3", "T1", "T0", "T2"]
+    client.post(f"/api/tasks/{ids[1]}/move", json={})
+    assert _names(client, proj_id, inbox_id) == ["T3", "T0", "T2", "T1"]
+
+    # Into another section, then next to a task there
+    resp = client.post(f"/api/tasks/{ids[2]}/move", json={"section_id": other_id})
+    assert resp.json()["section_id"] == other_id
+    client.post(f"/api/tasks/{ids[3]}/move", json={"before_id": ids[2]})
+    assert _names(client, proj_id, other_id) == ["T3", "T2"]
+    assert _names(client, proj_id, inbox_id) == ["T0", "T1"]
+    stats = client.get(f"/api/projects/{proj_id}/stats").json()
+    assert {s["section_id"]: s["total"] for s in stats["sections"]} == {inbox_id: 2, other_id: 2}
+
+
+def test_move_validation(client, db_session):
+    _, _, other_id, ids = _seed_column(db_session, 2)
+
+    assert client.post("/api/tasks/999/move", json={}).status_code == 404
+    move = {"after_id": ids[1], "before_id": ids[1]}
+    assert client.post(f"/api/tasks/{ids[0]}/move", json=move).status_code == 422
+    for move in ({"after_id": 999}, {"after_id": ids[0]}, {"section_id": 999}):
+        assert client.post(f"/api/tasks/{ids[0]}/move", json=move).status_code == 400
+    move = {"after_id": ids[1], "section_id": other_id}
+    assert client.post(f"/api/tasks/{ids[0]}/move", json=move).status_code == 400
+
+
+def test_moves_next_to_unranked_rows_respace_them_first(client, db_session):
+    _, proj, inbox, task1, task2 = seed_sample_data(db_session)
+    proj_id, inbox_id, task1_id, task2_id = proj.id, inbox.id, task1.id, task2.id
+    assert task1.rank == task2.rank == ""
+
+    resp = client.post(f"/api/tasks/{task2_id}/move", json={"before_id": task1_id})
+    assert resp.status_code == 200
+    assert _names(client, proj_id, inbox_id) == ["Task 2", "Task 1"]
+    db_session.expire_all()
+    assert ranking.is_valid(db_session.get(models.Task, task1_id).rank)
+
+
+def test_long_ranks_are_rebalanced_in_the_background(client, db_session, monkeypatch):
+    proj_id, inbox_id, _, ids = _seed_column(db_session, 3)
+    monkeypatch.setattr("app.api.routes_tasks.get_settings", lambda: _Limit(6))
+
+    # Squeezing into the same gap lengthens the key until a rebalance respaces all
+    for _ in range(40):
+        resp = client.post(f"/api/tasks/{ids[2]}/move", json={"after_id": ids[0]})
+        client.post(f"/api/tasks/{ids[1]}/move", json={"before_id": ids[2]})
+    assert len(resp.json()["rank"]) <= 7
+    assert _names(client, proj_id, inbox_id) == ["T0", "T1", "T2"]
+
+
+class _Limit:
+    def __init__(self, rank_rebalance_length: int):
+        self.rank_rebalance_length = rank_rebalance_length
+
+
+def test_move_section_and_rebalance_command(client, db_session):
+    _, proj, inbox, _, _ = seed_sample_data(db_session)
+    later = models.Section(project_id=proj.id, name="Later")
+    db_session.add(later)
+    db_session.commit()
+    proj_id, inbox_id, later_id = proj.id, inbox.id, later.id
+
+    resp = client.post(
+        f"/api/projects/{proj_id}/sections/{later_id}/move", json={"before_id": inbox_id}
+    )
+    assert resp.status_code == 200
+    names = [s["name"] for s in client.get(f"/api/projects/{proj_id}/sections").json()]
+    assert names == ["Later", "Inbox"]
+    resp = client.post(f"/api/projects/{proj_id + 1}/sections/{later_id}/move", json={})
+    assert resp.status_code == 404
+
+    # The seeded tasks were never ranked
+    assert cli_main(["rebalance-ranks"]) == 0
+    db_session.expire_all()
+    ranks = [task.rank for task in db_session.query(models.Task).order_by(models.Task.id)]
+    assert ranks == list(ranking.spread(2))
+    assert [s["name"] for s in client.get(f"/api/projects/{proj_id}/sections").json()] == names
@@ -0,0 +1,28 @@
+import json
+
+from fastapi.encoders import jsonable_encoder
+
+from app import crud, schemas
+from app.api.responses import dump_row, dump_rows
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_row_bodies_match_response_model_encoding(client, db_session):
+    _, proj, _, task1, task2 = seed_sample_data(db_session)
+    expected = jsonable_encoder([schemas.TaskRead.model_validate(t) for t in (task1, task2)])
+
+    # Core rows from the read path encode like the response model, without validation
+    rows = sorted(crud.list_tasks(db_session, project_id=proj.id), key=lambda r: r.id)
+    assert json.loads(dump_rows(rows, schemas.TaskRead)) == expected
+    assert json.loads(dump_row(rows[0], schemas.TaskRead)) == expected[0]
+    fields = ("id", "due_date")
+    sparse = crud.list_tasks(db_session, project_id=proj.id, fields=fields)
+    body = json.loads(dump_rows(sparse, schemas.TaskRead, fields))
+    assert sorted(body, key=lambda t: t["id"]) == [{f: t[f] for f in fields} for t in expected]
+
+    resp = client.get(f"/api/projects/{proj.id}/tasks")
+    assert resp.headers["content-type"] == "application/json"
+    assert sorted(resp.json(), key=lambda t: t["id"]) == expected
+    resp = client.get(f"/api/tasks/{task1.id}")
+    assert resp.json() == expected[0]
@@ -0,0 +1,91 @@
+from app import models
+from app.cli import main as cli_main
+from app.database import engine
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def search(client, q, **params):
+    resp = client.get("/api/search/tasks", params={"q": q, **params})
+    assert resp.status_code == 200
+    return resp
+
+
+def test_search_ranks_name_matches_and_matches_prefixes(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    db_session.add_all(
+        [
+            models.Task(project_id=proj.id, name="Budget review", description="quarterly"),
+            models.Task(project_id=proj.id, name="Quarterly planning"),
+            models.Task(project_id=proj.id, name="Lunch", description="nothing to see"),
+        ]
+    )
+    db_session.commit()
+
+    names = [t["name"] for t in search(client, "quart").json()]
+    assert names == ["Quarterly planning", "Budget review"]
+
+    # Every word has to match; FTS5 syntax in the input is treated as plain words
+    assert [t["name"] for t in search(client, "budg quart").json()] == ["Budget review"]
+    assert search(client, 'lunch" OR NEAR(').json() == []
+    assert search(client, "***").json() == []
+
+
+def test_search_follows_writes_through_the_api(client, db_session):
+    _, proj, _, task1, _ = seed_sample_data(db_session)
+    proj_id, task1_id = proj.id, task1.id
+
+    client.post("/api/tasks", json={"name": "Draft proposal", "project_id": proj_id})
+    assert [t["name"] for t in search(client, "propos").json()] == ["Draft proposal"]
+
+    client.patch(f"/api/tasks/{task1_id}", json={"name": "Renamed milestone"})
+    assert [t["id"] for t in search(client, "milestone").json()] == [task1_id]
+    assert task1_id not in {t["id"] for t in search(client, "task").json()}
+
+    client.post(
+        "/api/tasks/batch",
+        json={"items": [{"name": f"Bulk proposal {i}", "project_id": proj_id} for i in range(3)]},
+    )
+    assert len(search(client, "proposal").json()) == 4
+
+
+def test_search_filters_and_pagination(client, db_session):
+    ws, proj, _, _, _ = seed_sample_data(db_session)
+    other = models.Project(workspace_id=ws.id, name="Other")
+    db_session.add(other)
+    db_session.flush()
+    db_session.add_all(
+        models.Task(project_id=proj.id, name=f"Report {i}", assignee="me") for i in range(5)
+    )
+    db_session.add(models.Task(project_id=other.id, name="Report elsewhere", assignee="me"))
+    db_session.add(models.Task(project_id=proj.id, name="Report for someone", assignee="bob"))
+    db_session.commit()
+    proj_id = proj.id
+
+    first = search(client, "report", project_id=proj_id, assignee="me", limit=3)
+    second = search(
+        client,
+        "report",
+        project_id=proj_id,
+        assignee="me",
+        limit=3,
+        cursor=first.headers["X-Next-Cursor"],
+    )
+    assert "X-Next-Cursor" not in second.headers
+    ids = [t["id"] for t in first.json() + second.json()]
+    assert len(ids) == len(set(ids)) == 5
+
+    resp = client.get("/api/search/tasks", params={"q": "report", "cursor": "nope"})
+    assert resp.status_code == 400
+    assert client.get("/api/search/tasks", params={"q": ""}).status_code == 422
+
+
+def test_rebuild_command_indexes_existing_tasks(client, db_session):
+    seed_sample_data(db_session)
+    with engine.begin() as conn:
+        # Simulate a database whose index predates these rows
+        conn.exec_driver_sql("INSERT INTO tasks_fts(tasks_fts) VALUES ('delete-all')")
+    assert search(client, "task").json() == []
+
+    assert cli_main(["rebuild-search-index"]) == 0
+    assert len(search(client, "task").json()) == 2
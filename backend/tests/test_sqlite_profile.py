@@ -0,0 +1,60 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session
+
+from app import crud, models, schemas
+from app.config import Settings
+from app.database import Base, build_engine
+
+
+@pytest.fixture()
+def production_settings(tmp_path):
+    return Settings(
+        database_url=f"sqlite:///{tmp_path / 'prod.db'}",
+        sqlite_profile="production",
+        sqlite_busy_timeout_ms=10000,
+    )
+
+
+def test_production_pragmas_and_read_only_pool(production_settings):
+    engine = build_engine(production_settings)
+    read_engine = build_engine(production_settings, read_only=True)
+    Base.metadata.create_all(engine)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA journal_mode").scalar() == "wal"
+        assert conn.exec_driver_sql("PRAGMA synchronous").scalar() == 1  # NORMAL
+        assert conn.exec_driver_sql("PRAGMA busy_timeout").scalar() == 10000
+        assert conn.exec_driver_sql("PRAGMA temp_store").scalar() == 2  # MEMORY
+    assert engine.pool.size() == production_settings.db_pool_size
+
+    with read_engine.connect() as conn:
+        assert conn.exec_driver_sql("PRAGMA query_only").scalar() == 1
+        with pytest.raises(OperationalError):
+            conn.execute(text("INSERT INTO workspaces (name) VALUES ('nope')"))
+
+
+def test_concurrent_writers_do_not_hit_database_locked(production_settings):
+    engine = build_engine(production_settings)
+    Base.metadata.create_all(engine)
+    with Session(engine) as db:
+        ws = crud.get_or_create_default_workspace(db, "Concurrent")
+        project = crud.create_project(db, schemas.ProjectCreate(name="P", workspace_id=ws.id))
+        task_ids = [
+            crud.create_task(db, schemas.TaskCreate(name=f"T{i}", project_id=project.id)).id
+            for i in range(4)
+        ]
+
+    def patch(i: int) -> None:
+        with Session(engine) as db:
+            task = crud.get_task(db, task_ids[i % len(task_ids)])
+            crud.update_task(db, task, schemas.TaskUpdate(status=f"s{i}"))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(patch, range(80)))
+
+    with Session(engine) as db:
+        assert db.query(models.Task).filter(models.Task.status.like("s%")).count() == 4
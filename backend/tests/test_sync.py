@@ -0,0 +1,77 @@
+from datetime import datetime, timedelta
+
+from app import crud, models
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_first_sync_resets_then_returns_deltas(client, db_session):
+    ws, proj, _, task1, task2 = seed_sample_data(db_session)
+    ws_id, proj_id, task1_id, task2_id = ws.id, proj.id, task1.id, task2.id
+
+    first = client.get("/api/sync").json()
+    assert first["reset"] is True
+    assert first["tasks"] == []
+
+    resp = client.get("/api/sync", params={"since": first["cursor"]})
+    assert resp.status_code == 200
+    assert resp.json()["reset"] is False
+    assert resp.json()["tasks"] == []
+    assert resp.json()["cursor"] == first["cursor"]
+
+    created = client.post("/api/tasks", json={"project_id": proj_id, "name": "New"}).json()
+    client.patch(f"/api/tasks/{task1_id}", json={"status": "completed"})
+    assert client.delete(f"/api/tasks/{task2_id}").status_code == 204
+
+    delta = client.get("/api/sync", params={"since": first["cursor"]}).json()
+    assert delta["reset"] is False
+    assert [t["id"] for t in delta["tasks"]] == [created["id"], task1_id]
+    assert delta["tasks"][1]["status"] == "completed"
+    assert delta["deleted_tasks"] == [task2_id]
+
+    # Scoped to a workspace, and empty again from the new cursor
+    other = client.get("/api/sync", params={"since": first["cursor"], "workspace_id": 999})
+    assert other.json()["tasks"] == [] and other.json()["deleted_tasks"] == []
+    scoped = client.get("/api/sync", params={"since": first["cursor"], "workspace_id": ws_id})
+    assert len(scoped.json()["tasks"]) == 2
+    again = client.get("/api/sync", params={"since": delta["cursor"]}).json()
+    assert again["tasks"] == [] and again["deleted_tasks"] == []
+
+
+def test_batch_writes_and_new_projects_are_synced(client, db_session):
+    ws, proj, _, task1, task2 = seed_sample_data(db_session)
+    ws_id, proj_id, task1_id, task2_id = ws.id, proj.id, task1.id, task2.id
+    cursor = client.get("/api/sync").json()["cursor"]
+
+    client.post("/api/projects", json={"workspace_id": ws_id, "name": "Synced"})
+    client.post("/api/tasks/batch", json={"items": [{"project_id": proj_id, "name": "B"}]})
+    client.patch("/api/tasks/batch", json={"items": [{"id": task1_id, "name": "Renamed"}]})
+
+    delta = client.get("/api/sync", params={"since": cursor}).json()
+    assert [p["name"] for p in delta["projects"]] == ["Synced"]
+    assert {t["name"] for t in delta["tasks"]} == {"B", "Renamed"}
+    assert task2_id not in {t["id"] for t in delta["tasks"]}
+
+
+def test_too_many_changes_or_pruned_tombstones_reset(client, db_session, monkeypatch):
+    _, proj, _, task1, task2 = seed_sample_data(db_session)
+    proj_id, task1_id, task2_id = proj.id, task1.id, task2.id
+    cursor = client.get("/api/sync").json()["cursor"]
+
+    client.post("/api/tasks/batch", json={"items": [{"project_id": proj_id, "name": "X"}] * 3})
+    monkeypatch.setattr(crud, "SYNC_MAX_CHANGES", 2)
+    assert client.get("/api/sync", params={"since": cursor}).json()["reset"] is True
+    monkeypatch.undo()
+
+    client.delete(f"/api/tasks/{task1_id}")
+    client.delete(f"/api/tasks/{task2_id}")
+    assert crud.prune_tombstones(db_session, datetime.utcnow() + timedelta(seconds=1)) == 2
+    assert db_session.query(models.Tombstone).count() == 0
+    assert client.get("/api/sync", params={"since": cursor}).json()["reset"] is True
+
+
+def test_sync_rejects_bad_cursor_and_unknown_delete(client, db_session):
+    seed_sample_data(db_session)
+
+    assert client.get("/api/sync", params={"since": "garbage"}).status_code == 400
+    assert client.delete("/api/tasks/9999").status_code == 404
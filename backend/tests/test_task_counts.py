@@ -0,0 +1,97 @@
+from datetime import date, timedelta
+
+from app import models, task_counts
+from app.cli import main as cli_main
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def test_reconcile_reports_and_repairs_drift(db_session):
+    _, proj, inbox, _, _ = seed_sample_data(db_session)
+    proj_id, inbox_id = proj.id, inbox.id
+
+    # The sample rows were inserted directly, around the counters
+    drift = task_counts.reconcile(db_session)
+    db_session.commit()
+    assert {(d.project_id, d.section_id, d.status, d.stored, d.actual) for d in drift} == {
+        (proj_id, inbox_id, "today", 0, 1),
+        (proj_id, inbox_id, "inbox", 0, 1),
+    }
+    assert task_counts.reconcile(db_session) == []
+
+
+def test_stats_follow_task_writes(client, db_session):
+    _, proj, inbox, task1, task2 = seed_sample_data(db_session)
+    task_counts.reconcile(db_session)
+    other = models.Section(project_id=proj.id, name="Later", order_index=1)
+    db_session.add(other)
+    db_session.commit()
+    proj_id, inbox_id, other_id = proj.id, inbox.id, other.id
+    task1_id, task2_id = task1.id, task2.id
+
+    client.post("/api/tasks", json={"project_id": proj_id, "name": "Loose"})
+    client.post(
+        "/api/tasks/batch",
+        json={"items": [{"project_id": proj_id, "section_id": other_id, "name": "B"}] * 2},
+    )
+    client.patch(f"/api/tasks/{task1_id}", json={"status": "completed"})
+    client.patch(
+        "/api/tasks/batch", json={"items": [{"id": task2_id, "section_id": other_id}]}
+    )
+    client.delete(f"/api/tasks/{task1_id}")
+
+    stats = client.get(f"/api/projects/{proj_id}/stats").json()
+    assert stats["total"] == 4
+    assert stats["by_status"] == {"inbox": 4}
+    assert [(s["section_id"], s["total"]) for s in stats["sections"]] == [
+        (None, 1),
+        (other_id, 3),
+    ]
+    assert inbox_id not in {s["section_id"] for s in stats["sections"]}
+    # The counters match a full recount
+    assert task_counts.reconcile(db_session, fix=False) == []
+
+
+def test_overdue_and_revalidation(client, db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    task_counts.reconcile(db_session)
+    db_session.commit()
+    proj_id = proj.id
+    yesterday = (date.today() - timedelta(days=1)).isoformat()
+
+    for status in ("today", "completed"):
+        client.post(
+            "/api/tasks",
+            json={"project_id": proj_id, "name": status, "status": status, "due_date": yesterday},
+        )
+    resp = client.get(f"/api/projects/{proj_id}/stats")
+    assert resp.json()["overdue"] == 1
+    resp = client.get(
+        f"/api/projects/{proj_id}/stats", headers={"If-None-Match": resp.headers["ETag"]}
+    )
+    assert resp.status_code == 304
+
+
+def test_stats_for_empty_and_unknown_projects(client, db_session):
+    ws, _, _, _, _ = seed_sample_data(db_session)
+    empty = client.post("/api/projects", json={"workspace_id": ws.id, "name": "Empty"}).json()
+
+    stats = client.get(f"/api/projects/{empty['id']}/stats").json()
+    assert stats == {
+        "project_id": empty["id"],
+        "total": 0,
+        "overdue": 0,
+        "by_status": {},
+        "sections": [],
+    }
+    assert client.get("/api/projects/999/stats").status_code == 404
+
+
+def test_reconcile_cli_check_mode(db_session, monkeypatch, capsys):
+    seed_sample_data(db_session)
+    monkeypatch.setattr("app.cli.SessionLocal", lambda: db_session)
+
+    assert cli_main(["reconcile-task-counts", "--check"]) == 1
+    assert "2 counters drifted" in capsys.readouterr().out
+    assert cli_main(["reconcile-task-counts"]) == 0
+    assert cli_main(["reconcile-task-counts", "--check"]) == 0
@@ -0,0 +1,168 @@
+import asyncio
+
+import pytest
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import models, schemas
+from app.database import SyncDBSession
+from app.writer import WriteCoalescer, task_writer
+
+from test_home_projects_tasks import seed_sample_data
+
+
+def _gather(*writes):
+    async def _run():
+        return await asyncio.gather(*(write() for write in writes), return_exceptions=True)
+
+    return asyncio.run(_run())
+
+
+def _count_commits(engine, commits):
+    def _record(conn):
+        commits.append(1)
+
+    event.listen(engine, "commit", _record)
+    return lambda: event.remove(engine, "commit", _record)
+
+
+def test_concurrent_writes_share_one_commit(db_session, engine):
+    _, proj, inbox, task1, task2 = seed_sample_data(db_session)
+    proj_id, inbox_id, task1_id, task2_id = proj.id, inbox.id, task1.id, task2.id
+    writer = WriteCoalescer(window_seconds=0.05, max_batch=100)
+
+    # Each request has its own session; a group is written on the opener's session
+    def _create(name):
+        task_in = schemas.TaskCreate(project_id=proj_id, section_id=inbox_id, name=name)
+        return lambda: writer.create_task(SyncDBSession(Session(engine)), task_in)
+
+    def _update(task_id, **changes):
+        task_in = schemas.TaskUpdate(**changes)
+        return lambda: writer.update_task(SyncDBSession(Session(engine)), task_id, task_in)
+
+    commits = []
+    stop = _count_commits(engine, commits)
+    try:
+        results = _gather(
+            _create("A"),
+            _update(task1_id, status="completed"),
+            _create("B"),
+            _update(9999, name="Missing"),
+            _update(task2_id, assignee="me"),
+            _create("C"),
+        )
+    finally:
+        stop()
+
+    assert [r.status for r in results] == [201, 200, 201, 404, 200, 201]
+    assert [results[i].task.name for i in (0, 2, 5)] == ["A", "B", "C"]
+    assert results[1].task.completed_at is not None
+    assert results[3].error == "Task not found"
+    # One transaction for the creates and one for the updates
+    assert len(commits) == 2
+    assert writer.stats()["groups"] == 2 and writer.stats()["writes"] == 6
+
+    db_session.expire_all()
+    assert db_session.get(models.Task, task2_id).assignee == "me"
+
+
+def test_repeated_updates_of_a_task_keep_their_order(db_session):
+    _, _, _, task1, _ = seed_sample_data(db_session)
+    task_id = task1.id
+    writer = WriteCoalescer(window_seconds=0.01, max_batch=2)
+    db = SyncDBSession(db_session)
+
+    names = [f"Name {i}" for i in range(5)]
+    results = _gather(
+        *(
+            lambda name=name: writer.update_task(db, task_id, schemas.TaskUpdate(name=name))
+            for name in names
+        )
+    )
+    assert [r.task.name for r in results] == names
+    assert writer.stats()["groups"] == 5
+
+    db_session.expire_all()
+    assert db_session.get(models.Task, task_id).name == "Name 4"
+
+
+def test_failed_group_is_retried_item_by_item(db_session):
+    _, proj, _, _, _ = seed_sample_data(db_session)
+    proj_id = proj.id
+    writer = WriteCoalescer(window_seconds=0.01, max_batch=100)
+    db = SyncDBSession(db_session)
+
+    def _apply(session, items):
+        if len(items) > 1 or items[0].name == "Bad":
+            raise ValueError(items[0].name)
+        return [schemas.TaskBatchItemResult(index=0, status=201)]
+
+    def _submit(name):
+        task_in = schemas.TaskCreate(project_id=proj_id, name=name)
+        return lambda: writer._submit("create", _apply, db, task_in, None)
+
+    ok, bad = _gather(_submit("Good"), _submit("Bad"))
+    assert ok.status == 201
+    assert isinstance(bad, ValueError) and str(bad) == "Bad"
+
+
+class _RequestSession(SyncDBSession):
+    """Records its runs and the request teardown that closes it."""
+
+    def __init__(self, session, log):
+        super().__init__(session)
+        self.log = log
+
+    async def run(self, fn, *args, **kwargs):
+        self.log.append("run")
+        try:
+            return await super().run(fn, *args, **kwargs)
+        finally:
+            self.log.append("ran")
+
+
+def test_cancelled_opener_keeps_its_session_until_the_group_is_written(db_session, engine):
+    _, _, _, task1, task2 = seed_sample_data(db_session)
+    task1_id, task2_id = task1.id, task2.id
+    writer = WriteCoalescer(window_seconds=0.05, max_batch=100)
+    log = []
+
+    async def _request(db, task_id):
+        try:
+            return await writer.update_task(db, task_id, schemas.TaskUpdate(name="Renamed"))
+        finally:
+            if db.log is log:
+                log.append("closed")
+
+    async def _run():
+        opener = asyncio.create_task(_request(_RequestSession(Session(engine), log), task1_id))
+        await asyncio.sleep(0)
+        joined = asyncio.create_task(_request(_RequestSession(Session(engine), []), task2_id))
+        await asyncio.sleep(0)
+        opener.cancel()
+        result = await joined
+        with pytest.raises(asyncio.CancelledError):
+            await opener
+        return result
+
+    assert asyncio.run(_run()).status == 200
+    assert log == ["run", "ran", "closed"]
+
+
+def test_task_routes_use_the_writer_when_enabled(client, db_session, monkeypatch):
+    _, proj, inbox, task1, _ = seed_sample_data(db_session)
+    proj_id, inbox_id, task_id = proj.id, inbox.id, task1.id
+    monkeypatch.setattr(task_writer, "enabled", True)
+    monkeypatch.setattr(task_writer, "window_seconds", 0)
+
+    resp = client.post("/api/tasks", json={"project_id": proj_id, "name": "New"})
+    assert resp.status_code == 201 and resp.json()["section_id"] is None
+    resp = client.patch(f"/api/tasks/{task_id}", json={"status": "completed"})
+    assert resp.status_code == 200 and resp.json()["completed_at"] is not None
+
+    assert client.patch("/api/tasks/9999", json={"name": "x"}).status_code == 404
+    resp = client.post("/api/tasks", json={"project_id": 9999, "name": "Lost"})
+    assert resp.status_code == 404 and resp.json()["detail"] == "Project not found"
+    resp = client.patch(f"/api/tasks/{task_id}", json={"section_id": inbox_id + 100})
+    assert resp.status_code == 400
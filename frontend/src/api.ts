@@ -57,19 +57,28 @@ export interface TaskCreate {
   assignee?: string | null;
 }
 
+async function fetchAllPages<T>(path: string): Promise<T[]> {
+  const items: T[] = [];
+  let cursor: string | undefined;
+  do {
+    const res = await api.get<T[]>(path, { params: cursor ? { cursor } : undefined });
+    items.push(...res.data);
+    cursor = res.headers['x-next-cursor'];
+  } while (cursor);
+  return items;
+}
+
 export async function fetchHome(): Promise<HomeResponse> {
   const res = await api.get<HomeResponse>('/home');
   return res.data;
 }
 
 export async function fetchProjects(): Promise<Project[]> {
-  const res = await api.get<Project[]>('/projects');
-  return res.data;
+  return fetchAllPages<Project>('/projects');
 }
 
 export async function fetchProjectTasks(projectId: number): Promise<Task[]> {
-  const res = await api.get<Task[]>(`/projects/${projectId}/tasks`);
-  return res.data;
+  return fetchAllPages<Task>(`/projects/${projectId}/tasks`);
 }
 
 export async function createProject(payload: ProjectCreate): Promise<Project> {
@@ -81,3 +90,25 @@ export async function createTask(payload: TaskCreate): Promise<Task> {
   const res = await api.post<Task>('/tasks', payload);
   return res.data;
 }
+
+export interface TaskEvent {
+  type: 'task.created' | 'task.updated' | 'task.deleted';
+  // For `task.deleted`, the task as it was when it was deleted
+  data: Task;
+}
+
+// Live task changes of a project over Server-Sent Events. `onOverflow` runs when the
+// server dropped events for this client; refetch, the stream reconnects by itself.
+export function subscribeToProjectEvents(
+  projectId: number,
+  onEvent: (event: TaskEvent) => void,
+  onOverflow: () => void,
+): () => void {
+  const source = new EventSource(`${baseURL}/api/projects/${projectId}/events`);
+  const handle = (message: MessageEvent) => onEvent(JSON.parse(message.data));
+  source.addEventListener('task.created', handle);
+  source.addEventListener('task.updated', handle);
+  source.addEventListener('task.deleted', handle);
+  source.addEventListener('overflow', onOverflow);
+  return () => source.close();
+}
@@ -1,6 +1,6 @@
 import React, { useEffect, useState } from 'react';
 import type { Task, TaskCreate } from '../api';
-import { fetchProjectTasks, createTask } from '../api';
+import { fetchProjectTasks, createTask, subscribeToProjectEvents } from '../api';
 
 interface Props {
   projectId: number | null;
@@ -14,9 +14,23 @@ export function TasksPage({ projectId }: Props) {
 
   useEffect(() => {
     if (!projectId) return;
-    fetchProjectTasks(projectId)
-      .then(setTasks)
-      .catch(() => setError('Failed to load tasks'));
+    const load = () =>
+      fetchProjectTasks(projectId)
+        .then(setTasks)
+        .catch(() => setError('Failed to load tasks'));
+    load();
+    // Other users' edits arrive as events instead of by polling
+    return subscribeToProjectEvents(
+      projectId,
+      ({ type, data }) =>
+        setTasks((prev) => {
+          if (type === 'task.deleted') return prev.filter((t) => t.id !== data.id);
+          return prev.some((t) => t.id === data.id)
+            ? prev.map((t) => (t.id === data.id ? data : t))
+            : [data, ...prev];
+        }),
+      load,
+    );
   }, [projectId]);
 
   const canCreate = Boolean(projectId && newTaskName.trim().length > 0 && !isSaving);